@@ -0,0 +1,94 @@
+"""
+Local backtests of fetched weights and prices, compared with fetching the server-side
+returns and with a row-wise pandas backtest.
+"""
+
+import pandas as pd
+import pytest
+from unravel_client import (
+    backtest,
+    backtest_overlays,
+    get_portfolio_historical_weights,
+    get_portfolio_historical_weights_batch,
+    get_portfolio_returns,
+    get_prices,
+    get_risk_overlay,
+)
+
+from .conftest import API_KEY, TICKERS
+
+PORTFOLIOS = [f"momentum.{i}" for i in range(16)]
+OVERLAYS = [f"overlay.{i}" for i in range(8)]
+
+
+def _prices() -> pd.DataFrame:
+    # Mock prices are random normal values, shifted to stay positive.
+    return get_prices(TICKERS, API_KEY).abs() + 1
+
+
+def _rowwise_backtest(weights: pd.DataFrame, prices: pd.DataFrame) -> pd.Series:
+    returns = prices.pct_change().fillna(0.0)
+    held = weights.reindex(prices.index, method="ffill").shift(1).fillna(0.0)
+    return pd.Series(
+        [(held.loc[date] * row).sum() for date, row in returns.iterrows()],
+        index=prices.index,
+    )
+
+
+@pytest.fixture()
+def inputs(client):
+    """Weights of one portfolio, weights of a batch and the prices of their tickers."""
+    weights = get_portfolio_historical_weights("momentum.20", API_KEY)
+    batch = get_portfolio_historical_weights_batch(PORTFOLIOS, API_KEY).to_frame()
+    return weights, batch, _prices()
+
+
+@pytest.mark.usefixtures("client")
+def test_server_returns(benchmark):
+    """Reference: fetching the returns computed by the API."""
+    benchmark.group = "portfolio returns"
+    benchmark(get_portfolio_returns, "momentum.20", API_KEY)
+
+
+@pytest.mark.usefixtures("client")
+def test_fetch_and_backtest(benchmark):
+    """Fetching weights and prices, then backtesting them locally."""
+    benchmark.group = "portfolio returns"
+    benchmark(
+        lambda: backtest(
+            get_portfolio_historical_weights("momentum.20", API_KEY), _prices()
+        )
+    )
+
+
+def test_backtest(benchmark, inputs):
+    """Computation only, for one portfolio."""
+    weights, _, prices = inputs
+    benchmark.group = "backtest"
+    benchmark(backtest, weights, prices, cost=0.001)
+
+
+def test_backtest_batch(benchmark, inputs):
+    """Computation only, for a batch of portfolios stacked into one block."""
+    _, batch, prices = inputs
+    benchmark.group = "backtest"
+    benchmark(backtest, batch, prices, cost=0.001)
+    benchmark.extra_info["portfolios"] = len(PORTFOLIOS)
+
+
+def test_rowwise_baseline(benchmark, inputs):
+    """Baseline: the same backtest looping over dates with pandas."""
+    weights, _, prices = inputs
+    benchmark.group = "backtest"
+    benchmark.pedantic(_rowwise_backtest, args=(weights, prices), rounds=3)
+
+
+def test_backtest_overlays(benchmark, inputs):
+    """Computation only, for every combination of a batch of portfolios and overlays."""
+    _, batch, prices = inputs
+    overlays = {
+        name: get_risk_overlay("momentum.20", name, API_KEY).abs() for name in OVERLAYS
+    }
+    benchmark.group = "backtest"
+    benchmark(backtest_overlays, batch, prices, overlays, cost=0.001)
+    benchmark.extra_info["combinations"] = len(PORTFOLIOS) * len(OVERLAYS)
@@ -0,0 +1,69 @@
+"""
+Throughput of many calls against an API with network latency.
+"""
+
+import asyncio
+
+import pytest
+from unravel_client import (
+    AsyncUnravelClient,
+    get_portfolio_returns,
+    get_portfolio_returns_batch,
+)
+
+from .conftest import API_KEY
+
+CALLS = 64
+LATENCY = 0.02
+PORTFOLIOS = [f"momentum.{i}" for i in range(CALLS)]
+
+
+def _record_throughput(benchmark) -> None:
+    if benchmark.stats is not None:
+        benchmark.extra_info["calls_per_second"] = CALLS / benchmark.stats.stats.mean
+
+
+@pytest.fixture(autouse=True)
+def _network_latency(latency):
+    latency(LATENCY)
+
+
+@pytest.mark.usefixtures("client")
+def test_sequential(benchmark):
+    """Baseline: one call after the other."""
+    benchmark.group = "throughput"
+    benchmark.pedantic(
+        lambda: [get_portfolio_returns(portfolio, API_KEY) for portfolio in PORTFOLIOS],
+        rounds=3,
+        warmup_rounds=1,
+    )
+    _record_throughput(benchmark)
+
+
+@pytest.mark.usefixtures("client")
+def test_threads(benchmark):
+    """Calls fanned out over the thread pool of the client."""
+    benchmark.group = "throughput"
+    benchmark.pedantic(
+        lambda: get_portfolio_returns_batch(PORTFOLIOS, API_KEY),
+        rounds=3,
+        warmup_rounds=1,
+    )
+    _record_throughput(benchmark)
+
+
+def test_asyncio(benchmark, mock_server):
+    """Calls gathered on a single event loop."""
+    benchmark.group = "throughput"
+
+    async def run():
+        async with AsyncUnravelClient(base_url=mock_server.base_url) as client:
+            return await asyncio.gather(
+                *(
+                    client.get_portfolio_returns(portfolio, API_KEY)
+                    for portfolio in PORTFOLIOS
+                )
+            )
+
+    benchmark.pedantic(lambda: asyncio.run(run()), rounds=3, warmup_rounds=1)
+    _record_throughput(benchmark)
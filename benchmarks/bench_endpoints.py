@@ -0,0 +1,29 @@
+"""
+End-to-end latency of every endpoint function, from the call to the returned pandas object.
+"""
+
+import pytest
+from unravel_client import UnravelClient, get_portfolio_historical_weights, set_client
+
+from .conftest import API_KEY, ENDPOINTS
+
+
+@pytest.mark.usefixtures("client")
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_endpoint_latency(benchmark, endpoint):
+    """Latency of a single call over a warm connection."""
+    benchmark.group = "endpoint latency"
+    benchmark(ENDPOINTS[endpoint])
+
+
+@pytest.mark.parametrize("wire_format", ["json", "arrow", "parquet"])
+def test_wire_format_latency(benchmark, mock_server, wire_format):
+    """Latency of a large frame per response format."""
+    benchmark.group = "wire format"
+    client = UnravelClient(base_url=mock_server.base_url, wire_format=wire_format)
+    previous = set_client(client)
+    try:
+        benchmark(get_portfolio_historical_weights, "momentum.20", API_KEY)
+    finally:
+        set_client(previous)
+        client.close()
@@ -0,0 +1,28 @@
+"""
+Time to import the package in a fresh interpreter, as paid by every short-lived script.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+IMPORTS = {
+    "package": "import unravel_client",
+    "get_tickers": "from unravel_client import get_tickers",
+    "get_portfolio_returns": "from unravel_client import get_portfolio_returns",
+    "AsyncUnravelClient": "from unravel_client import AsyncUnravelClient",
+}
+
+
+def _import(statement: str) -> None:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    subprocess.run([sys.executable, "-c", statement], check=True, env=env)
+
+
+@pytest.mark.parametrize("name", IMPORTS)
+def test_import_time(benchmark, name):
+    """Wall time of an interpreter running a single import, interpreter startup included."""
+    benchmark.group = "import"
+    benchmark.pedantic(_import, args=(IMPORTS[name],), rounds=5, warmup_rounds=1)
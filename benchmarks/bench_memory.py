@@ -0,0 +1,28 @@
+"""
+Peak memory allocated by every endpoint function, measured with tracemalloc.
+"""
+
+import tracemalloc
+
+import pytest
+
+from .conftest import ENDPOINTS
+
+
+def _peak_memory(call) -> int:
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.usefixtures("client")
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_peak_memory(benchmark, endpoint):
+    """Peak bytes allocated by one call, reported in ``extra_info``."""
+    benchmark.group = "peak memory"
+    ENDPOINTS[endpoint]()  # Warm up connections and imports.
+    peak = benchmark.pedantic(_peak_memory, args=(ENDPOINTS[endpoint],), rounds=1)
+    benchmark.extra_info["peak_bytes"] = peak
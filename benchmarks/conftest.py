@@ -0,0 +1,86 @@
+"""
+Fixtures of the offline benchmarks, run against a local mock of the Unravel API.
+"""
+
+import pytest
+from unravel_client import (
+    UnravelClient,
+    get_historical_universe,
+    get_live_weights,
+    get_portfolio_factors_historical,
+    get_portfolio_factors_live,
+    get_portfolio_historical_weights,
+    get_portfolio_returns,
+    get_price,
+    get_prices,
+    get_risk_overlay,
+    get_risk_overlay_live,
+    get_risk_regime,
+    get_risk_regime_live,
+    get_tickers,
+    set_client,
+)
+
+from tests.mock_server import MockUnravelServer, _symbols
+
+# Size of the payloads served: dates per series and tickers per portfolio.
+PERIODS = 1000
+WIDTH = 100
+API_KEY = "benchmark"
+TICKERS = _symbols(WIDTH)
+
+# One call of every endpoint function, keyed by name.
+ENDPOINTS = {
+    "get_historical_universe": lambda: get_historical_universe(
+        "full", API_KEY, "2024-01-01", "2030-12-31"
+    ),
+    "get_live_weights": lambda: get_live_weights("momentum.20", API_KEY),
+    "get_portfolio_factors_historical": lambda: get_portfolio_factors_historical(
+        "momentum", TICKERS, API_KEY
+    ),
+    "get_portfolio_factors_live": lambda: get_portfolio_factors_live(
+        "momentum", TICKERS, API_KEY
+    ),
+    "get_portfolio_historical_weights": lambda: get_portfolio_historical_weights(
+        "momentum.20", API_KEY
+    ),
+    "get_portfolio_returns": lambda: get_portfolio_returns("momentum.20", API_KEY),
+    "get_price": lambda: get_price("BTC", API_KEY),
+    "get_prices": lambda: get_prices(TICKERS, API_KEY),
+    "get_risk_overlay": lambda: get_risk_overlay("momentum.20", "overlay", API_KEY),
+    "get_risk_overlay_live": lambda: get_risk_overlay_live(
+        "momentum.20", "overlay", API_KEY
+    ),
+    "get_risk_regime": lambda: get_risk_regime("overlay", API_KEY),
+    "get_risk_regime_live": lambda: get_risk_regime_live("overlay", API_KEY),
+    "get_tickers": lambda: get_tickers("momentum", API_KEY, "full"),
+}
+
+
+@pytest.fixture(scope="session")
+def mock_server():
+    """Start a local server emulating the Unravel API with realistic payload sizes."""
+    server = MockUnravelServer(periods=PERIODS, width=WIDTH).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture()
+def client(mock_server):
+    """Route the module-level endpoint functions to the mock server."""
+    client = UnravelClient(base_url=mock_server.base_url, pool_maxsize=32)
+    previous = set_client(client)
+    yield client
+    set_client(previous)
+    client.close()
+
+
+@pytest.fixture()
+def latency(mock_server):
+    """Set the latency of the mock server for one benchmark."""
+
+    def set_latency(seconds: float) -> None:
+        mock_server.latency = seconds
+
+    yield set_latency
+    mock_server.latency = 0.0
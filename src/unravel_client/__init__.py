@@ -1,27 +1,131 @@
-from .portfolio.factors import (
-    get_portfolio_factors_historical,
-    get_portfolio_factors_live,
-)
-from .portfolio.historical_weights import get_portfolio_historical_weights
-from .portfolio.live_weights import get_live_weights
-from .portfolio.returns import get_portfolio_returns
-from .portfolio.risk import (
-    get_risk_overlay,
-    get_risk_overlay_live,
-    get_risk_regime,
-    get_risk_regime_live,
-)
-from .portfolio.tickers import get_tickers
-from .portfolio.universe import get_historical_universe
-from .price import get_price, get_prices
+"""
+Python client of the Unravel Finance API.
+
+Endpoints and classes are imported from their submodule on first access, so that
+importing the package stays cheap for scripts only using a few endpoints.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .async_client import AsyncUnravelClient
+    from .backtesting import (
+        BacktestResult,
+        apply_overlay,
+        backtest,
+        backtest_overlays,
+    )
+    from .cache import ConditionalCache, HistoryCache, LiveCache
+    from .circuit import CircuitBreaker, CircuitOpenError
+    from .client import UnravelClient, configure, get_client, set_client
+    from .instrumentation import CallEvent, CallListener
+    from .metrics import MetricsRegistry
+    from .portfolio.batch import (
+        BatchResult,
+        get_portfolio_historical_weights_batch,
+        get_portfolio_returns_batch,
+    )
+    from .portfolio.factors import (
+        get_portfolio_factors_historical,
+        get_portfolio_factors_live,
+    )
+    from .portfolio.historical_weights import get_portfolio_historical_weights
+    from .portfolio.live_weights import get_live_weights
+    from .portfolio.membership import UniverseBitmap, UniverseIndex
+    from .portfolio.returns import get_portfolio_returns
+    from .portfolio.risk import (
+        get_risk_overlay,
+        get_risk_overlay_live,
+        get_risk_regime,
+        get_risk_regime_live,
+    )
+    from .portfolio.tickers import get_tickers
+    from .portfolio.universe import get_historical_universe
+    from .price import get_price, get_prices
+    from .ratelimit import FileTokenBucket, RateLimiter, TokenBucket
+    from .timeouts import DeadlineExceeded, call_scope
+
+# Public name to the submodule defining it.
+_EXPORTS = {
+    "AsyncUnravelClient": ".async_client",
+    "BacktestResult": ".backtesting",
+    "apply_overlay": ".backtesting",
+    "backtest": ".backtesting",
+    "backtest_overlays": ".backtesting",
+    "ConditionalCache": ".cache",
+    "HistoryCache": ".cache",
+    "LiveCache": ".cache",
+    "CircuitBreaker": ".circuit",
+    "CircuitOpenError": ".circuit",
+    "UnravelClient": ".client",
+    "configure": ".client",
+    "get_client": ".client",
+    "set_client": ".client",
+    "CallEvent": ".instrumentation",
+    "CallListener": ".instrumentation",
+    "MetricsRegistry": ".metrics",
+    "BatchResult": ".portfolio.batch",
+    "get_portfolio_historical_weights_batch": ".portfolio.batch",
+    "get_portfolio_returns_batch": ".portfolio.batch",
+    "get_portfolio_factors_historical": ".portfolio.factors",
+    "get_portfolio_factors_live": ".portfolio.factors",
+    "get_portfolio_historical_weights": ".portfolio.historical_weights",
+    "get_live_weights": ".portfolio.live_weights",
+    "UniverseBitmap": ".portfolio.membership",
+    "UniverseIndex": ".portfolio.membership",
+    "get_portfolio_returns": ".portfolio.returns",
+    "get_risk_overlay": ".portfolio.risk",
+    "get_risk_overlay_live": ".portfolio.risk",
+    "get_risk_regime": ".portfolio.risk",
+    "get_risk_regime_live": ".portfolio.risk",
+    "get_tickers": ".portfolio.tickers",
+    "get_historical_universe": ".portfolio.universe",
+    "get_price": ".price",
+    "get_prices": ".price",
+    "FileTokenBucket": ".ratelimit",
+    "RateLimiter": ".ratelimit",
+    "TokenBucket": ".ratelimit",
+    "DeadlineExceeded": ".timeouts",
+    "call_scope": ".timeouts",
+}
+
 
 __all__ = [
+    "AsyncUnravelClient",
+    "BacktestResult",
+    "BatchResult",
+    "CallEvent",
+    "CallListener",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "ConditionalCache",
+    "DeadlineExceeded",
+    "FileTokenBucket",
+    "HistoryCache",
+    "LiveCache",
+    "MetricsRegistry",
+    "RateLimiter",
+    "TokenBucket",
+    "UniverseBitmap",
+    "UniverseIndex",
+    "UnravelClient",
+    "apply_overlay",
+    "backtest",
+    "backtest_overlays",
+    "call_scope",
+    "configure",
+    "get_client",
     "get_historical_universe",
     "get_live_weights",
     "get_portfolio_factors_historical",
     "get_portfolio_factors_live",
     "get_portfolio_historical_weights",
+    "get_portfolio_historical_weights_batch",
     "get_portfolio_returns",
+    "get_portfolio_returns_batch",
     "get_price",
     "get_prices",
     "get_risk_overlay",
@@ -29,4 +133,19 @@ __all__ = [
     "get_risk_regime",
     "get_risk_regime_live",
     "get_tickers",
+    "set_client",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    # Later lookups find the attribute directly and skip __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,829 @@
+"""
+Asyncio client mirroring every endpoint function of the Unravel client library.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from functools import partial
+from typing import Any
+
+import pandas as pd
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .cache import (
+    ConditionalCache,
+    HistoryCache,
+    LiveCache,
+    parser_key,
+    request_key,
+)
+from .circuit import CircuitBreaker, is_failure_status
+from .compression import TransferStats, accept_encoding, decompress
+from .constants import BASEAPI, TICKER_CHUNK_SIZE, get_headers
+from .decoding import accept_header, decode, get_loads
+from .decorators import retry_on_error
+from .instrumentation import Instrumentation, Listener, current_event, phase
+from .metrics import MetricsRegistry
+from .parallel import chunked, concat_columns, concat_rows, split_date_range
+from .portfolio.batch import BatchResult, _batch_items
+from .portfolio.factors import (
+    _parse_portfolio_factors_historical,
+    _parse_portfolio_factors_live,
+    _portfolio_factors_historical_request,
+    _portfolio_factors_live_request,
+)
+from .portfolio.historical_weights import (
+    _parse_portfolio_historical_weights,
+    _portfolio_historical_weights_request,
+)
+from .portfolio.membership import UniverseBitmap
+from .portfolio.live_weights import _live_weights_request, _parse_live_weights
+from .portfolio.returns import _parse_portfolio_returns, _portfolio_returns_request
+from .portfolio.risk import (
+    _parse_risk_overlay,
+    _parse_risk_overlay_live,
+    _parse_risk_regime,
+    _parse_risk_regime_live,
+    _risk_overlay_live_request,
+    _risk_overlay_request,
+    _risk_regime_live_request,
+    _risk_regime_request,
+)
+from .portfolio.tickers import _parse_tickers, _tickers_request
+from .portfolio.universe import (
+    _combine_historical_universe,
+    _historical_universe_request,
+    _parse_historical_universe,
+    _universe_result,
+)
+from .price import (
+    _check_tickers,
+    _parse_price,
+    _parse_prices,
+    _price_request,
+    _prices_request,
+)
+from .ratelimit import RateLimiter
+from .singleflight import AsyncSingleFlight
+from .timeouts import (
+    DEFAULT_TIMEOUT,
+    DeadlineExceeded,
+    call_scope,
+    current_scope,
+    deadline_passed,
+    remaining_time,
+    request_timeout,
+)
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+def _client_timeout(
+    timeout: float | tuple[float, float] | None, total: float | None = None
+):
+    if timeout is None:
+        return aiohttp.ClientTimeout(total=total)
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return aiohttp.ClientTimeout(total=total, sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(
+        total=timeout if total is None else min(timeout, total)
+    )
+
+
+def _http_error(
+    status: int, reason: str | None, url: str, headers, body: bytes
+) -> requests.HTTPError:
+    """Wrap an error response into the same exception the sync client raises."""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.url = url
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as e:
+        return e
+    return requests.HTTPError(f"{status} {reason}", response=response)
+
+
+class AsyncUnravelClient:
+    """
+    Asyncio client for the Unravel API.
+
+    Exposes a coroutine for every endpoint function exported by ``unravel_client``,
+    with identical arguments and return values. All requests share a single
+    ``aiohttp`` connection pool, and at most ``max_concurrency`` requests are in
+    flight at any time, so hundreds of calls can be fanned out with
+    ``asyncio.gather`` without spawning threads.
+
+    Requires the optional ``aiohttp`` dependency (``pip install unravel-client[async]``).
+
+    Args:
+        base_url (str): Root URL of the API, defaults to ``BASEAPI``
+        pool_maxsize (int): Maximum number of connections kept open to the API
+        max_concurrency (int): Maximum number of requests in flight at the same time
+        timeout (float | tuple[float, float] | None): Default timeout in seconds for every request, either a single value or a (connect, read) tuple. None waits forever
+        history_cache (HistoryCache | str | os.PathLike | None): On-disk cache, or its directory, used by historical endpoints to only download dates they have not seen before
+        live_cache (LiveCache | bool | None): In-memory cache for live endpoints, ``True`` creates one with default settings
+        coalesce (bool): Whether identical requests issued concurrently share a single HTTP call and its parsed result
+        json_backend (str | None): JSON library used to decode responses, one of ``orjson``, ``msgspec`` or ``json``. None picks the fastest one installed
+        conditional_cache (ConditionalCache | bool | None): In-memory cache of results served with ``ETag``/``Last-Modified`` validators, reused when the API answers a conditional request with ``304 Not Modified``. ``True`` creates one with default settings
+        rate_limiter (RateLimiter | None): Limiter every request acquires a token from before being sent, eg. ``TokenBucket(rate=10)`` or a ``FileTokenBucket`` shared by several processes
+        circuit_breaker (CircuitBreaker | bool | None): Breaker failing requests fast with ``CircuitOpenError`` while an endpoint keeps failing, ``True`` creates one with default settings
+        deadline (float | None): Default end-to-end deadline in seconds of every endpoint call, retries included. None for no deadline
+        listeners (Iterable[CallListener | Callable] | None): Instrumentation listeners notified of every API call, see ``CallEvent``. More can be added through ``instrumentation.add_listener``
+        metrics (MetricsRegistry | bool | None): Registry aggregating latency histograms and request, retry, error and cache hit counters, ``True`` creates one with default settings
+        wire_format (str): Preferred response format, one of ``json``, ``arrow`` (Arrow IPC stream) or ``parquet``. Binary formats require pyarrow, responses fall back to JSON when the API does not offer them
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASEAPI,
+        pool_maxsize: int = 100,
+        max_concurrency: int = 100,
+        timeout: float | tuple[float, float] | None = DEFAULT_TIMEOUT,
+        history_cache: HistoryCache | str | os.PathLike | None = None,
+        live_cache: LiveCache | bool | None = None,
+        coalesce: bool = True,
+        json_backend: str | None = None,
+        wire_format: str = "json",
+        conditional_cache: ConditionalCache | bool | None = None,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | bool | None = None,
+        deadline: float | None = None,
+        listeners: Iterable[Listener] | None = None,
+        metrics: MetricsRegistry | bool | None = None,
+    ):
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncUnravelClient requires aiohttp, install it with `pip install unravel-client[async]`"
+            )
+        self.base_url = base_url.rstrip("/")
+        self.pool_maxsize = pool_maxsize
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.deadline = deadline
+        if history_cache is not None and not isinstance(history_cache, HistoryCache):
+            history_cache = HistoryCache(history_cache)
+        self.history_cache = history_cache
+        if isinstance(live_cache, bool):
+            live_cache = LiveCache() if live_cache else None
+        self.live_cache = live_cache
+        if isinstance(conditional_cache, bool):
+            conditional_cache = ConditionalCache() if conditional_cache else None
+        self.conditional_cache = conditional_cache
+        self.rate_limiter = rate_limiter
+        if isinstance(circuit_breaker, bool):
+            circuit_breaker = CircuitBreaker() if circuit_breaker else None
+        self.circuit_breaker = circuit_breaker
+        self.coalesce = coalesce
+        self.loads = get_loads(json_backend)
+        self.wire_format = wire_format
+        self.accept = accept_header(wire_format)
+        self.accept_encoding = accept_encoding()
+        self.transfer_stats = TransferStats()
+        self.instrumentation = Instrumentation(listeners)
+        if isinstance(metrics, bool):
+            metrics = MetricsRegistry() if metrics else None
+        self.metrics = metrics
+        if metrics is not None:
+            self.instrumentation.add_listener(metrics)
+        self._inflight = AsyncSingleFlight()
+        self._history_locks: dict[str, asyncio.Lock] = {}
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def url(self, path: str) -> str:
+        """Build the absolute URL of an API path (eg. ``portfolio/returns``)."""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        # Created lazily so that the session and semaphore bind to the running loop.
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize),
+                timeout=_client_timeout(self.timeout),
+                auto_decompress=False,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def fetch(
+        self,
+        path: str,
+        api_key: str,
+        params: dict,
+        parse: Callable[[Any], Any],
+    ) -> Any:
+        """
+        Request an API path and parse its JSON payload.
+
+        Identical requests that are already in flight are not sent again, the caller
+        awaits them and receives the same parsed result.
+
+        Args:
+            path (str): API path relative to ``base_url`` (eg. ``portfolio/returns``)
+            api_key (str): The API key to use for the request
+            params (dict): Query parameters of the request
+            parse (Callable): Function turning the decoded JSON payload into the returned object
+        Returns:
+            Any: The output of ``parse``
+        Raises:
+            requests.HTTPError: If the API responds with an error status
+        """
+        if not self.coalesce:
+            return await self._fetch(path, api_key, params, parse)
+        return await self._inflight.do(
+            (request_key(path, api_key, params), parser_key(parse)),
+            lambda: self._fetch(path, api_key, params, parse),
+            timeout=remaining_time(self.deadline),
+        )
+
+    async def _send(
+        self,
+        session: aiohttp.ClientSession,
+        path: str,
+        api_key: str,
+        params: dict,
+        headers: dict | None,
+    ) -> tuple[int, str | None, Any, CaseInsensitiveDict, bytes, float]:
+        # Sends the request once the rate limiter and a concurrency slot allow it, and
+        # returns the response with the time it took, waiting excluded.
+        with phase("wait"):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(
+                    timeout=remaining_time(self.deadline)
+                )
+            try:
+                await asyncio.wait_for(
+                    self._semaphore.acquire(), remaining_time(self.deadline)
+                )
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(
+                    f"Deadline exceeded waiting for a concurrency slot for {path}"
+                ) from None
+        try:
+            # Computed once a slot is free, so that queueing counts against the deadline.
+            scope = current_scope()
+            timeout = request_timeout(self.timeout, self.deadline)
+            request_started = time.perf_counter()
+            async with session.get(
+                self.url(path),
+                headers={
+                    **get_headers(api_key),
+                    "Accept": self.accept,
+                    "Accept-Encoding": self.accept_encoding,
+                    **(headers or {}),
+                },
+                params={key: str(value) for key, value in params.items()},
+                timeout=_client_timeout(
+                    timeout, scope.remaining() if scope is not None else self.deadline
+                ),
+            ) as response:
+                # Bodies are decompressed by the caller rather than by aiohttp to measure both sizes.
+                raw = await response.read()
+                return (
+                    response.status,
+                    response.reason,
+                    response.url,
+                    CaseInsensitiveDict(response.headers),
+                    raw,
+                    time.perf_counter() - request_started,
+                )
+        finally:
+            self._semaphore.release()
+
+    async def _get(
+        self, path: str, api_key: str, params: dict, headers: dict | None = None
+    ) -> tuple[int, CaseInsensitiveDict, bytes]:
+        session = self._ensure_session()
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            circuit = breaker.key(self.base_url, path)
+            breaker.before(circuit)
+        try:
+            (
+                status,
+                reason,
+                url,
+                response_headers,
+                raw,
+                request_time,
+            ) = await self._send(session, path, api_key, params, headers)
+        except DeadlineExceeded:
+            if breaker is not None:
+                breaker.cancel(circuit)
+            raise
+        except Exception as e:
+            if breaker is not None:
+                breaker.record(circuit, failed=True)
+            if isinstance(e, asyncio.TimeoutError) and deadline_passed():
+                raise DeadlineExceeded(f"Deadline exceeded waiting for {path}") from e
+            raise
+        except BaseException:
+            # Cancelled before an outcome was known, the probe slot is given back.
+            if breaker is not None:
+                breaker.cancel(circuit)
+            raise
+        if breaker is not None:
+            breaker.record(circuit, failed=is_failure_status(status))
+        body = decompress(raw, response_headers.get("Content-Encoding"))
+        self.transfer_stats.record(path, len(raw), len(body))
+        event = current_event()
+        if event is not None:
+            event.status = status
+            event.wire_bytes += len(raw)
+            event.decoded_bytes += len(body)
+            # Waiting for a concurrency slot is timed as "wait", decompression is not included.
+            event.timings["request"] = event.timings.get("request", 0.0) + request_time
+        if status >= 400:
+            raise _http_error(status, reason, str(url), response_headers, body)
+        return status, response_headers, body
+
+    async def _fetch(
+        self,
+        path: str,
+        api_key: str,
+        params: dict,
+        parse: Callable[[Any], Any],
+    ) -> Any:
+        with self.instrumentation.call(path, params) as event:
+            conditional = self.conditional_cache
+            key = None
+            headers = None
+            if conditional is not None:
+                key = conditional.key(path, api_key, params, parse)
+                headers = conditional.headers(key)
+            status, response_headers, body = await self._get(
+                path, api_key, params, headers
+            )
+            if status == 304 and conditional is not None:
+                hit, value = conditional.get(key)
+                if hit:
+                    if event is not None:
+                        event.not_modified = True
+                    return value
+                # Evicted while the request was in flight.
+                status, response_headers, body = await self._get(path, api_key, params)
+            with phase("decode"):
+                payload = decode(body, self.loads, response_headers.get("Content-Type"))
+            with phase("parse"):
+                value = parse(payload)
+            if conditional is not None:
+                conditional.set(key, response_headers, value)
+            return value
+
+    async def fetch_range(
+        self,
+        path: str,
+        api_key: str,
+        params: dict,
+        parse: Callable[[Any], Any],
+        shards: int | None = None,
+        combine: Callable[[list], Any] = concat_rows,
+    ) -> Any:
+        """
+        Same as ``fetch``, optionally splitting the requested date range into shards.
+
+        The ``[start_date, end_date]`` range of ``params`` is split into ``shards``
+        windows that are requested concurrently, their parsed results are merged
+        with ``combine``.
+
+        Raises:
+            ValueError: If ``shards`` is given without a ``start_date``
+        """
+        if not shards or shards <= 1:
+            return await self.fetch(path, api_key, params, parse)
+        if params.get("start_date") is None:
+            raise ValueError("start_date is required to split a request into shards")
+
+        windows = split_date_range(params["start_date"], params.get("end_date"), shards)
+        return combine(
+            await asyncio.gather(
+                *(
+                    self.fetch(
+                        path,
+                        api_key,
+                        {**params, "start_date": window[0], "end_date": window[1]},
+                        parse,
+                    )
+                    for window in windows
+                )
+            )
+        )
+
+    async def fetch_history(
+        self,
+        path: str,
+        api_key: str,
+        params: dict,
+        parse: Callable[[Any], Any],
+        shards: int | None = None,
+    ) -> Any:
+        """
+        Same as ``fetch_range``, for historical endpoints that can be served from ``history_cache``.
+
+        Only the dates missing from the cache are requested, ``parse`` must return a
+        pandas object indexed by date.
+        """
+        if self.history_cache is None:
+            return await self.fetch_range(path, api_key, params, parse, shards)
+
+        cache = self.history_cache
+        key = cache.key(path, params, api_key)
+        lock = self._history_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Parquet reads and writes block, they run off the event loop.
+            plan = await asyncio.to_thread(cache.lookup, path, params, api_key)
+            fetched = None
+            if plan.request_params is not None:
+                fetched = await self.fetch_range(
+                    path, api_key, plan.request_params, parse, shards
+                )
+            else:
+                self.instrumentation.cache_hit(path, "history")
+            return await asyncio.to_thread(cache.update, plan, fetched)
+
+    async def fetch_live(
+        self,
+        path: str,
+        api_key: str,
+        params: dict,
+        parse: Callable[[Any], Any],
+    ) -> Any:
+        """
+        Same as ``fetch``, for live endpoints that can be served from ``live_cache``.
+        """
+        if self.live_cache is None:
+            return await self.fetch(path, api_key, params, parse)
+
+        key = self.live_cache.key(path, api_key, params)
+        hit, value = self.live_cache.get(key)
+        if hit:
+            self.instrumentation.cache_hit(path, "live")
+            return value
+        value = await self.fetch(path, api_key, params, parse)
+        self.live_cache.set(key, value, self.live_cache.ttl(params.get("as_of")))
+        return value
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> AsyncUnravelClient:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _run_batch(
+        self,
+        fetch: Callable[..., Awaitable[pd.Series | pd.DataFrame]],
+        ids: list[str],
+        api_key: str,
+        smoothing: str | list[str] | None,
+        exchange: str | list[str] | None,
+        start_date: str | None,
+        end_date: str | None,
+    ) -> BatchResult:
+        async def fetch_item(item):
+            _, portfolio, s, e = item
+            try:
+                return await fetch(portfolio, api_key, s, e, start_date, end_date), None
+            except Exception as error:  # noqa: BLE001
+                return None, error
+
+        items = _batch_items(ids, smoothing, exchange)
+        result = BatchResult()
+        outcomes = await asyncio.gather(*(fetch_item(item) for item in items))
+        for (key, *_), (data, error) in zip(items, outcomes):
+            if error is None:
+                result.data[key] = data
+            else:
+                result.errors[key] = error
+        return result
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def get_historical_universe(
+        self,
+        size: str,
+        api_key: str,
+        start_date: str,
+        end_date: str,
+        exchange: str | None = None,
+        shards: int | None = None,
+        compact: bool = False,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.DataFrame | UniverseBitmap:
+        """Async version of ``unravel_client.get_historical_universe``."""
+        path, params = _historical_universe_request(
+            size, start_date, end_date, exchange
+        )
+        universe = await self.fetch_range(
+            path,
+            api_key,
+            params,
+            _parse_historical_universe,
+            shards,
+            combine=_combine_historical_universe,
+        )
+        return _universe_result(universe, compact)
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def get_live_weights(
+        self,
+        id: str,
+        api_key: str,
+        smoothing: str | None = None,
+        exchange: str | None = None,
+        as_of: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.Series:
+        """Async version of ``unravel_client.get_live_weights``."""
+        path, params = _live_weights_request(id, smoothing, exchange, as_of)
+        return await self.fetch_live(path, api_key, params, _parse_live_weights)
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def _get_portfolio_factors_historical_chunk(
+        self,
+        id: str,
+        tickers: list[str],
+        api_key: str,
+        smoothing: str | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        shards: int | None = None,
+    ) -> pd.DataFrame:
+        path, params = _portfolio_factors_historical_request(
+            id, tickers, smoothing, start_date, end_date
+        )
+        return await self.fetch_range(
+            path, api_key, params, _parse_portfolio_factors_historical, shards
+        )
+
+    async def get_portfolio_factors_historical(
+        self,
+        id: str,
+        tickers: list[str],
+        api_key: str,
+        smoothing: str | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        chunk_size: int | None = TICKER_CHUNK_SIZE,
+        shards: int | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.DataFrame:
+        """Async version of ``unravel_client.get_portfolio_factors_historical``."""
+        chunks = chunked(tickers, chunk_size)
+        with call_scope(timeout, deadline):
+            frames = await asyncio.gather(
+                *(
+                    self._get_portfolio_factors_historical_chunk(
+                        id, chunk, api_key, smoothing, start_date, end_date, shards
+                    )
+                    for chunk in chunks
+                )
+            )
+        if len(frames) == 1:
+            return frames[0]
+        return concat_columns(list(frames), tickers)
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def get_portfolio_factors_live(
+        self,
+        id: str,
+        tickers: list[str],
+        api_key: str,
+        smoothing: str | None = None,
+        as_of: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.Series:
+        """Async version of ``unravel_client.get_portfolio_factors_live``."""
+        path, params = _portfolio_factors_live_request(id, tickers, smoothing, as_of)
+        return await self.fetch_live(
+            path, api_key, params, _parse_portfolio_factors_live
+        )
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def get_portfolio_historical_weights(
+        self,
+        id: str,
+        api_key: str,
+        smoothing: str | None = None,
+        exchange: str | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        shards: int | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.DataFrame:
+        """Async version of ``unravel_client.get_portfolio_historical_weights``."""
+        path, params = _portfolio_historical_weights_request(
+            id, smoothing, exchange, start_date, end_date
+        )
+        return await self.fetch_history(
+            path, api_key, params, _parse_portfolio_historical_weights, shards
+        )
+
+    async def get_portfolio_historical_weights_batch(
+        self,
+        ids: list[str],
+        api_key: str,
+        smoothing: str | list[str] | None = None,
+        exchange: str | list[str] | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> BatchResult:
+        """Async version of ``unravel_client.get_portfolio_historical_weights_batch``."""
+        with call_scope(timeout, deadline):
+            return await self._run_batch(
+                self.get_portfolio_historical_weights,
+                ids,
+                api_key,
+                smoothing,
+                exchange,
+                start_date,
+                end_date,
+            )
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def get_portfolio_returns(
+        self,
+        id: str,
+        api_key: str,
+        smoothing: str | None = None,
+        exchange: str | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.Series:
+        """Async version of ``unravel_client.get_portfolio_returns``."""
+        path, params = _portfolio_returns_request(
+            id, smoothing, exchange, start_date, end_date
+        )
+        return await self.fetch_history(path, api_key, params, _parse_portfolio_returns)
+
+    async def get_portfolio_returns_batch(
+        self,
+        ids: list[str],
+        api_key: str,
+        smoothing: str | list[str] | None = None,
+        exchange: str | list[str] | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> BatchResult:
+        """Async version of ``unravel_client.get_portfolio_returns_batch``."""
+        with call_scope(timeout, deadline):
+            return await self._run_batch(
+                self.get_portfolio_returns,
+                ids,
+                api_key,
+                smoothing,
+                exchange,
+                start_date,
+                end_date,
+            )
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def get_price(
+        self,
+        ticker: str,
+        api_key: str,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.Series:
+        """Async version of ``unravel_client.get_price``."""
+        path, params = _price_request(ticker, start_date, end_date)
+        return await self.fetch(
+            path, api_key, params, partial(_parse_price, ticker=ticker)
+        )
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def _get_prices_chunk(
+        self,
+        tickers: list[str],
+        api_key: str,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> pd.DataFrame:
+        path, params = _prices_request(tickers, start_date, end_date)
+        return await self.fetch_history(
+            path, api_key, params, partial(_parse_prices, tickers=tickers)
+        )
+
+    async def get_prices(
+        self,
+        tickers: list[str],
+        api_key: str,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        chunk_size: int | None = TICKER_CHUNK_SIZE,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.DataFrame:
+        """Async version of ``unravel_client.get_prices``."""
+        _check_tickers(tickers)
+        chunks = chunked(tickers, chunk_size)
+        with call_scope(timeout, deadline):
+            frames = await asyncio.gather(
+                *(
+                    self._get_prices_chunk(chunk, api_key, start_date, end_date)
+                    for chunk in chunks
+                )
+            )
+        if len(frames) == 1:
+            return frames[0]
+        return concat_columns(list(frames), tickers)
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def get_risk_overlay(
+        self,
+        portfolio: str,
+        overlay: str,
+        api_key: str,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.Series:
+        """Async version of ``unravel_client.get_risk_overlay``."""
+        path, params = _risk_overlay_request(portfolio, overlay, start_date, end_date)
+        return await self.fetch_history(path, api_key, params, _parse_risk_overlay)
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def get_risk_overlay_live(
+        self,
+        portfolio: str,
+        overlay: str,
+        api_key: str,
+        as_of: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.Series:
+        """Async version of ``unravel_client.get_risk_overlay_live``."""
+        path, params = _risk_overlay_live_request(portfolio, overlay, as_of)
+        return await self.fetch_live(path, api_key, params, _parse_risk_overlay_live)
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def get_risk_regime(
+        self,
+        overlay: str,
+        api_key: str,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.Series:
+        """Async version of ``unravel_client.get_risk_regime``."""
+        path, params = _risk_regime_request(overlay, start_date, end_date)
+        return await self.fetch_history(path, api_key, params, _parse_risk_regime)
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def get_risk_regime_live(
+        self,
+        overlay: str,
+        api_key: str,
+        as_of: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> pd.Series:
+        """Async version of ``unravel_client.get_risk_regime_live``."""
+        path, params = _risk_regime_live_request(overlay, as_of)
+        return await self.fetch_live(path, api_key, params, _parse_risk_regime_live)
+
+    @retry_on_error(num_trials=3, wait=2.0)
+    async def get_tickers(
+        self,
+        id: str,
+        api_key: str,
+        universe_size: int | str,
+        exchange: str | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> list[str]:
+        """Async version of ``unravel_client.get_tickers``."""
+        path, params = _tickers_request(id, universe_size, exchange)
+        return await self.fetch(path, api_key, params, _parse_tickers)
@@ -0,0 +1,343 @@
+"""
+Vectorized backtests of portfolio weights against asset prices, optionally scaled
+by risk overlays.
+
+Weights of one or many portfolios are aligned on the price dates and stacked into
+a single ``(portfolios, dates, tickers)`` block, so that returns, turnover and
+costs of every portfolio are computed by a few NumPy operations.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class BacktestResult:
+    """
+    Daily results of a backtest.
+
+    Every attribute is a Series for a single portfolio, or a DataFrame with one
+    column per portfolio for a batch.
+
+    Attributes:
+        returns (pd.Series | pd.DataFrame): Returns net of transaction costs
+        gross_returns (pd.Series | pd.DataFrame): Returns before transaction costs
+        turnover (pd.Series | pd.DataFrame): Sum of the absolute weight changes traded on each date
+        costs (pd.Series | pd.DataFrame): Transaction costs paid on each date, as a return
+    """
+
+    returns: pd.Series | pd.DataFrame
+    gross_returns: pd.Series | pd.DataFrame
+    turnover: pd.Series | pd.DataFrame
+    costs: pd.Series | pd.DataFrame
+
+    def cumulative(self) -> pd.Series | pd.DataFrame:
+        """
+        Compounded net returns.
+
+        Returns:
+            pd.Series | pd.DataFrame: Growth of one unit invested on the first date
+        """
+        return (1 + self.returns).cumprod()
+
+
+def asset_returns(prices: pd.DataFrame) -> np.ndarray:
+    """
+    Simple daily returns of asset prices, as a float64 array.
+
+    Returns are 0 on the first date and wherever the price or the previous price is
+    missing, so that missing prices neither earn nor lose anything.
+
+    Args:
+        prices (pd.DataFrame): Date-indexed prices, one column per ticker
+    Returns:
+        np.ndarray: Array of shape ``(len(prices), len(prices.columns))``
+    """
+    values = prices.to_numpy(dtype=np.float64, na_value=np.nan)
+    returns = np.zeros_like(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = values[1:] / values[:-1] - 1
+    returns[~np.isfinite(returns)] = 0.0
+    return returns
+
+
+def align_weights(
+    weights: pd.DataFrame, dates: pd.DatetimeIndex, tickers: Sequence[Hashable]
+) -> np.ndarray:
+    """
+    Weights held on every date, as a float64 array.
+
+    Weights are rebalancing targets, kept until the next rebalancing date. Dates
+    before the first rebalancing and tickers missing from the portfolio hold 0.
+
+    Args:
+        weights (pd.DataFrame): Date-indexed weights, one column per ticker
+        dates (pd.DatetimeIndex): Dates to align on, in increasing order
+        tickers (Sequence[Hashable]): Columns to align on, usually tickers
+    Returns:
+        np.ndarray: Array of shape ``(len(dates), len(tickers))``
+    """
+    weights = weights.sort_index().reindex(columns=tickers)
+    held = weights.reindex(dates, method="ffill").to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+    return np.nan_to_num(held, nan=0.0)
+
+
+def simulate(
+    weights: np.ndarray,
+    returns: np.ndarray,
+    lag: int = 1,
+    cost: float | np.ndarray = 0.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Backtest a block of aligned weights.
+
+    Weights set on date ``t`` are traded at the close of date ``t + lag - 1`` and
+    earn the asset returns from date ``t + lag`` on. Trading from one set of weights
+    to the next costs ``cost`` per unit of weight traded. Weights are rebalanced to
+    their targets every date, turnover does not account for their drift in between.
+
+    Args:
+        weights (np.ndarray): Weights of shape ``(portfolios, dates, tickers)``, or ``(dates, tickers)`` for one portfolio
+        returns (np.ndarray): Asset returns of shape ``(dates, tickers)``
+        lag (int): Dates between setting weights and earning returns on them, 0 earns the returns of the same date
+        cost (float | np.ndarray): Cost per unit of weight traded (eg. ``0.001`` for 10 bps), or one cost per ticker
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Gross returns, turnover and costs,
+        of shape ``(portfolios, dates)``, or ``(dates,)`` for one portfolio
+    Raises:
+        ValueError: If ``lag`` is negative or the shapes do not match
+    """
+    if lag < 0:
+        raise ValueError("lag must be positive or zero")
+    single = weights.ndim == 2
+    weights = weights[None] if single else weights
+    if weights.shape[1:] != returns.shape:
+        raise ValueError(
+            f"Weights of shape {weights.shape[1:]} do not match returns of shape {returns.shape}"
+        )
+
+    # Weights set on date t are held on date t + lag, computed on shifted views
+    # rather than on a shifted copy of the block.
+    dates = weights.shape[1]
+    held = max(dates - lag, 0)
+    weights = weights[:, :held]
+    traded = np.empty_like(weights)
+    np.abs(weights[:, :1], out=traded[:, :1])  # Starting from an empty portfolio.
+    np.subtract(weights[:, 1:], weights[:, :-1], out=traded[:, 1:])
+    np.abs(traded, out=traded)
+
+    gross = np.zeros((len(weights), dates))
+    turnover = np.zeros_like(gross)
+    costs = np.zeros_like(gross)
+    gross[:, lag:] = np.einsum("ptn,tn->pt", weights, returns[lag:])
+    turnover[:, lag:] = traded.sum(axis=2)
+    costs[:, lag:] = traded @ np.broadcast_to(
+        np.asarray(cost, dtype=np.float64), traded.shape[2]
+    )
+    if single:
+        return gross[0], turnover[0], costs[0]
+    return gross, turnover, costs
+
+
+def _weights_block(
+    weights: pd.DataFrame | Mapping[Hashable, pd.DataFrame], dates: pd.DatetimeIndex
+) -> tuple[list[Hashable] | None, list[str], np.ndarray]:
+    # Keys of the portfolios (None for a single one), their tickers and their
+    # aligned weights of shape (portfolios, dates, tickers).
+    if isinstance(weights, Mapping):
+        tickers = list(dict.fromkeys(t for frame in weights.values() for t in frame))
+        frames = [align_weights(frame, dates, tickers) for frame in weights.values()]
+        block = np.stack(frames) if frames else np.zeros((0, len(dates), 0))
+        return list(weights), tickers, block
+    if not isinstance(weights.columns, pd.MultiIndex):
+        tickers = list(weights.columns)
+        return None, tickers, align_weights(weights, dates, tickers)[None]
+
+    # (id, ticker) columns, as returned by BatchResult.to_frame, are aligned in one
+    # go and reshaped rather than split into one frame per portfolio.
+    keys = list(weights.columns.droplevel(-1).unique())
+    tickers = list(weights.columns.get_level_values(-1).unique())
+    columns = pd.MultiIndex.from_tuples(
+        [
+            (*key, ticker) if isinstance(key, tuple) else (key, ticker)
+            for key in keys
+            for ticker in tickers
+        ]
+    )
+    aligned = align_weights(weights, dates, columns)
+    block = aligned.reshape(len(dates), len(keys), len(tickers)).transpose(1, 0, 2)
+    return keys, tickers, block
+
+
+def backtest(
+    weights: pd.DataFrame | Mapping[Hashable, pd.DataFrame],
+    prices: pd.DataFrame,
+    lag: int = 1,
+    cost: float | pd.Series = 0.0,
+) -> BacktestResult:
+    """
+    Backtest portfolio weights against asset prices, eg. to reproduce ``get_portfolio_returns``
+    from ``get_portfolio_historical_weights`` and ``get_prices``.
+
+    Weights are held from each rebalancing date until the next one. Many portfolios
+    are backtested at once, as a single ``(portfolios, dates, tickers)`` block.
+
+    Args:
+        weights (pd.DataFrame | Mapping[Hashable, pd.DataFrame]): Date-indexed weights with one column per ticker. For a batch, a mapping of portfolio keys to weights, or a frame with ``(id, ticker)`` columns like ``BatchResult.to_frame``
+        prices (pd.DataFrame): Date-indexed prices, one column per ticker. Their dates are the dates of the results
+        lag (int): Dates between setting weights and earning returns on them, 0 earns the returns of the same date
+        cost (float | pd.Series): Cost per unit of weight traded (eg. ``0.001`` for 10 bps), or a Series of costs per ticker
+    Returns:
+        BacktestResult: Series for a single portfolio, or frames with one column per portfolio for a batch
+    Raises:
+        ValueError: If a batch holds no portfolio
+    """
+    prices = prices.sort_index()
+    dates = pd.DatetimeIndex(prices.index)
+    keys, tickers, block = _weights_block(weights, dates)
+    if len(block) == 0:
+        raise ValueError("At least one portfolio is required")
+
+    returns = asset_returns(prices.reindex(columns=tickers))
+    gross, turnover, costs = simulate(block, returns, lag, _costs(cost, tickers))
+    columns = None if keys is None else pd.Index(keys, name="id", tupleize_cols=False)
+    return _result(gross, turnover, costs, dates, columns)
+
+
+def _overlay_block(
+    overlays: pd.Series | pd.DataFrame | Mapping[Hashable, pd.Series],
+    dates: pd.DatetimeIndex,
+) -> tuple[list[Hashable] | None, np.ndarray]:
+    # Keys of the overlays (None for a single series) and their values of shape
+    # (overlays, dates), forward-filled on the dates and 1 before their start.
+    if isinstance(overlays, pd.Series):
+        keys, frame = None, overlays.to_frame()
+    elif isinstance(overlays, Mapping):
+        keys = list(overlays)
+        frame = pd.concat(list(overlays.values()), axis=1, keys=range(len(keys)))
+    else:
+        keys, frame = list(overlays.columns), overlays
+    aligned = frame.sort_index().reindex(dates, method="ffill")
+    values = aligned.to_numpy(dtype=np.float64, na_value=np.nan).T
+    return keys, np.nan_to_num(values, nan=1.0)
+
+
+def apply_overlay(
+    weights: pd.DataFrame,
+    overlays: pd.Series | pd.DataFrame | Mapping[Hashable, pd.Series],
+) -> pd.DataFrame:
+    """
+    Scale weights by exposure scalers, like ``get_risk_overlay`` or ``get_risk_regime`` series.
+
+    Scalers are forward-filled on the dates of the weights, dates before the first
+    scaler keep their weights unchanged.
+
+    Args:
+        weights (pd.DataFrame): Date-indexed weights, one column per ticker
+        overlays (pd.Series | pd.DataFrame | Mapping[Hashable, pd.Series]): A scaler series, or many of them as the columns of a frame or a mapping
+    Returns:
+        pd.DataFrame: Scaled weights, with ``(overlay, ticker)`` columns for many overlays
+    """
+    weights = weights.sort_index()
+    keys, scalers = _overlay_block(overlays, pd.DatetimeIndex(weights.index))
+    values = weights.to_numpy(dtype=np.float64, na_value=np.nan)
+    if keys is None:
+        return pd.DataFrame(
+            values * scalers[0][:, None], index=weights.index, columns=weights.columns
+        )
+    scaled = values[:, None, :] * scalers.T[:, :, None]
+    columns = pd.MultiIndex.from_product(
+        [pd.Index(keys, tupleize_cols=False), weights.columns],
+        names=["overlay", "ticker"],
+    )
+    return pd.DataFrame(
+        scaled.reshape(len(weights), -1), index=weights.index, columns=columns
+    )
+
+
+def backtest_overlays(
+    weights: pd.DataFrame | Mapping[Hashable, pd.DataFrame],
+    prices: pd.DataFrame,
+    overlays: pd.Series | pd.DataFrame | Mapping[Hashable, pd.Series],
+    lag: int = 1,
+    cost: float | pd.Series = 0.0,
+) -> BacktestResult:
+    """
+    Backtest every combination of portfolios and overlays in a single pass.
+
+    The weights of every portfolio, aligned as in ``backtest``, are scaled by every
+    overlay forward-filled on the price dates. The resulting
+    ``(portfolios x overlays, dates, tickers)`` block is backtested at once, so
+    overlay changes between rebalancings are traded and pay ``cost`` too.
+
+    Args:
+        weights (pd.DataFrame | Mapping[Hashable, pd.DataFrame]): Weights of one portfolio or a batch, as for ``backtest``
+        prices (pd.DataFrame): Date-indexed prices, one column per ticker. Their dates are the dates of the results
+        overlays (pd.Series | pd.DataFrame | Mapping[Hashable, pd.Series]): A scaler series, or many of them as the columns of a frame or a mapping
+        lag (int): Dates between setting weights and earning returns on them, 0 earns the returns of the same date
+        cost (float | pd.Series): Cost per unit of weight traded (eg. ``0.001`` for 10 bps), or a Series of costs per ticker
+    Returns:
+        BacktestResult: One column per ``(id, overlay)`` combination. Columns are only
+        keyed by overlay for a single portfolio, or by id for a single overlay series
+    Raises:
+        ValueError: If a batch holds no portfolio
+    """
+    prices = prices.sort_index()
+    dates = pd.DatetimeIndex(prices.index)
+    keys, tickers, block = _weights_block(weights, dates)
+    if len(block) == 0:
+        raise ValueError("At least one portfolio is required")
+    overlay_keys, scalers = _overlay_block(overlays, dates)
+
+    # (portfolios, overlays, dates, tickers), flattened to one portfolio per combination.
+    scaled = block[:, None] * scalers[None, :, :, None]
+    returns = asset_returns(prices.reindex(columns=tickers))
+    gross, turnover, costs = simulate(
+        scaled.reshape(-1, *block.shape[1:]), returns, lag, _costs(cost, tickers)
+    )
+
+    if keys is None and overlay_keys is None:
+        columns = None
+    elif keys is None:
+        columns = pd.Index(overlay_keys, name="overlay", tupleize_cols=False)
+    elif overlay_keys is None:
+        columns = pd.Index(keys, name="id", tupleize_cols=False)
+    else:
+        columns = pd.MultiIndex.from_product(
+            [pd.Index(keys, tupleize_cols=False), pd.Index(overlay_keys)],
+            names=["id", "overlay"],
+        )
+    return _result(gross, turnover, costs, dates, columns)
+
+
+def _costs(cost: float | pd.Series, tickers: list[str]) -> float | np.ndarray:
+    if isinstance(cost, pd.Series):
+        return cost.reindex(tickers).fillna(0.0).to_numpy(dtype=np.float64)
+    return cost
+
+
+def _result(
+    gross: np.ndarray,
+    turnover: np.ndarray,
+    costs: np.ndarray,
+    dates: pd.DatetimeIndex,
+    columns: pd.Index | None,
+) -> BacktestResult:
+    def wrap(values: np.ndarray, name: str) -> pd.Series | pd.DataFrame:
+        if columns is None:
+            return pd.Series(values[0], index=dates, name=name)
+        return pd.DataFrame(values.T, index=dates, columns=columns)
+
+    return BacktestResult(
+        returns=wrap(gross - costs, "returns"),
+        gross_returns=wrap(gross, "gross_returns"),
+        turnover=wrap(turnover, "turnover"),
+        costs=wrap(costs, "costs"),
+    )
@@ -0,0 +1,441 @@
+"""
+Client-side caches for Unravel API responses.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Union
+
+# pandas is imported when first needed, clients only dealing with plain payloads never load it.
+if TYPE_CHECKING:
+    import pandas as pd
+
+    PandasData = Union[pd.DataFrame, pd.Series]
+
+DATE_PARAMS = ("start_date", "end_date")
+
+
+def request_key(path: str, api_key: str, params: dict) -> Hashable:
+    """Identity of a request, independent of the order of its parameters."""
+    return (path, api_key, tuple(sorted((k, str(v)) for k, v in params.items())))
+
+
+def parser_key(parse: Callable[[Any], Any]) -> Hashable:
+    """
+    Identity of a parser, so that one response is never handed to another parser.
+
+    Partials of the same function with the same arguments share their identity,
+    even though every endpoint call creates a new partial.
+    """
+    if isinstance(parse, functools.partial):
+        keywords = tuple(sorted((k, repr(v)) for k, v in parse.keywords.items()))
+        return (parser_key(parse.func), repr(parse.args), keywords)
+    return parse
+
+
+@dataclass
+class HistoryPlan:
+    """
+    Outcome of a ``HistoryCache.lookup``.
+
+    Attributes:
+        key (str): Cache key of the request, independent of its date range
+        params (dict): Query parameters of the original request
+        cached (pd.DataFrame | pd.Series | None): Data already stored for the key, if it can be reused
+        request_params (dict | None): Parameters of the request that still has to be sent, or None if the cache fully answers the request
+        cached_start (str | None): First date the cached data was requested from, None if it covers the full history
+    """
+
+    key: str
+    params: dict
+    cached: PandasData | None
+    request_params: dict | None
+    cached_start: str | None = None
+
+
+class HistoryCache:
+    """
+    Persistent on-disk cache for historical endpoints, stored as Parquet files.
+
+    Past dates of historical series never change, so each endpoint + parameter
+    combination (ignoring ``start_date`` and ``end_date``) is stored once. On
+    subsequent calls only the tail starting at the last cached date is requested
+    from the API and spliced onto the stored data. Entries are keyed by API key as
+    well, so that credentials with different entitlements never share history.
+
+    Files are replaced atomically and an entry whose data and metadata do not match
+    is treated as missing, but fills are only serialized within one process: a
+    directory shared by several processes may fetch the same dates more than once.
+
+    Requires a Parquet engine (``pip install unravel-client[cache]``).
+
+    Args:
+        directory (str | os.PathLike): Directory holding the cache files, created if missing
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        if (
+            importlib.util.find_spec("pyarrow") is None
+            and importlib.util.find_spec("fastparquet") is None
+        ):
+            raise ImportError(
+                "HistoryCache requires pyarrow, install it with `pip install unravel-client[cache]`"
+            )
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def key(self, path: str, params: dict, api_key: str | None = None) -> str:
+        """Cache key of a request, ignoring its date range."""
+        identity = {k: str(v) for k, v in params.items() if k not in DATE_PARAMS}
+        raw = json.dumps([path, api_key, sorted(identity.items())])
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def lock(self, key: str) -> threading.Lock:
+        """Lock serializing concurrent fills of the same cache entry."""
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def lookup(
+        self, path: str, params: dict, api_key: str | None = None
+    ) -> HistoryPlan:
+        """
+        Decide which part of a request has to be fetched from the API.
+
+        Args:
+            path (str): API path of the request
+            params (dict): Query parameters of the request
+            api_key (str | None): API key the request is sent with
+        Returns:
+            HistoryPlan: Cached data and the parameters of the remaining request
+        """
+        import pandas as pd
+
+        key = self.key(path, params, api_key)
+        start_date = params.get("start_date")
+        end_date = params.get("end_date")
+        entry = self._load(key)
+
+        if entry is None:
+            return HistoryPlan(key, params, None, dict(params))
+        cached, cached_start = entry
+        covers_start = cached_start is None or (
+            start_date is not None
+            and pd.Timestamp(start_date) >= pd.Timestamp(cached_start)
+        )
+        if not covers_start or len(cached) == 0:
+            return HistoryPlan(key, params, None, dict(params))
+
+        last = cached.index.max()
+        if end_date is not None and pd.Timestamp(end_date) <= last:
+            return HistoryPlan(key, params, cached, None, cached_start)
+        # The last cached date is requested again, in case it was still in progress.
+        request_params = {**params, "start_date": last.strftime("%Y-%m-%d")}
+        return HistoryPlan(key, params, cached, request_params, cached_start)
+
+    def update(self, plan: HistoryPlan, fetched: PandasData | None) -> PandasData:
+        """
+        Splice freshly fetched data onto the cached data and persist it.
+
+        Args:
+            plan (HistoryPlan): The plan returned by ``lookup``
+            fetched (pd.DataFrame | pd.Series | None): Response of the request described by ``plan.request_params``
+        Returns:
+            pd.DataFrame | pd.Series: The data for the originally requested date range
+        """
+        import pandas as pd
+
+        if plan.cached is None:
+            data = fetched
+            self._store(plan.key, data, plan.params.get("start_date"))
+        elif fetched is not None and len(fetched) > 0:
+            head = plan.cached[plan.cached.index < fetched.index.min()]
+            data = pd.concat([head, fetched])
+            self._store(plan.key, data, plan.cached_start)
+        else:
+            data = plan.cached
+
+        start_date = plan.params.get("start_date")
+        end_date = plan.params.get("end_date")
+        if start_date is None and end_date is None:
+            return data
+        return data.loc[start_date:end_date]
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for file in self.directory.glob("*.parquet"):
+            file.unlink()
+        for file in self.directory.glob("*.json"):
+            file.unlink()
+        for file in self.directory.glob("*.tmp"):
+            file.unlink(missing_ok=True)
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _data_path(self, key: str) -> Path:
+        return self.directory / f"{key}.parquet"
+
+    def _load(self, key: str) -> tuple[PandasData, str | None] | None:
+        meta_path, data_path = self._meta_path(key), self._data_path(key)
+        if not meta_path.exists() or not data_path.exists():
+            return None
+        import pandas as pd
+
+        meta = json.loads(meta_path.read_text())
+        with data_path.open("rb") as file:
+            # The metadata is written last, data replaced by another writer in between
+            # would not be the one it describes.
+            stat = os.fstat(file.fileno())
+            if [stat.st_size, stat.st_mtime_ns] != meta.get("data"):
+                return None
+            frame = pd.read_parquet(file)
+        if meta["kind"] == "series":
+            data = frame.iloc[:, 0].rename(meta["name"])
+        else:
+            data = frame
+        return data, meta["start_date"]
+
+    def _store(self, key: str, data: PandasData, start_date: str | None) -> None:
+        import pandas as pd
+
+        if isinstance(data, pd.Series):
+            meta = {"kind": "series", "name": data.name}
+            frame = data.to_frame(name="values")
+        else:
+            meta = {"kind": "frame", "name": None}
+            frame = data
+        meta["start_date"] = start_date
+
+        tmp_data = self._temp_path()
+        try:
+            frame.to_parquet(tmp_data)
+            stat = tmp_data.stat()
+            meta["data"] = [stat.st_size, stat.st_mtime_ns]
+            tmp_data.replace(self._data_path(key))
+        finally:
+            tmp_data.unlink(missing_ok=True)
+        tmp_meta = self._temp_path()
+        try:
+            tmp_meta.write_text(json.dumps(meta))
+            tmp_meta.replace(self._meta_path(key))
+        finally:
+            tmp_meta.unlink(missing_ok=True)
+
+    def _temp_path(self) -> Path:
+        # Unique per writer, so that concurrent writers never share a temporary file.
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as file:
+            return Path(file.name)
+
+
+class LiveCache:
+    """
+    Bounded in-memory cache for live endpoints, with LRU eviction and an ``as_of``-aware TTL.
+
+    Values fetched with ``as_of='close'`` only change at the next daily close, so they
+    are kept until then. Any other value (``as_of='latest'`` or the API default) is
+    only kept for ``latest_ttl`` seconds.
+
+    Args:
+        maxsize (int): Maximum number of entries, the least recently used one is evicted first
+        latest_ttl (float): Seconds to keep values that are not pinned to the daily close
+        close_hour (int): UTC hour of the daily close
+    """
+
+    def __init__(
+        self, maxsize: int = 256, latest_ttl: float = 30.0, close_hour: int = 0
+    ):
+        self.maxsize = maxsize
+        self.latest_ttl = latest_ttl
+        self.close_hour = close_hour
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, path: str, api_key: str, params: dict) -> Hashable:
+        """Cache key of a request."""
+        return request_key(path, api_key, params)
+
+    def ttl(self, as_of: str | None, now: datetime | None = None) -> float:
+        """Seconds a value fetched with the given ``as_of`` stays valid."""
+        if as_of != "close":
+            return self.latest_ttl
+        now = now or datetime.now(timezone.utc)
+        close = now.replace(hour=self.close_hour, minute=0, second=0, microsecond=0)
+        if close <= now:
+            close += timedelta(days=1)
+        return (close - now).total_seconds()
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """
+        Look up a key, counting the hit or miss.
+
+        Returns:
+            tuple[bool, Any]: Whether the key was found and not expired, and its value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, _copy(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, _copy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Hit and miss counters and the current number of entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ConditionalCache:
+    """
+    Bounded in-memory cache of parsed results and the validators they were served with.
+
+    Requests whose previous response carried an ``ETag`` or ``Last-Modified`` header are
+    sent as conditional requests, and a ``304 Not Modified`` answer reuses the parsed
+    result instead of downloading and parsing the payload again.
+
+    Args:
+        maxsize (int): Maximum number of entries, the least recently used one is evicted first
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[dict, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(
+        self,
+        path: str,
+        api_key: str,
+        params: dict,
+        parse: Callable[[Any], Any] | None = None,
+    ) -> Hashable:
+        """
+        Cache key of a request and the parser of its result.
+
+        The cached value is already parsed, so a request parsed in different ways
+        needs one entry per parser.
+        """
+        return (request_key(path, api_key, params), parser_key(parse))
+
+    def headers(self, key: Hashable) -> dict:
+        """Conditional request headers for a key, empty if nothing is cached for it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry[0]) if entry is not None else {}
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """
+        Look up the result to reuse after a ``304 Not Modified`` response.
+
+        Returns:
+            tuple[bool, Any]: Whether the key was found, and its value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, _copy(entry[1])
+
+    def set(
+        self, key: Hashable, response_headers: Mapping[str, str], value: Any
+    ) -> None:
+        """
+        Store a parsed result if its response carried validators.
+
+        Args:
+            key (Hashable): Cache key of the request
+            response_headers (Mapping[str, str]): Headers of the response, looked up case-insensitively
+            value (Any): Parsed result of the response
+        """
+        headers = {name.lower(): header for name, header in response_headers.items()}
+        validators = {}
+        if headers.get("etag"):
+            validators["If-None-Match"] = headers["etag"]
+        if headers.get("last-modified"):
+            validators["If-Modified-Since"] = headers["last-modified"]
+        with self._lock:
+            self.misses += 1
+            if not validators:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = (validators, _copy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Counters of reused (``hits``) and downloaded (``misses``) results and the current number of entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _copy(value: Any) -> Any:
+    # Callers get their own copy, so mutating a result never corrupts the cache. A
+    # value cannot be a pandas object unless pandas has been imported.
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(value, (pd.Series, pd.DataFrame)):
+        return value.copy()
+    return value
@@ -0,0 +1,192 @@
+"""
+Circuit breaker failing calls fast while the API is degraded.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while the circuit of its endpoint is open.
+
+    Attributes:
+        key (str): Endpoint or host whose circuit is open
+        retry_in (float): Seconds until the circuit lets a probe request through
+    """
+
+    def __init__(self, key: str, retry_in: float):
+        super().__init__(
+            f"Circuit for {key} is open after repeated failures, retry in {retry_in:.1f}s"
+        )
+        self.key = key
+        self.retry_in = retry_in
+
+
+def is_failure_status(status: int) -> bool:
+    """Whether a response status is a sign of a degraded API rather than a client error."""
+    return status >= 500 or status == 408
+
+
+@dataclass
+class _Circuit:
+    outcomes: deque = field(default_factory=deque)
+    state: str = CLOSED
+    opened_at: float = 0.0
+    probes: int = 0
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint (or per-host) circuit breaker.
+
+    A closed circuit lets every request through and records whether it failed.
+    Once at least ``min_calls`` of the last ``window`` requests were recorded and
+    the share of failures reaches ``failure_threshold``, the circuit opens and
+    requests fail immediately with ``CircuitOpenError``. After ``reset_timeout``
+    seconds it half-opens and lets ``half_open_calls`` probe requests through: a
+    successful probe closes the circuit, a failed one opens it again.
+
+    Failures are transport errors (timeouts, refused connections, ...) and 5xx or
+    408 responses. Client errors like an invalid API key do not count.
+
+    Args:
+        failure_threshold (float): Share of failed requests opening the circuit, between 0 and 1
+        window (int): Number of most recent requests the failure share is computed on
+        min_calls (int): Minimum number of recorded requests before the circuit may open
+        reset_timeout (float): Seconds an open circuit waits before letting probes through
+        half_open_calls (int): Number of concurrent probe requests allowed while half-open
+        per (str): ``endpoint`` for one circuit per API path, ``host`` for one per API host
+        clock (Callable): Monotonic clock in seconds
+    """
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        per: str = "endpoint",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if per not in ("endpoint", "host"):
+            raise ValueError("per must be either 'endpoint' or 'host'")
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.per = per
+        self.clock = clock
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def key(self, base_url: str, path: str) -> str:
+        """Circuit key of a request, its path or its host depending on ``per``."""
+        if self.per == "host":
+            return urlparse(base_url).netloc
+        return path.strip("/")
+
+    def _circuit(self, key: str) -> _Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit(deque(maxlen=self.window))
+        return circuit
+
+    def before(self, key: str) -> None:
+        """
+        Check that a request may be sent, to be called right before sending it.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all probes in flight
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == CLOSED:
+                return
+            retry_in = circuit.opened_at + self.reset_timeout - self.clock()
+            if circuit.state == OPEN and retry_in > 0:
+                raise CircuitOpenError(key, retry_in)
+            circuit.state = HALF_OPEN
+            if circuit.probes >= self.half_open_calls:
+                raise CircuitOpenError(key, 0.0)
+            circuit.probes += 1
+
+    def record(self, key: str, failed: bool) -> None:
+        """
+        Record the outcome of a request let through by ``before``.
+
+        Args:
+            key (str): Circuit key of the request
+            failed (bool): Whether the request failed
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+                circuit.outcomes.clear()
+                if failed:
+                    self._open(circuit)
+                else:
+                    circuit.state = CLOSED
+                return
+            if circuit.state == OPEN:
+                return
+            circuit.outcomes.append(failed)
+            calls = len(circuit.outcomes)
+            if (
+                calls >= self.min_calls
+                and sum(circuit.outcomes) / calls >= self.failure_threshold
+            ):
+                self._open(circuit)
+
+    def cancel(self, key: str) -> None:
+        """Give back the probe slot of a request let through by ``before`` but never sent."""
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+
+    def _open(self, circuit: _Circuit) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = self.clock()
+        circuit.outcomes.clear()
+
+    def states(self) -> dict[str, dict]:
+        """
+        Current state of every circuit, for monitoring.
+
+        Returns:
+            dict[str, dict]: ``state`` (``closed``, ``open`` or ``half_open``), number of
+            recorded ``calls`` and ``failures`` in the window, and ``retry_in`` seconds
+            for open circuits, per key
+        """
+        with self._lock:
+            now = self.clock()
+            return {
+                key: {
+                    "state": circuit.state,
+                    "calls": len(circuit.outcomes),
+                    "failures": sum(circuit.outcomes),
+                    "retry_in": max(0.0, circuit.opened_at + self.reset_timeout - now)
+                    if circuit.state == OPEN
+                    else 0.0,
+                }
+                for key, circuit in self._circuits.items()
+            }
+
+    def reset(self) -> None:
+        """Close every circuit and forget recorded outcomes."""
+        with self._lock:
+            self._circuits.clear()
@@ -0,0 +1,436 @@
+"""
+HTTP client shared by every endpoint function of the Unravel client library.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .cache import (
+    ConditionalCache,
+    HistoryCache,
+    LiveCache,
+    parser_key,
+    request_key,
+)
+from .circuit import CircuitBreaker, is_failure_status
+from .compression import TransferStats, accept_encoding
+from .constants import BASEAPI, get_headers
+from .decoding import accept_header, decode, get_loads
+from .instrumentation import Instrumentation, Listener, current_event, phase
+from .metrics import MetricsRegistry
+from .parallel import concat_rows, split_date_range
+from .ratelimit import RateLimiter
+from .singleflight import SingleFlight
+from .timeouts import (
+    DEFAULT_TIMEOUT,
+    DeadlineExceeded,
+    deadline_passed,
+    remaining_time,
+    request_timeout,
+)
+
+
+class UnravelClient:
+    """
+    Connection-pooling HTTP client for the Unravel API.
+
+    A single ``requests.Session`` is kept alive for the lifetime of the client, so
+    consecutive calls reuse already established TCP/TLS connections to the API
+    instead of paying a new handshake on every request.
+
+    Args:
+        base_url (str): Root URL of the API, defaults to ``BASEAPI``
+        pool_connections (int): Number of per-host connection pools to keep
+        pool_maxsize (int): Maximum number of keep-alive connections per host, should be at least the number of threads calling the API concurrently
+        timeout (float | tuple[float, float] | None): Default timeout in seconds for every request, either a single value or a (connect, read) tuple. None waits forever
+        history_cache (HistoryCache | str | os.PathLike | None): On-disk cache, or its directory, used by historical endpoints to only download dates they have not seen before
+        live_cache (LiveCache | bool | None): In-memory cache for live endpoints, ``True`` creates one with default settings
+        coalesce (bool): Whether identical requests issued concurrently from several threads share a single HTTP call and its parsed result
+        max_workers (int | None): Maximum number of threads used to send the parts of a split request concurrently, defaults to ``pool_maxsize``
+        json_backend (str | None): JSON library used to decode responses, one of ``orjson``, ``msgspec`` or ``json``. None picks the fastest one installed
+        conditional_cache (ConditionalCache | bool | None): In-memory cache of results served with ``ETag``/``Last-Modified`` validators, reused when the API answers a conditional request with ``304 Not Modified``. ``True`` creates one with default settings
+        rate_limiter (RateLimiter | None): Limiter every request acquires a token from before being sent, eg. ``TokenBucket(rate=10)`` or a ``FileTokenBucket`` shared by several processes
+        circuit_breaker (CircuitBreaker | bool | None): Breaker failing requests fast with ``CircuitOpenError`` while an endpoint keeps failing, ``True`` creates one with default settings
+        deadline (float | None): Default end-to-end deadline in seconds of every endpoint call, retries included. None for no deadline
+        listeners (Iterable[CallListener | Callable] | None): Instrumentation listeners notified of every API call, see ``CallEvent``. More can be added through ``instrumentation.add_listener``
+        metrics (MetricsRegistry | bool | None): Registry aggregating latency histograms and request, retry, error and cache hit counters, ``True`` creates one with default settings
+        wire_format (str): Preferred response format, one of ``json``, ``arrow`` (Arrow IPC stream) or ``parquet``. Binary formats require pyarrow, responses fall back to JSON when the API does not offer them
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASEAPI,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        timeout: float | tuple[float, float] | None = DEFAULT_TIMEOUT,
+        history_cache: HistoryCache | str | os.PathLike | None = None,
+        live_cache: LiveCache | bool | None = None,
+        coalesce: bool = True,
+        max_workers: int | None = None,
+        json_backend: str | None = None,
+        wire_format: str = "json",
+        conditional_cache: ConditionalCache | bool | None = None,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | bool | None = None,
+        deadline: float | None = None,
+        listeners: Iterable[Listener] | None = None,
+        metrics: MetricsRegistry | bool | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.deadline = deadline
+        if history_cache is not None and not isinstance(history_cache, HistoryCache):
+            history_cache = HistoryCache(history_cache)
+        self.history_cache = history_cache
+        if isinstance(live_cache, bool):
+            live_cache = LiveCache() if live_cache else None
+        self.live_cache = live_cache
+        if isinstance(conditional_cache, bool):
+            conditional_cache = ConditionalCache() if conditional_cache else None
+        self.conditional_cache = conditional_cache
+        self.rate_limiter = rate_limiter
+        if isinstance(circuit_breaker, bool):
+            circuit_breaker = CircuitBreaker() if circuit_breaker else None
+        self.circuit_breaker = circuit_breaker
+        self.coalesce = coalesce
+        self.max_workers = max_workers or pool_maxsize
+        self.loads = get_loads(json_backend)
+        self.wire_format = wire_format
+        self.accept = accept_header(wire_format)
+        # Only advertise the codings urllib3 decompresses by itself.
+        self.accept_encoding = accept_encoding(ACCEPT_ENCODING.split(","))
+        self.transfer_stats = TransferStats()
+        self.instrumentation = Instrumentation(listeners)
+        if isinstance(metrics, bool):
+            metrics = MetricsRegistry() if metrics else None
+        self.metrics = metrics
+        if metrics is not None:
+            self.instrumentation.add_listener(metrics)
+        self._inflight = SingleFlight()
+        self.session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def url(self, path: str) -> str:
+        """Build the absolute URL of an API path (eg. ``portfolio/returns``)."""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(
+        self, path: str, api_key: str, params: dict, headers: dict | None = None
+    ) -> requests.Response:
+        """
+        Issue a GET request against the API through the pooled session.
+
+        Args:
+            path (str): API path relative to ``base_url`` (eg. ``portfolio/returns``)
+            api_key (str): The API key to use for the request
+            params (dict): Query parameters of the request
+            headers (dict | None): Additional request headers
+        Returns:
+            requests.Response: The raw response, status is not checked. Its size is added to ``transfer_stats``
+        Raises:
+            CircuitOpenError: If ``circuit_breaker`` currently rejects requests to ``path``
+            DeadlineExceeded: If the deadline of the current call passes before the response is received
+        """
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            circuit = breaker.key(self.base_url, path)
+            breaker.before(circuit)
+        try:
+            if self.rate_limiter is not None:
+                with phase("wait"):
+                    self.rate_limiter.acquire(timeout=remaining_time(self.deadline))
+            with phase("request"):
+                response = self.session.get(
+                    self.url(path),
+                    headers={
+                        **get_headers(api_key),
+                        "Accept": self.accept,
+                        "Accept-Encoding": self.accept_encoding,
+                        **(headers or {}),
+                    },
+                    params=params,
+                    timeout=request_timeout(self.timeout, self.deadline),
+                )
+        except DeadlineExceeded:
+            if breaker is not None:
+                breaker.cancel(circuit)
+            raise
+        except Exception as e:
+            if breaker is not None:
+                breaker.record(circuit, failed=True)
+            if isinstance(e, requests.Timeout) and deadline_passed():
+                raise DeadlineExceeded(f"Deadline exceeded waiting for {path}") from e
+            raise
+        except BaseException:
+            # Interrupted before an outcome was known, the probe slot is given back.
+            if breaker is not None:
+                breaker.cancel(circuit)
+            raise
+        if breaker is not None:
+            breaker.record(circuit, failed=is_failure_status(response.status_code))
+        body = response.content
+        tell = getattr(response.raw, "tell", None)
+        wire_bytes = tell() if tell else len(body)
+        self.transfer_stats.record(path, wire_bytes, len(body))
+        event = current_event()
+        if event is not None:
+            event.status = response.status_code
+            event.wire_bytes += wire_bytes
+            event.decoded_bytes += len(body)
+        return response
+
+    def fetch(
+        self,
+        path: str,
+        api_key: str,
+        params: dict,
+        parse: Callable[[Any], Any],
+    ) -> Any:
+        """
+        Request an API path and parse its JSON payload.
+
+        Identical requests that are already in flight are not sent again, the caller
+        waits for them and receives the same parsed result.
+
+        Args:
+            path (str): API path relative to ``base_url`` (eg. ``portfolio/returns``)
+            api_key (str): The API key to use for the request
+            params (dict): Query parameters of the request
+            parse (Callable): Function turning the decoded JSON payload into the returned object
+        Returns:
+            Any: The output of ``parse``
+        Raises:
+            requests.HTTPError: If the API responds with an error status
+        """
+        if not self.coalesce:
+            return self._fetch(path, api_key, params, parse)
+        return self._inflight.do(
+            (request_key(path, api_key, params), parser_key(parse)),
+            lambda: self._fetch(path, api_key, params, parse),
+            timeout=remaining_time(self.deadline),
+        )
+
+    def _fetch(
+        self,
+        path: str,
+        api_key: str,
+        params: dict,
+        parse: Callable[[Any], Any],
+    ) -> Any:
+        with self.instrumentation.call(path, params) as event:
+            conditional = self.conditional_cache
+            key = None
+            headers = None
+            if conditional is not None:
+                key = conditional.key(path, api_key, params, parse)
+                headers = conditional.headers(key)
+            response = self.get(path, api_key, params, headers)
+            if response.status_code == 304 and conditional is not None:
+                hit, value = conditional.get(key)
+                if hit:
+                    if event is not None:
+                        event.not_modified = True
+                    return value
+                # Evicted while the request was in flight.
+                response = self.get(path, api_key, params)
+            response.raise_for_status()
+            with phase("decode"):
+                payload = decode(
+                    response.content, self.loads, response.headers.get("Content-Type")
+                )
+            with phase("parse"):
+                value = parse(payload)
+            if conditional is not None:
+                conditional.set(key, response.headers, value)
+            return value
+
+    def fetch_range(
+        self,
+        path: str,
+        api_key: str,
+        params: dict,
+        parse: Callable[[Any], Any],
+        shards: int | None = None,
+        combine: Callable[[list], Any] = concat_rows,
+    ) -> Any:
+        """
+        Same as ``fetch``, optionally splitting the requested date range into shards.
+
+        The ``[start_date, end_date]`` range of ``params`` is split into ``shards``
+        windows that are requested concurrently, their parsed results are merged
+        with ``combine``.
+
+        Raises:
+            ValueError: If ``shards`` is given without a ``start_date``
+        """
+        if not shards or shards <= 1:
+            return self.fetch(path, api_key, params, parse)
+        if params.get("start_date") is None:
+            raise ValueError("start_date is required to split a request into shards")
+
+        windows = split_date_range(params["start_date"], params.get("end_date"), shards)
+        return combine(
+            self.map(
+                lambda window: self.fetch(
+                    path,
+                    api_key,
+                    {**params, "start_date": window[0], "end_date": window[1]},
+                    parse,
+                ),
+                windows,
+            )
+        )
+
+    def fetch_history(
+        self,
+        path: str,
+        api_key: str,
+        params: dict,
+        parse: Callable[[Any], Any],
+        shards: int | None = None,
+    ) -> Any:
+        """
+        Same as ``fetch_range``, for historical endpoints that can be served from ``history_cache``.
+
+        Only the dates missing from the cache are requested, ``parse`` must return a
+        pandas object indexed by date.
+        """
+        if self.history_cache is None:
+            return self.fetch_range(path, api_key, params, parse, shards)
+
+        cache = self.history_cache
+        with cache.lock(cache.key(path, params, api_key)):
+            plan = cache.lookup(path, params, api_key)
+            fetched = None
+            if plan.request_params is not None:
+                fetched = self.fetch_range(
+                    path, api_key, plan.request_params, parse, shards
+                )
+            else:
+                self.instrumentation.cache_hit(path, "history")
+            return cache.update(plan, fetched)
+
+    def fetch_live(
+        self,
+        path: str,
+        api_key: str,
+        params: dict,
+        parse: Callable[[Any], Any],
+    ) -> Any:
+        """
+        Same as ``fetch``, for live endpoints that can be served from ``live_cache``.
+        """
+        if self.live_cache is None:
+            return self.fetch(path, api_key, params, parse)
+
+        key = self.live_cache.key(path, api_key, params)
+        hit, value = self.live_cache.get(key)
+        if hit:
+            self.instrumentation.cache_hit(path, "live")
+            return value
+        value = self.fetch(path, api_key, params, parse)
+        self.live_cache.set(key, value, self.live_cache.ttl(params.get("as_of")))
+        return value
+
+    def map(self, func: Callable[[Any], Any], items: Iterable) -> list:
+        """
+        Apply ``func`` to every item concurrently, using up to ``max_workers`` threads.
+
+        A new pool of threads is used for every call, so ``func`` may itself call ``map``.
+
+        Args:
+            func (Callable): Function to apply, typically sending one request
+            items (Iterable): Items to apply ``func`` to
+        Returns:
+            list: The results, in the order of ``items``
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(min(self.max_workers, len(items))) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, func, item)
+                for item in items
+            ]
+            return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> UnravelClient:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_default_client: UnravelClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> UnravelClient:
+    """
+    Return the client used by the module-level endpoint functions.
+
+    The client is created lazily with default settings on first use.
+    """
+    global _default_client  # noqa: PLW0603
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = UnravelClient()
+    return _default_client
+
+
+def set_client(client: UnravelClient | None) -> UnravelClient | None:
+    """
+    Replace the client used by the module-level endpoint functions.
+
+    Args:
+        client (UnravelClient | None): The client every endpoint function should route through, ``None`` restores a default client on next use
+    Returns:
+        UnravelClient | None: The previously configured client, if any
+    """
+    global _default_client
+    with _default_client_lock:
+        previous, _default_client = _default_client, client
+    return previous
+
+
+def configure(**kwargs) -> UnravelClient:
+    """
+    Configure the client used by the module-level endpoint functions.
+
+    Accepts the same keyword arguments as ``UnravelClient``. The previous client's
+    connections are closed.
+
+    Returns:
+        UnravelClient: The newly configured client
+    """
+    client = UnravelClient(**kwargs)
+    previous = set_client(client)
+    if previous is not None:
+        previous.close()
+    return client
@@ -0,0 +1,146 @@
+"""
+Negotiation of compressed responses and measurement of the bytes they save.
+"""
+
+from __future__ import annotations
+
+import gzip
+import threading
+import zlib
+from collections.abc import Callable, Iterable
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+
+def _zstd_decompress(body: bytes) -> bytes:
+    # Streaming decompression, frames sent by servers often omit the content size.
+    return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+
+
+def _deflate_decompress(body: bytes) -> bytes:
+    # "deflate" is zlib-wrapped per the RFC, but some servers send raw deflate data.
+    try:
+        return zlib.decompress(body)
+    except zlib.error:
+        return zlib.decompress(body, -zlib.MAX_WBITS)
+
+
+def _decoders() -> dict[str, Callable[[bytes], bytes]]:
+    decoders = {}
+    if zstandard is not None:
+        decoders["zstd"] = _zstd_decompress
+    if brotli is not None:
+        decoders["br"] = brotli.decompress
+    decoders["gzip"] = gzip.decompress
+    decoders["deflate"] = _deflate_decompress
+    return decoders
+
+
+# Content codings that can be decoded, best compression first.
+DECODERS = _decoders()
+
+
+def accept_encoding(supported: Iterable[str] | None = None) -> str:
+    """
+    Build the ``Accept-Encoding`` header listing the available codings, best first.
+
+    Args:
+        supported (Iterable[str] | None): Restrict the header to these codings, eg. the
+            ones the HTTP library decodes by itself
+    Returns:
+        str: Value of the ``Accept-Encoding`` header
+    """
+    encodings = list(DECODERS)
+    if supported is not None:
+        supported = {encoding.strip() for encoding in supported}
+        encodings = [encoding for encoding in encodings if encoding in supported]
+    return ", ".join(encodings) or "identity"
+
+
+def decompress(body: bytes, content_encoding: str | None) -> bytes:
+    """
+    Undo the ``Content-Encoding`` of a response body.
+
+    Args:
+        body (bytes): Body as received over the wire
+        content_encoding (str | None): ``Content-Encoding`` header, codings are undone in reverse order
+    Returns:
+        bytes: The decoded body
+    Raises:
+        ValueError: If a coding is not supported
+    """
+    if not content_encoding:
+        return body
+    encodings = [encoding.strip() for encoding in content_encoding.lower().split(",")]
+    for encoding in reversed(encodings):
+        if encoding in ("", "identity"):
+            continue
+        if encoding not in DECODERS:
+            raise ValueError(f"Unsupported content encoding {encoding!r}")
+        body = DECODERS[encoding](body)
+    return body
+
+
+class TransferStats:
+    """
+    Thread-safe counters of the bytes received per API path.
+
+    ``wire_bytes`` counts the bytes received over the network, ``decoded_bytes`` the
+    size of the bodies once decompressed.
+    """
+
+    def __init__(self):
+        self._stats: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, path: str, wire_bytes: int, decoded_bytes: int) -> None:
+        """
+        Add one response to the counters of ``path``.
+
+        Args:
+            path (str): API path of the request (eg. ``portfolio/returns``)
+            wire_bytes (int): Size of the body as received
+            decoded_bytes (int): Size of the body once decompressed
+        """
+        with self._lock:
+            stats = self._stats.setdefault(
+                path, {"calls": 0, "wire_bytes": 0, "decoded_bytes": 0}
+            )
+            stats["calls"] += 1
+            stats["wire_bytes"] += wire_bytes
+            stats["decoded_bytes"] += decoded_bytes
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """
+        Get the counters of every path.
+
+        Returns:
+            dict[str, dict[str, float]]: ``calls``, ``wire_bytes``, ``decoded_bytes`` and
+            ``ratio`` (wire over decoded bytes) per path
+        """
+        with self._lock:
+            return {
+                path: {
+                    **stats,
+                    "ratio": stats["wire_bytes"] / stats["decoded_bytes"]
+                    if stats["decoded_bytes"]
+                    else 1.0,
+                }
+                for path, stats in self._stats.items()
+            }
+
+    def clear(self) -> None:
+        """Reset every counter."""
+        with self._lock:
+            self._stats.clear()
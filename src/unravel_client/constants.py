@@ -3,6 +3,9 @@ import os
 WEBSITE = os.getenv("UNRAVEL_BASE_URL", "https://unravel.finance")
 BASEAPI = f"{WEBSITE}/api/v1"
 
+# Number of tickers sent per request by endpoints accepting a list of tickers.
+TICKER_CHUNK_SIZE = 100
+
 
 def get_headers(api_key: str) -> dict:
     """Build request headers, optionally including Cloudflare Access service token."""
@@ -0,0 +1,160 @@
+"""
+Decoding of API payloads, using the fastest JSON library available.
+
+Tabular endpoints may also be served as Arrow IPC streams or Parquet files. Such
+tables hold the dates in an ``index`` column and one column per ticker, or a single
+``data`` column for series. They are decoded to the same ``index``/``columns``/``data``
+payload as their JSON counterpart, so the same parsers apply.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+
+def _backends() -> dict[str, Callable[[bytes], Any]]:
+    backends = {}
+    if orjson is not None:
+        backends["orjson"] = orjson.loads
+    if msgspec is not None:
+        backends["msgspec"] = msgspec.json.Decoder().decode
+    backends["json"] = json.loads
+    return backends
+
+
+BACKENDS = _backends()
+
+JSON = "application/json"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PARQUET = "application/vnd.apache.parquet"
+WIRE_FORMATS = {"json": JSON, "arrow": ARROW_STREAM, "parquet": PARQUET}
+
+
+def get_loads(backend: str | None = None) -> Callable[[bytes], Any]:
+    """
+    Get the function used to parse JSON bodies.
+
+    Args:
+        backend (str | None): One of ``orjson``, ``msgspec`` or ``json``, None picks the
+            first one installed in that order
+    Returns:
+        Callable: Function parsing a JSON document from bytes
+    Raises:
+        ValueError: If ``backend`` is unknown or not installed
+    """
+    if backend is None:
+        return next(iter(BACKENDS.values()))
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"JSON backend {backend!r} is not available, installed backends are {list(BACKENDS)}"
+        )
+    return BACKENDS[backend]
+
+
+def accept_header(wire_format: str) -> str:
+    """
+    Build the ``Accept`` header requesting ``wire_format``, with JSON as fallback.
+
+    Args:
+        wire_format (str): One of ``json``, ``arrow`` or ``parquet``
+    Returns:
+        str: Value of the ``Accept`` header
+    Raises:
+        ValueError: If ``wire_format`` is unknown
+        ImportError: If a binary format is requested without pyarrow installed
+    """
+    if wire_format not in WIRE_FORMATS:
+        raise ValueError(
+            f"Unknown wire format {wire_format!r}, expected one of {list(WIRE_FORMATS)}"
+        )
+    if wire_format == "json":
+        return JSON
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ImportError(
+            f"The {wire_format} wire format requires pyarrow, install it with `pip install unravel-client[arrow]`"
+        )
+    return f"{WIRE_FORMATS[wire_format]}, {JSON};q=0.9"
+
+
+def _read_table(body: bytes, media_type: str):
+    import pyarrow as pa
+
+    if media_type == ARROW_STREAM:
+        return pa.ipc.open_stream(body).read_all()
+    import pyarrow.parquet as pq
+
+    return pq.read_table(pa.BufferReader(body))
+
+
+def _table_payload(table) -> dict:
+    import numpy as np
+
+    columns = [name for name in table.column_names if name != "index"]
+    payload = {"index": table.column("index").to_numpy()}
+    if columns == ["data"]:
+        payload["data"] = np.asarray(table.column("data").to_numpy(), dtype=np.float64)
+        return payload
+
+    # Column-major, so that the DataFrame wrapping the transposed block needs no copy.
+    data = np.empty((table.num_rows, len(columns)), dtype=np.float64, order="F")
+    for i, name in enumerate(columns):
+        data[:, i] = table.column(name).to_numpy()
+    payload["columns"] = columns
+    payload["data"] = data
+    return payload
+
+
+def _to_array(data: list) -> np.ndarray | list:
+    # Rows of numbers (None standing for missing values) become a float64 array that
+    # pandas can wrap directly; anything else, like strings, is left untouched.
+    import numpy as np
+
+    try:
+        return np.asarray(data, dtype=np.float64)
+    except (TypeError, ValueError):
+        return data
+
+
+def decode(
+    body: bytes,
+    loads: Callable[[bytes], Any] | None = None,
+    content_type: str | None = None,
+) -> Any:
+    """
+    Decode an API response body, converting numeric ``data`` lists to NumPy arrays.
+
+    Args:
+        body (bytes): Raw response body
+        loads (Callable | None): JSON parser, defaults to ``get_loads()``
+        content_type (str | None): ``Content-Type`` of the response, JSON is assumed if missing
+    Returns:
+        Any: The decoded payload
+    """
+    media_type = (content_type or JSON).split(";")[0].strip().lower()
+    if media_type in (ARROW_STREAM, PARQUET):
+        return _table_payload(_read_table(body, media_type))
+
+    payload = (loads or get_loads())(body)
+    if (
+        isinstance(payload, dict)
+        and isinstance(payload.get("data"), list)
+        and payload["data"]
+    ):
+        payload["data"] = _to_array(payload["data"])
+    return payload
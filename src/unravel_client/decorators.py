@@ -2,11 +2,37 @@
 Decorators for the Unravel client library.
 """
 
+import asyncio
+import functools
+import inspect
+import random
+import socket
+import sys
 import time
 from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+from typing import Optional
 
 import requests
 
+from .timeouts import CallScope, DeadlineExceeded, call_scope
+
+# Transport failures worth another attempt, HTTP errors are classified by status.
+RETRYABLE_REQUEST_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+# Socket failures only, other OS errors (eg. a full disk while caching) are local.
+RETRYABLE_EXCEPTIONS = (
+    *RETRYABLE_REQUEST_EXCEPTIONS,
+    ConnectionError,
+    socket.timeout,
+    asyncio.TimeoutError,
+)
+RETRYABLE_STATUS = frozenset({408, 425, 429})
+RETRY_AFTER_STATUS = frozenset({429, 503})
+
 
 def transform_exception(exception: Exception) -> Exception:
     if not isinstance(exception, requests.HTTPError):
@@ -32,35 +58,171 @@ def transform_exception(exception: Exception) -> Exception:
         return exception
 
 
+def is_retryable(exception: Exception) -> bool:
+    """
+    Whether a failed call may succeed if attempted again.
+
+    Server errors, timeouts, rate limiting and transport failures are retryable. Other
+    client errors (invalid API key, unknown portfolio, ...) and local errors are fatal.
+    """
+    if isinstance(exception, DeadlineExceeded):
+        return False
+    if isinstance(exception, requests.HTTPError):
+        response = getattr(exception, "response", None)
+        if response is None:
+            return True
+        return response.status_code in RETRYABLE_STATUS or response.status_code >= 500
+    if isinstance(exception, requests.RequestException):
+        # Requests errors derive from OSError, malformed URLs or headers are not transient.
+        return isinstance(exception, RETRYABLE_REQUEST_EXCEPTIONS)
+    # aiohttp is only imported by the async client, none of its errors exist without it.
+    aiohttp = sys.modules.get("aiohttp")
+    if aiohttp is not None and isinstance(exception, aiohttp.ClientError):
+        return True
+    return isinstance(exception, RETRYABLE_EXCEPTIONS)
+
+
+def retry_after(exception: Exception) -> Optional[float]:
+    """
+    Seconds the server asked to wait through ``Retry-After`` on a 429 or 503 response.
+
+    Returns:
+        float | None: The delay, None if the response carries no usable ``Retry-After``
+    """
+    response = getattr(exception, "response", None)
+    if response is None or response.status_code not in RETRY_AFTER_STATUS:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def backoff_delay(
+    attempt: int, wait: float, backoff: float, max_wait: float, jitter: bool
+) -> float:
+    """
+    Delay before retrying after the given failed attempt (1 for the first one).
+
+    The delay grows as ``wait * backoff ** (attempt - 1)``, capped at ``max_wait``. With
+    ``jitter`` a uniformly random delay up to that value is drawn, so that clients which
+    failed together do not retry together.
+    """
+    delay = min(max_wait, wait * backoff ** (attempt - 1))
+    return random.uniform(0, delay) if jitter else delay
+
+
 def retry_on_error(
     num_trials: int = 3,
     wait: float = 2.0,
     transform_exception: Callable = transform_exception,
+    backoff: float = 2.0,
+    max_wait: float = 30.0,
+    jitter: bool = True,
+    deadline: Optional[float] = 60.0,
+    is_retryable: Callable[[Exception], bool] = is_retryable,
 ):
     """
     Decorator to retry a function on exception.
 
+    Only errors classified as retryable by ``is_retryable`` are retried, with
+    exponential backoff and jitter between attempts. A ``Retry-After`` header sent
+    with a 429 or 503 response takes precedence over the backoff delay. No retry is
+    attempted if its delay would end after the ``deadline``.
+
+    When the decorated function takes ``timeout`` and ``deadline`` arguments, the
+    call runs in a ``call_scope`` applying them to every request it sends, and no
+    retry is attempted past that deadline either.
+
+    Coroutine functions are supported as well, in which case the waits between
+    attempts do not block the event loop.
+
     Args:
         num_trials (int): Number of attempts before giving up.
-        wait (float): Seconds to wait between attempts.
+        wait (float): Seconds to wait after the first failed attempt.
+        transform_exception (Callable): Applied to the exception that is finally raised.
+        backoff (float): Factor applied to the wait after every failed attempt.
+        max_wait (float): Upper bound of the backoff delay in seconds.
+        jitter (bool): Whether to randomize delays between 0 and the backoff delay.
+        deadline (float | None): Seconds after the first attempt past which no retry is started, None for no limit.
+        is_retryable (Callable): Tells whether an exception is worth another attempt.
 
     Returns:
         Decorated function that retries on error.
     """
 
+    def next_delay(
+        attempt: int, exception: Exception, started: float, scope: CallScope
+    ):
+        if attempt >= num_trials or not is_retryable(exception):
+            return None
+        delay = retry_after(exception)
+        if delay is None:
+            delay = backoff_delay(attempt, wait, backoff, max_wait, jitter)
+        if deadline is not None and time.monotonic() - started + delay > deadline:
+            return None
+        remaining = scope.remaining()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
     def decorator(func):
+        # Positions of the per-call options, to find them in positional arguments too.
+        parameters = list(inspect.signature(func).parameters)
+        positions = {
+            name: parameters.index(name)
+            for name in ("timeout", "deadline")
+            if name in parameters
+        }
+
+        def call_options(args: tuple, kwargs: dict) -> dict:
+            options = {}
+            for name, position in positions.items():
+                if name in kwargs:
+                    options[name] = kwargs[name]
+                elif position < len(args):
+                    options[name] = args[position]
+            return options
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.monotonic()
+                with call_scope(**call_options(args, kwargs)) as scope:
+                    for attempt in range(1, num_trials + 1):
+                        scope.attempt = attempt
+                        try:
+                            return await func(*args, **kwargs)
+                        except Exception as e:  # noqa: BLE001
+                            delay = next_delay(attempt, e, started, scope)
+                            if delay is None:
+                                raise transform_exception(e)
+                            await asyncio.sleep(delay)
+                return None
+
+            return async_wrapper
+
         def wrapper(*args, **kwargs):
-            last_exception = None
-            for attempt in range(1, num_trials + 1):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:  # noqa: BLE001
-                    last_exception = e
-                    if attempt == num_trials:
-                        break
-                    time.sleep(wait)
-            if last_exception is not None:
-                raise transform_exception(last_exception)
+            started = time.monotonic()
+            with call_scope(**call_options(args, kwargs)) as scope:
+                for attempt in range(1, num_trials + 1):
+                    scope.attempt = attempt
+                    try:
+                        return func(*args, **kwargs)
+                    except Exception as e:  # noqa: BLE001
+                        delay = next_delay(attempt, e, started, scope)
+                        if delay is None:
+                            raise transform_exception(e)
+                        time.sleep(delay)
             return None
 
         wrapper.__name__ = func.__name__
@@ -0,0 +1,129 @@
+"""
+Construction of pandas objects from decoded API payloads.
+
+Payload values are converted to a single NumPy block once and wrapped by pandas
+without further copies.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import phase
+
+# Resolution pandas itself picks when parsing date strings.
+_DATETIME_DTYPE = pd.to_datetime(["2024-01-01"]).dtype
+
+
+def to_index(dates: Sequence[str]) -> pd.DatetimeIndex:
+    """
+    Parse API dates into a DatetimeIndex.
+
+    Plain ``YYYY-MM-DD`` dates are parsed in bulk by NumPy, any other ISO 8601
+    format goes through ``pd.to_datetime``. Dates already decoded to ``datetime64``
+    are wrapped as they are.
+
+    Args:
+        dates (Sequence[str]): Dates as returned by the API
+    Returns:
+        pd.DatetimeIndex: Parsed dates
+    """
+    values = np.asarray(dates)
+    if values.dtype.kind == "M":
+        return pd.DatetimeIndex(values.astype(_DATETIME_DTYPE, copy=False))
+    if values.dtype.kind == "U" and (np.char.str_len(values) == 10).all():
+        try:
+            return pd.DatetimeIndex(
+                values.astype("datetime64[D]").astype(_DATETIME_DTYPE)
+            )
+        except ValueError:
+            pass
+    return pd.to_datetime(list(dates), format="ISO8601")
+
+
+def to_array(data, dtype: np.dtype | type = np.float64) -> np.ndarray:
+    """
+    Convert payload values to an array of ``dtype``, without copying if they already are one.
+
+    Args:
+        data (Any): Decoded ``data`` field, a NumPy array or nested lists
+        dtype (np.dtype | type): Requested dtype
+    Returns:
+        np.ndarray: The values
+    """
+    return np.asarray(data, dtype=dtype)
+
+
+def to_mask(data) -> np.ndarray:
+    """
+    Convert payload values to a boolean array, True where a value is present.
+
+    Numeric values are checked as a float64 block, anything else (eg. tickers) is
+    checked element-wise with ``pd.notna``.
+
+    Args:
+        data (Any): Decoded ``data`` field, a NumPy array or nested lists
+    Returns:
+        np.ndarray: The mask
+    """
+    try:
+        values = to_array(data)
+    except (TypeError, ValueError):
+        return pd.notna(np.asarray(data, dtype=object))
+    return ~np.isnan(values)
+
+
+def to_frame(
+    data,
+    index: Sequence[str],
+    columns: Sequence[str],
+    dtype: np.dtype | type = np.float64,
+) -> pd.DataFrame:
+    """
+    Build a date-indexed DataFrame backed by a single block of ``dtype``.
+
+    Args:
+        data (Any): Decoded ``data`` field, one row per date
+        index (Sequence[str]): Dates of the rows
+        columns (Sequence[str]): Column labels
+        dtype (np.dtype | type): Dtype of the values
+    Returns:
+        pd.DataFrame: The frame
+    """
+    with phase("convert"):
+        values = to_array(data, dtype)
+        if values.size == 0:
+            values = values.reshape(len(index), len(columns))
+    with phase("index"):
+        index = to_index(index)
+    with phase("frame"):
+        return pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+
+def to_series(
+    data,
+    index: Sequence[str] | pd.Index,
+    name: str | None = None,
+    dtype: np.dtype | type = np.float64,
+) -> pd.Series:
+    """
+    Build a Series backed by an array of ``dtype``.
+
+    Args:
+        data (Any): Decoded ``data`` field
+        index (Sequence[str] | pd.Index): Dates of the values, or any prebuilt index
+        name (str | None): Name of the series
+        dtype (np.dtype | type): Dtype of the values
+    Returns:
+        pd.Series: The series
+    """
+    if not isinstance(index, pd.Index):
+        with phase("index"):
+            index = to_index(index)
+    with phase("convert"):
+        values = to_array(data, dtype)
+    with phase("frame"):
+        return pd.Series(values, index=index, name=name, copy=False)
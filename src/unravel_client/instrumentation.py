@@ -0,0 +1,217 @@
+"""
+Instrumentation hooks reporting what every API call spends its time on.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+import warnings
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Union
+
+from .timeouts import current_scope
+
+
+@dataclass
+class CallEvent:
+    """
+    One HTTP exchange with the API, from sending the request to the parsed result.
+
+    ``timings`` holds the seconds spent per phase. Phases nest, ``parse`` includes
+    ``index``, ``convert`` and ``frame``:
+
+    - ``wait``: waiting for the rate limiter
+    - ``request``: sending the request and receiving the response body
+    - ``decode``: decoding the body (JSON, Arrow or Parquet)
+    - ``parse``: turning the decoded payload into pandas objects
+    - ``index``: parsing dates into a ``DatetimeIndex``
+    - ``convert``: converting values to NumPy arrays
+    - ``frame``: wrapping the arrays into a DataFrame or Series
+
+    Attributes:
+        endpoint (str): API path of the request (eg. ``portfolio/returns``)
+        params (dict): Query parameters of the request
+        attempt (int): Attempt number of the endpoint call, 1 unless the call is being retried
+        status (int | None): HTTP status of the response, None if none was received
+        wire_bytes (int): Bytes received over the network
+        decoded_bytes (int): Size of the response body once decompressed
+        not_modified (bool): Whether the result was reused after a ``304 Not Modified`` response
+        error (BaseException | None): Exception raised by the call, if any
+        started (float): Wall-clock time the call started at, as ``time.time()``
+        duration (float): Seconds from start to end of the call
+        timings (dict[str, float]): Seconds spent per phase
+    """
+
+    endpoint: str
+    params: dict
+    attempt: int = 1
+    status: int | None = None
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    not_modified: bool = False
+    error: BaseException | None = None
+    started: float = 0.0
+    duration: float = 0.0
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+class CallListener:
+    """
+    Base class of instrumentation listeners, subclasses override the hooks they need.
+
+    Hooks are called synchronously on the thread (or event loop) of the call, so
+    they should be quick, eg. pushing the event to a queue or updating counters.
+    """
+
+    def on_start(self, event: CallEvent) -> None:
+        """Called before the request is sent, only ``endpoint``, ``params``, ``attempt`` and ``started`` are set."""
+
+    def on_end(self, event: CallEvent) -> None:
+        """Called once the call completed or failed, with every field set."""
+
+    def on_cache_hit(self, endpoint: str, cache: str) -> None:
+        """
+        Called when a result is served from ``live_cache`` or ``history_cache`` without any request.
+
+        Results reused after a ``304 Not Modified`` are reported through
+        ``CallEvent.not_modified`` instead.
+
+        Args:
+            endpoint (str): API path of the call
+            cache (str): ``live`` or ``history``
+        """
+
+
+class _CallbackListener(CallListener):
+    def __init__(self, callback: Callable[[CallEvent], Any]):
+        self.callback = callback
+
+    def on_end(self, event: CallEvent) -> None:
+        self.callback(event)
+
+
+Listener = Union[CallListener, Callable[[CallEvent], Any]]
+
+_event: contextvars.ContextVar[CallEvent | None] = contextvars.ContextVar(
+    "unravel_call_event", default=None
+)
+
+
+def current_event() -> CallEvent | None:
+    """The event of the API call currently running, None when nothing listens."""
+    return _event.get()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to the ``name`` phase of the current event."""
+    event = _event.get()
+    if event is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        event.timings[name] = event.timings.get(name, 0.0) + elapsed
+
+
+class Instrumentation:
+    """
+    Thread-safe set of listeners notified of every API call of a client.
+
+    Listeners are either ``CallListener`` instances or plain callables, which are
+    called with the event once the call ended. When no listener is registered no
+    event is created, so instrumentation costs nothing.
+
+    Args:
+        listeners (Iterable[CallListener | Callable] | None): Initial listeners
+    """
+
+    def __init__(self, listeners: Iterable[Listener] | None = None):
+        self._listeners: tuple[CallListener, ...] = ()
+        self._lock = threading.Lock()
+        for listener in listeners or ():
+            self.add_listener(listener)
+
+    def add_listener(self, listener: Listener) -> CallListener:
+        """
+        Register a listener.
+
+        Returns:
+            CallListener: The registered listener, to pass to ``remove_listener``
+        """
+        if not isinstance(listener, CallListener):
+            listener = _CallbackListener(listener)
+        with self._lock:
+            self._listeners = (*self._listeners, listener)
+        return listener
+
+    def remove_listener(self, listener: CallListener) -> None:
+        """Unregister a listener returned by ``add_listener``."""
+        with self._lock:
+            self._listeners = tuple(
+                registered
+                for registered in self._listeners
+                if registered is not listener
+            )
+
+    @property
+    def listeners(self) -> tuple[CallListener, ...]:
+        return self._listeners
+
+    def _notify(self, hook: str, *args) -> None:
+        for listener in self._listeners:
+            try:
+                getattr(listener, hook)(*args)
+            except Exception as e:  # noqa: BLE001
+                # A faulty listener must not break API calls.
+                warnings.warn(
+                    f"Instrumentation listener {listener!r} failed: {e!r}",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+
+    def cache_hit(self, endpoint: str, cache: str) -> None:
+        """Report a result served from a client cache, see ``CallListener.on_cache_hit``."""
+        if self._listeners:
+            self._notify("on_cache_hit", endpoint, cache)
+
+    @contextmanager
+    def call(self, endpoint: str, params: dict) -> Iterator[CallEvent | None]:
+        """
+        Report the API call made within the block to every listener.
+
+        Args:
+            endpoint (str): API path of the request
+            params (dict): Query parameters of the request
+        Yields:
+            CallEvent | None: The event being recorded, None if nothing listens
+        """
+        if not self._listeners:
+            yield None
+            return
+        scope = current_scope()
+        event = CallEvent(
+            endpoint,
+            params,
+            attempt=scope.attempt if scope is not None else 1,
+            started=time.time(),
+        )
+        token = _event.set(event)
+        started = time.perf_counter()
+        self._notify("on_start", event)
+        try:
+            yield event
+        except BaseException as e:
+            event.error = e
+            raise
+        finally:
+            event.duration = time.perf_counter() - started
+            _event.reset(token)
+            self._notify("on_end", event)
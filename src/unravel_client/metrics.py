@@ -0,0 +1,186 @@
+"""
+In-process metrics of API calls, exportable in the Prometheus text format.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from collections.abc import Sequence
+
+from .instrumentation import CallEvent, CallListener
+
+# Upper bounds in seconds of the latency histogram buckets.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_HELP = {
+    "requests": ("counter", "API requests sent, by endpoint and HTTP status"),
+    "retries": ("counter", "API requests that were retries of a failed attempt"),
+    "errors": ("counter", "API requests that raised an exception, by exception type"),
+    "cache_hits": ("counter", "Results served from a client cache, by cache"),
+    "received_bytes": ("counter", "Bytes received over the network"),
+    "phase_seconds": ("counter", "Seconds spent per phase of API requests"),
+    "in_flight": ("gauge", "API requests currently in flight"),
+    "request_duration_seconds": ("histogram", "Duration of API requests"),
+}
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry(CallListener):
+    """
+    Instrumentation listener aggregating API calls into counters, gauges and histograms.
+
+    Tracked per endpoint: requests by status, retries, errors by exception type,
+    cache hits by cache, bytes received, seconds spent per phase, requests in flight
+    and a histogram of request durations.
+
+    Args:
+        buckets (Sequence[float]): Upper bounds in seconds of the duration histogram buckets
+        prefix (str): Prefix of the exported metric names
+    """
+
+    def __init__(
+        self, buckets: Sequence[float] = DEFAULT_BUCKETS, prefix: str = "unravel_client"
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._in_flight: dict[str, int] = {}
+        self._histograms: dict[str, list] = {}
+
+    def _inc(self, name: str, labels: tuple, value: float = 1) -> None:
+        counter = self._counters.setdefault(name, {})
+        counter[labels] = counter.get(labels, 0) + value
+
+    def on_start(self, event: CallEvent) -> None:
+        with self._lock:
+            self._in_flight[event.endpoint] = self._in_flight.get(event.endpoint, 0) + 1
+
+    def on_end(self, event: CallEvent) -> None:
+        endpoint = event.endpoint
+        with self._lock:
+            self._in_flight[endpoint] = self._in_flight.get(endpoint, 1) - 1
+            status = str(event.status) if event.status is not None else "none"
+            self._inc("requests", (("endpoint", endpoint), ("status", status)))
+            if event.attempt > 1:
+                self._inc("retries", (("endpoint", endpoint),))
+            if event.error is not None:
+                error = type(event.error).__name__
+                self._inc("errors", (("endpoint", endpoint), ("error", error)))
+            if event.not_modified:
+                self._inc(
+                    "cache_hits", (("endpoint", endpoint), ("cache", "conditional"))
+                )
+            self._inc("received_bytes", (("endpoint", endpoint),), event.wire_bytes)
+            for name, seconds in event.timings.items():
+                self._inc(
+                    "phase_seconds", (("endpoint", endpoint), ("phase", name)), seconds
+                )
+            # Per-bucket (non-cumulative) counts, the sum and the count.
+            histogram = self._histograms.setdefault(
+                endpoint, [[0] * (len(self.buckets) + 1), 0.0, 0]
+            )
+            histogram[0][bisect.bisect_left(self.buckets, event.duration)] += 1
+            histogram[1] += event.duration
+            histogram[2] += 1
+
+    def on_cache_hit(self, endpoint: str, cache: str) -> None:
+        with self._lock:
+            self._inc("cache_hits", (("endpoint", endpoint), ("cache", cache)))
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Get the current value of every metric.
+
+        Returns:
+            dict[str, dict]: Metric name to a dict of values keyed by label tuples
+            (eg. ``{("portfolio/returns", "200"): 3}`` for ``requests``). Histograms
+            map the endpoint to its cumulative ``buckets``, ``sum`` and ``count``
+        """
+        with self._lock:
+            metrics = {
+                name: {
+                    tuple(value for _, value in labels): total
+                    for labels, total in counter.items()
+                }
+                for name, counter in self._counters.items()
+            }
+            metrics["in_flight"] = dict(self._in_flight)
+            metrics["request_duration_seconds"] = {
+                endpoint: {
+                    "buckets": dict(
+                        zip((*self.buckets, float("inf")), self._cumulative(counts))
+                    ),
+                    "sum": total,
+                    "count": count,
+                }
+                for endpoint, (counts, total, count) in self._histograms.items()
+            }
+        return metrics
+
+    @staticmethod
+    def _cumulative(counts: list[int]) -> list[int]:
+        cumulative, total = [], 0
+        for count in counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+    def to_prometheus(self) -> str:
+        """
+        Export every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition, eg. to serve from a ``/metrics`` endpoint
+        """
+        lines = []
+        with self._lock:
+            for key, (kind, help_text) in _HELP.items():
+                name = f"{self.prefix}_{key}"
+                if kind == "counter":
+                    name += "_total"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == "counter":
+                    for labels, value in self._counters.get(key, {}).items():
+                        lines.append(f"{name}{_labels(dict(labels))} {_number(value)}")
+                elif kind == "gauge":
+                    for endpoint, value in self._in_flight.items():
+                        lines.append(f"{name}{_labels({'endpoint': endpoint})} {value}")
+                else:
+                    for endpoint, (counts, total, count) in self._histograms.items():
+                        bounds = (*self.buckets, float("inf"))
+                        for bound, cumulative in zip(bounds, self._cumulative(counts)):
+                            labels = _labels(
+                                {"endpoint": endpoint, "le": _number(bound)}
+                            )
+                            lines.append(f"{name}_bucket{labels} {cumulative}")
+                        labels = _labels({"endpoint": endpoint})
+                        lines.append(f"{name}_sum{labels} {_number(total)}")
+                        lines.append(f"{name}_count{labels} {count}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Reset every metric, requests in flight are still tracked."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
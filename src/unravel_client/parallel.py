@@ -0,0 +1,91 @@
+"""
+Helpers to split large requests into smaller ones and reassemble their results.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+# pandas is only imported by the helpers that need it, to keep the package quick to import.
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def chunked(items: Sequence, size: int | None) -> list[list]:
+    """
+    Split a sequence into consecutive chunks of at most ``size`` distinct items.
+
+    Args:
+        items (Sequence): Items to split, repeated items are only kept once
+        size (int | None): Maximum chunk size, None or 0 keeps all items in a single chunk
+    Returns:
+        list[list]: The chunks, in order
+    """
+    items = list(dict.fromkeys(items))
+    if not size or len(items) <= size:
+        return [items]
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def concat_columns(frames: list[pd.DataFrame], order: Sequence[str]) -> pd.DataFrame:
+    """
+    Join frames holding different columns of the same table on their index.
+
+    Args:
+        frames (list[pd.DataFrame]): Frames to join, one per chunk of columns
+        order (Sequence[str]): Requested column order, columns missing from every frame are skipped
+    Returns:
+        pd.DataFrame: Single frame with the union of the indices, the requested columns in ``order`` and then any column that was not requested
+    """
+    import pandas as pd
+
+    combined = pd.concat(frames, axis=1, sort=True)
+    requested = dict.fromkeys(order)
+    columns = [column for column in requested if column in combined.columns]
+    # Columns returned under another spelling than requested are kept, not dropped.
+    columns += [column for column in combined.columns if column not in requested]
+    return combined[columns]
+
+
+def split_date_range(
+    start_date: str, end_date: str | None, shards: int
+) -> list[tuple[str, str]]:
+    """
+    Split an inclusive date range into contiguous, non-overlapping windows.
+
+    Args:
+        start_date (str): First date of the range (ISO format: YYYY-MM-DD)
+        end_date (str | None): Last date of the range (ISO format: YYYY-MM-DD), defaults to today (UTC)
+        shards (int): Number of windows, fewer are returned if the range has fewer days
+    Returns:
+        list[tuple[str, str]]: Inclusive (start_date, end_date) pairs, in chronological order
+    """
+    import numpy as np
+    import pandas as pd
+
+    if end_date is None:
+        end_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    days = pd.date_range(start_date, end_date, freq="D")
+    if len(days) == 0:
+        return [(start_date, end_date)]
+    return [
+        (window[0].strftime("%Y-%m-%d"), window[-1].strftime("%Y-%m-%d"))
+        for window in np.array_split(days, min(shards, len(days)))
+    ]
+
+
+def concat_rows(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Stack frames covering consecutive date ranges of the same table.
+
+    Args:
+        frames (list[pd.DataFrame]): Frames to stack, one per date window
+    Returns:
+        pd.DataFrame: Single frame sorted by date, duplicated dates keep the last frame's row
+    """
+    import pandas as pd
+
+    combined = pd.concat(frames)
+    return combined[~combined.index.duplicated(keep="last")].sort_index()
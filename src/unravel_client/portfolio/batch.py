@@ -0,0 +1,188 @@
+"""
+Fetch the same endpoint for many portfolios concurrently.
+"""
+
+from __future__ import annotations
+
+import itertools
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from ..client import get_client
+from ..timeouts import call_scope
+from .historical_weights import get_portfolio_historical_weights
+from .returns import get_portfolio_returns
+
+BatchKey = Hashable
+
+
+@dataclass
+class BatchResult:
+    """
+    Results of a batch fetch, keyed by portfolio id.
+
+    When ``smoothing`` or ``exchange`` is given as a list, every combination is
+    fetched and keys are ``(id, smoothing, exchange)`` tuples instead.
+
+    Attributes:
+        data (dict): Fetched data for every key that succeeded, in request order
+        errors (dict[Hashable, Exception]): Exception raised for every key that failed
+    """
+
+    data: dict[BatchKey, pd.Series | pd.DataFrame] = field(default_factory=dict)
+    errors: dict[BatchKey, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """True if every item of the batch succeeded."""
+        return not self.errors
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Combine the fetched data into a single frame aligned on dates.
+
+        Returns:
+            pd.DataFrame: One column per key for series, or ``(key, ticker)``
+            MultiIndex columns for frames. Failed keys are left out
+        """
+        if not self.data:
+            return pd.DataFrame()
+        combined = pd.concat(self.data, axis=1, sort=True)
+        key = next(iter(self.data))
+        names = ["id", "smoothing", "exchange"] if isinstance(key, tuple) else ["id"]
+        if isinstance(
+            combined.columns, pd.MultiIndex
+        ) and combined.columns.nlevels > len(names):
+            names = [*names, "ticker"]
+        combined.columns = combined.columns.set_names(names)
+        return combined
+
+
+def _as_list(value: str | list[str] | None) -> list[str | None]:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _batch_items(
+    ids: list[str],
+    smoothing: str | list[str] | None = None,
+    exchange: str | list[str] | None = None,
+) -> list[tuple[BatchKey, str, str | None, str | None]]:
+    """Expand ids and options into ``(key, id, smoothing, exchange)`` items."""
+    combos = not (
+        isinstance(smoothing, (str, type(None)))
+        and isinstance(exchange, (str, type(None)))
+    )
+    return [
+        ((portfolio, s, e) if combos else portfolio, portfolio, s, e)
+        for portfolio, s, e in itertools.product(
+            ids, _as_list(smoothing), _as_list(exchange)
+        )
+    ]
+
+
+def _run_batch(
+    fetch: Callable[..., pd.Series | pd.DataFrame],
+    ids: list[str],
+    api_key: str,
+    smoothing: str | list[str] | None,
+    exchange: str | list[str] | None,
+    start_date: str | None,
+    end_date: str | None,
+) -> BatchResult:
+    def fetch_item(item):
+        _, portfolio, s, e = item
+        try:
+            return fetch(portfolio, api_key, s, e, start_date, end_date), None
+        except Exception as error:  # noqa: BLE001
+            return None, error
+
+    items = _batch_items(ids, smoothing, exchange)
+    result = BatchResult()
+    for (key, *_), (data, error) in zip(items, get_client().map(fetch_item, items)):
+        if error is None:
+            result.data[key] = data
+        else:
+            result.errors[key] = error
+    return result
+
+
+def get_portfolio_returns_batch(
+    ids: list[str],
+    api_key: str,
+    smoothing: str | list[str] | None = None,
+    exchange: str | list[str] | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
+) -> BatchResult:
+    """
+    Fetch returns for several portfolios concurrently from the Unravel API.
+
+    A failing portfolio does not abort the batch, its exception is reported in
+    ``BatchResult.errors`` instead.
+
+    Args:
+        ids (list[str]): Portfolio Identifiers (eg. momentum.20)
+        api_key (str): The API key to use for the request
+        smoothing (str | list[str] | None): Portfolio smoothing window, or a list of windows to fetch for every portfolio
+        exchange (str | list[str] | None): Exchange constraint, or a list of exchanges to fetch for every portfolio
+        start_date (str | None): Filter data to only include dates on or after this date (ISO format: YYYY-MM-DD)
+        end_date (str | None): Filter data to only include dates on or before this date (ISO format: YYYY-MM-DD)
+        timeout (float | tuple[float, float] | None): Timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline (float | None): Seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
+    Returns:
+        BatchResult: Returns series per portfolio, ``to_frame()`` gives one column per portfolio
+    """
+    with call_scope(timeout, deadline):
+        return _run_batch(
+            get_portfolio_returns,
+            ids,
+            api_key,
+            smoothing,
+            exchange,
+            start_date,
+            end_date,
+        )
+
+
+def get_portfolio_historical_weights_batch(
+    ids: list[str],
+    api_key: str,
+    smoothing: str | list[str] | None = None,
+    exchange: str | list[str] | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
+) -> BatchResult:
+    """
+    Fetch historical weights for several portfolios concurrently from the Unravel API.
+
+    A failing portfolio does not abort the batch, its exception is reported in
+    ``BatchResult.errors`` instead.
+
+    Args:
+        ids (list[str]): Portfolio Identifiers (eg. momentum.20)
+        api_key (str): The API key to use for the request
+        smoothing (str | list[str] | None): Portfolio smoothing window, or a list of windows to fetch for every portfolio
+        exchange (str | list[str] | None): Exchange constraint, or a list of exchanges to fetch for every portfolio
+        start_date (str | None): Filter data to only include dates on or after this date (ISO format: YYYY-MM-DD)
+        end_date (str | None): Filter data to only include dates on or before this date (ISO format: YYYY-MM-DD)
+        timeout (float | tuple[float, float] | None): Timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline (float | None): Seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
+    Returns:
+        BatchResult: Weights per portfolio, ``to_frame()`` gives ``(id, ticker)`` MultiIndex columns
+    """
+    with call_scope(timeout, deadline):
+        return _run_batch(
+            get_portfolio_historical_weights,
+            ids,
+            api_key,
+            smoothing,
+            exchange,
+            start_date,
+            end_date,
+        )
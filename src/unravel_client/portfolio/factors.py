@@ -1,13 +1,56 @@
 from __future__ import annotations
 
 import pandas as pd
-import requests
 
-from ..constants import BASEAPI, get_headers
+from ..client import get_client
+from ..constants import TICKER_CHUNK_SIZE
 from ..decorators import retry_on_error
+from ..frames import to_frame, to_series
+from ..parallel import chunked, concat_columns
+from ..timeouts import call_scope
+
+
+def _portfolio_factors_historical_request(
+    id: str,
+    tickers: list[str],
+    smoothing: str | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> tuple[str, dict]:
+    params = {"id": id, "tickers": ",".join(tickers)}
+
+    if smoothing is not None:
+        params["smoothing"] = smoothing
+    if start_date is not None:
+        params["start_date"] = start_date
+    if end_date is not None:
+        params["end_date"] = end_date
+
+    return "portfolio/factors", params
+
+
+def _parse_portfolio_factors_historical(response: dict) -> pd.DataFrame:
+    return to_frame(response["data"], response["index"], response["columns"])
 
 
 @retry_on_error(num_trials=3, wait=2.0)
+def _get_portfolio_factors_historical_chunk(
+    id: str,
+    tickers: list[str],
+    api_key: str,
+    smoothing: str | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    shards: int | None = None,
+) -> pd.DataFrame:
+    path, params = _portfolio_factors_historical_request(
+        id, tickers, smoothing, start_date, end_date
+    )
+    return get_client().fetch_range(
+        path, api_key, params, _parse_portfolio_factors_historical, shards
+    )
+
+
 def get_portfolio_factors_historical(
     id: str,
     tickers: list[str],
@@ -15,6 +58,10 @@ def get_portfolio_factors_historical(
     smoothing: str | None = None,
     start_date: str | None = None,
     end_date: str | None = None,
+    chunk_size: int | None = TICKER_CHUNK_SIZE,
+    shards: int | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
 ) -> pd.DataFrame:
     """
     Fetch historical factors for a portfolio from the Unravel API.
@@ -26,29 +73,49 @@ def get_portfolio_factors_historical(
         smoothing (str | None): Portfolio smoothing window for the data. Valid values and default smoothing for each portfolio can be found in the [Unravel Catalog](https://unravel.finance/home/api/catalog)
         start_date (str | None): Filter data to only include dates on or after this date (ISO format: YYYY-MM-DD)
         end_date (str | None): Filter data to only include dates on or before this date (ISO format: YYYY-MM-DD)
+        chunk_size (int | None): Maximum number of tickers per request, longer lists are split into chunks fetched concurrently. None sends every ticker in a single request
+        shards (int | None): Split the date range into this many windows fetched concurrently, requires ``start_date``. None sends a single request
+        timeout (float | tuple[float, float] | None): Timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline (float | None): Seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
     Returns:
-        pd.DataFrame: Historical factor data for the input tickers
+        pd.DataFrame: Historical factor data for the input tickers, in the order of ``tickers``
     """
-    url = f"{BASEAPI}/portfolio/factors"
+    chunks = chunked(tickers, chunk_size)
+    with call_scope(timeout, deadline):
+        if len(chunks) == 1:
+            return _get_portfolio_factors_historical_chunk(
+                id, chunks[0], api_key, smoothing, start_date, end_date, shards
+            )
+
+        frames = get_client().map(
+            lambda chunk: _get_portfolio_factors_historical_chunk(
+                id, chunk, api_key, smoothing, start_date, end_date, shards
+            ),
+            chunks,
+        )
+    return concat_columns(frames, tickers)
+
+
+def _portfolio_factors_live_request(
+    id: str,
+    tickers: list[str],
+    smoothing: str | None = None,
+    as_of: str | None = None,
+) -> tuple[str, dict]:
     params = {"id": id, "tickers": ",".join(tickers)}
 
     if smoothing is not None:
         params["smoothing"] = smoothing
-    if start_date is not None:
-        params["start_date"] = start_date
-    if end_date is not None:
-        params["end_date"] = end_date
+    if as_of is not None:
+        params["as_of"] = as_of
 
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
+    return "portfolio/factors-live", params
 
-    response = response.json()
-    return pd.DataFrame(
-        response["data"],
-        index=pd.to_datetime(response["index"]),
-        columns=response["columns"],
-    ).astype(float)
+
+def _parse_portfolio_factors_live(response: dict) -> pd.Series:
+    return to_series(
+        response["data"], pd.Index(response["columns"]), name=response["index"]
+    )
 
 
 @retry_on_error(num_trials=3, wait=2.0)
@@ -58,6 +125,8 @@ def get_portfolio_factors_live(
     api_key: str,
     smoothing: str | None = None,
     as_of: str | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
 ) -> pd.Series:
     """
     Fetch the latest factor data for specific tickers within a single factor portfolio.
@@ -68,22 +137,10 @@ def get_portfolio_factors_live(
         api_key (str): The API key to use for the request
         smoothing (str | None): Portfolio smoothing window for the data. Valid values are 0 (no smoothing), 5, 10, 15, 20, or 30 days.
         as_of (str | None): Point in time for the data. Valid options are 'close' or 'latest'.
+        timeout (float | tuple[float, float] | None): Timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline (float | None): Seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
     Returns:
         pd.Series: Latest factor data for the specified tickers
     """
-    url = f"{BASEAPI}/portfolio/factors-live"
-    params = {"id": id, "tickers": ",".join(tickers)}
-
-    if smoothing is not None:
-        params["smoothing"] = smoothing
-    if as_of is not None:
-        params["as_of"] = as_of
-
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
-
-    response = response.json()
-    return pd.Series(
-        response["data"], index=response["columns"], name=response["index"]
-    ).astype(float)
+    path, params = _portfolio_factors_live_request(id, tickers, smoothing, as_of)
+    return get_client().fetch_live(path, api_key, params, _parse_portfolio_factors_live)
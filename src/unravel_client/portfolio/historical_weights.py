@@ -1,10 +1,35 @@
 from __future__ import annotations
 
 import pandas as pd
-import requests
 
-from ..constants import BASEAPI, get_headers
+from ..client import get_client
 from ..decorators import retry_on_error
+from ..frames import to_frame
+
+
+def _portfolio_historical_weights_request(
+    id: str,
+    smoothing: str | None = None,
+    exchange: str | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> tuple[str, dict]:
+    params = {"portfolio": id}
+
+    if start_date is not None:
+        params["start_date"] = start_date
+    if end_date is not None:
+        params["end_date"] = end_date
+    if smoothing is not None:
+        params["smoothing"] = smoothing
+    if exchange is not None:
+        params["exchange"] = exchange
+
+    return "portfolio/historical-weights", params
+
+
+def _parse_portfolio_historical_weights(response: dict) -> pd.DataFrame:
+    return to_frame(response["data"], response["index"], response["columns"])
 
 
 @retry_on_error(num_trials=3, wait=2.0)
@@ -15,6 +40,9 @@ def get_portfolio_historical_weights(
     exchange: str | None = None,
     start_date: str | None = None,
     end_date: str | None = None,
+    shards: int | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
 ) -> pd.DataFrame:
     """
     Fetch normalized risk signal data from the Unravel API.
@@ -26,28 +54,15 @@ def get_portfolio_historical_weights(
         exchange (str | None): Exchange constraint for portfolio data. Valid options are found in the [Unravel Catalog](https://unravel.finance/home/api/catalog)
         start_date (str | None): Filter data to only include dates on or after this date (ISO format: YYYY-MM-DD)
         end_date (str | None): Filter data to only include dates on or before this date (ISO format: YYYY-MM-DD)
+        shards (int | None): Split the date range into this many windows fetched concurrently, requires ``start_date``. None sends a single request
+        timeout (float | tuple[float, float] | None): Timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline (float | None): Seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
     Returns:
         pd.DataFrame: Historical weights of the portfolio
     """
-    url = f"{BASEAPI}/portfolio/historical-weights"
-    params = {"portfolio": id}
-
-    if start_date is not None:
-        params["start_date"] = start_date
-    if end_date is not None:
-        params["end_date"] = end_date
-    if smoothing is not None:
-        params["smoothing"] = smoothing
-    if exchange is not None:
-        params["exchange"] = exchange
-
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
-
-    response = response.json()
-    return pd.DataFrame(
-        response["data"],
-        index=pd.to_datetime(response["index"]),
-        columns=response["columns"],
-    ).astype(float)
+    path, params = _portfolio_historical_weights_request(
+        id, smoothing, exchange, start_date, end_date
+    )
+    return get_client().fetch_history(
+        path, api_key, params, _parse_portfolio_historical_weights, shards
+    )
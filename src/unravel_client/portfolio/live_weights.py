@@ -1,10 +1,36 @@
 from __future__ import annotations
 
 import pandas as pd
-import requests
 
-from ..constants import BASEAPI, get_headers
+from ..client import get_client
 from ..decorators import retry_on_error
+from ..frames import to_series
+
+
+def _live_weights_request(
+    id: str,
+    smoothing: str | None = None,
+    exchange: str | None = None,
+    as_of: str | None = None,
+) -> tuple[str, dict]:
+    params = {"portfolio": id}
+
+    if smoothing is not None:
+        params["smoothing"] = smoothing
+    if exchange is not None:
+        params["exchange"] = exchange
+    if as_of is not None:
+        params["as_of"] = as_of
+
+    return "portfolio/live-weights", params
+
+
+def _parse_live_weights(response: dict) -> pd.Series:
+    return to_series(
+        response["data"],
+        pd.Index(response["columns"]),
+        name=response.get("index") or None,
+    )
 
 
 @retry_on_error(num_trials=3, wait=2.0)
@@ -14,6 +40,8 @@ def get_live_weights(
     smoothing: str | None = None,
     exchange: str | None = None,
     as_of: str | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
 ) -> pd.Series:
     """
     Fetch last value of normalized risk signal data from the Unravel API.
@@ -24,28 +52,10 @@ def get_live_weights(
         smoothing (str | None): Portfolio smoothing window for the data. Portfolio smoothing window for the data. Valid values and default smoothing for each portfolio can be found in the [Unravel Catalog](https://unravel.finance/home/api/catalog)
         exchange (str | None): Exchange constraint for portfolio data. Valid options are found in the [Unravel Catalog](https://unravel.finance/home/api/catalog)
         as_of (str | None): Point in time for the data. Valid options are 'close' or 'latest'.
+        timeout (float | tuple[float, float] | None): Timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline (float | None): Seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
     Returns:
         pd.Series: Current weights of the portfolio
     """
-    url = f"{BASEAPI}/portfolio/live-weights"
-    params = {"portfolio": id}
-
-    if smoothing is not None:
-        params["smoothing"] = smoothing
-    if exchange is not None:
-        params["exchange"] = exchange
-    if as_of is not None:
-        params["as_of"] = as_of
-
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
-
-    response = response.json()
-    series = pd.Series(response["data"], index=response["columns"])
-    if response.get("index"):
-        series = series.rename(response["index"])
-    # Ensure we have a valid Series before calling astype
-    if isinstance(series, pd.Series):
-        return series.astype(float)
-    return pd.Series(response["data"], index=response["columns"]).astype(float)
+    path, params = _live_weights_request(id, smoothing, exchange, as_of)
+    return get_client().fetch_live(path, api_key, params, _parse_live_weights)
@@ -0,0 +1,486 @@
+"""
+Compact representations of universe membership: packed bitsets per date and
+entry/exit intervals per ticker.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..frames import to_index, to_mask
+from ..instrumentation import phase
+
+
+class UniverseBitmap:
+    """
+    Universe membership stored as one row of packed bits per date.
+
+    Each date takes ``ceil(len(tickers) / 8)`` bytes instead of one byte per ticker
+    for a boolean DataFrame, and no pandas block is built until ``to_frame`` is
+    called. Membership queries are answered directly on the packed bits.
+
+    Args:
+        index (pd.DatetimeIndex): Dates of the rows, in increasing order
+        tickers (Sequence[str]): Tickers of the columns
+        bits (np.ndarray): ``uint8`` array of shape ``(len(index), ceil(len(tickers) / 8))``, as returned by ``np.packbits(members, axis=1)``
+    """
+
+    def __init__(
+        self, index: pd.DatetimeIndex, tickers: Sequence[str], bits: np.ndarray
+    ):
+        self.index = index
+        self.tickers = list(tickers)
+        self.bits = bits
+        self._positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_members(
+        cls, members: np.ndarray, index: pd.DatetimeIndex, tickers: Sequence[str]
+    ) -> UniverseBitmap:
+        """
+        Pack a boolean membership matrix.
+
+        Args:
+            members (np.ndarray): Boolean array of shape ``(len(index), len(tickers))``
+            index (pd.DatetimeIndex): Dates of the rows
+            tickers (Sequence[str]): Tickers of the columns
+        Returns:
+            UniverseBitmap: The packed membership
+        """
+        members = np.asarray(members, dtype=bool).reshape(len(index), len(tickers))
+        return cls(index, tickers, np.packbits(members, axis=1))
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> UniverseBitmap:
+        """
+        Pack a dense membership frame, as returned by ``get_historical_universe``.
+
+        Args:
+            frame (pd.DataFrame): Date-indexed frame of booleans, one column per ticker
+        Returns:
+            UniverseBitmap: The packed membership
+        """
+        frame = frame.sort_index()
+        return cls.from_members(
+            frame.to_numpy(dtype=bool), pd.DatetimeIndex(frame.index), frame.columns
+        )
+
+    @classmethod
+    def concat(cls, bitmaps: Sequence[UniverseBitmap]) -> UniverseBitmap:
+        """
+        Stack bitmaps covering consecutive date ranges.
+
+        Tickers missing from a bitmap were not members on its dates, duplicated
+        dates keep the membership of the last bitmap.
+
+        Args:
+            bitmaps (Sequence[UniverseBitmap]): Bitmaps to stack, one per date window
+        Returns:
+            UniverseBitmap: Single bitmap sorted by date, with the union of the tickers
+        """
+        tickers = list(dict.fromkeys(t for bitmap in bitmaps for t in bitmap.tickers))
+        positions = {ticker: i for i, ticker in enumerate(tickers)}
+        blocks = []
+        for bitmap in bitmaps:
+            block = np.zeros((len(bitmap.index), len(tickers)), dtype=bool)
+            columns = [positions[ticker] for ticker in bitmap.tickers]
+            block[:, columns] = np.unpackbits(
+                bitmap.bits, axis=1, count=len(bitmap.tickers)
+            ).astype(bool)
+            blocks.append(block)
+        members = np.concatenate(blocks) if blocks else np.zeros((0, 0), dtype=bool)
+        index = pd.DatetimeIndex(
+            np.concatenate([bitmap.index.to_numpy() for bitmap in bitmaps])
+            if bitmaps
+            else []
+        )
+        keep = ~index.duplicated(keep="last")
+        order = np.argsort(index[keep].to_numpy(), kind="stable")
+        return cls.from_members(members[keep][order], index[keep][order], tickers)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __repr__(self) -> str:
+        return (
+            f"UniverseBitmap({len(self.index)} dates x {len(self.tickers)} tickers, "
+            f"{self.nbytes} bytes)"
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size in bytes of the packed bits."""
+        return self.bits.nbytes
+
+    def _rows(self, dates: Any) -> np.ndarray:
+        # Row of the last date on or before each date, -1 before the first one.
+        dates = pd.DatetimeIndex(np.atleast_1d(pd.to_datetime(dates)))
+        return self.index.searchsorted(dates, side="right") - 1
+
+    def _columns(self, tickers: Sequence[str]) -> np.ndarray:
+        return np.fromiter(
+            (self._positions.get(ticker, -1) for ticker in tickers),
+            dtype=np.intp,
+            count=len(tickers),
+        )
+
+    def is_member(self, date: Any, tickers: str | Sequence[str]) -> Any:
+        """
+        Whether tickers were part of the universe on a date.
+
+        Membership on a date missing from the index is the one of the last date
+        before it. Dates before the first one and unknown tickers are not members.
+
+        Args:
+            date (Any): A date, or a sequence of dates (anything ``pd.to_datetime`` parses)
+            tickers (str | Sequence[str]): A ticker, or a sequence of tickers
+        Returns:
+            Any: A bool for a single date and ticker, otherwise an array of booleans of
+            shape ``(len(tickers),)``, ``(len(dates),)`` or ``(len(dates), len(tickers))``
+        """
+        single_ticker = isinstance(tickers, str)
+        single_date = np.ndim(date) == 0
+        rows = self._rows(date)
+        columns = self._columns([tickers] if single_ticker else list(tickers))
+
+        valid = (rows >= 0)[:, None] & (columns >= 0)[None, :]
+        rows = np.maximum(rows, 0)
+        columns = np.maximum(columns, 0)
+        if self.bits.size == 0:
+            members = np.zeros(valid.shape, dtype=bool)
+        else:
+            # np.packbits stores the first column in the most significant bit.
+            packed = self.bits[rows[:, None], (columns >> 3)[None, :]]
+            members = ((packed >> (7 - (columns & 7))[None, :]) & 1).astype(bool)
+        members &= valid
+
+        if single_date:
+            members = members[0]
+            return bool(members[0]) if single_ticker else members
+        return members[:, 0] if single_ticker else members
+
+    def members(self, date: Any) -> list[str]:
+        """
+        Tickers part of the universe on a date.
+
+        Args:
+            date (Any): The date, anything ``pd.to_datetime`` parses
+        Returns:
+            list[str]: The tickers, in column order
+        """
+        row = self._rows(date)[0]
+        if row < 0:
+            return []
+        flags = np.unpackbits(self.bits[row], count=len(self.tickers)).astype(bool)
+        return [ticker for ticker, member in zip(self.tickers, flags) if member]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Expand to the dense membership frame returned by ``get_historical_universe``.
+
+        Returns:
+            pd.DataFrame: Date-indexed frame of booleans, one column per ticker
+        """
+        members = np.unpackbits(self.bits, axis=1, count=len(self.tickers)).astype(bool)
+        return pd.DataFrame(members, index=self.index, columns=self.tickers, copy=False)
+
+
+def to_bitmap(data, index: Sequence[str], columns: Sequence[str]) -> UniverseBitmap:
+    """
+    Build a bitmap from a decoded universe payload, missing values meaning non-members.
+
+    Args:
+        data (Any): Decoded ``data`` field, one row per date
+        index (Sequence[str]): Dates of the rows
+        columns (Sequence[str]): Tickers of the columns
+    Returns:
+        UniverseBitmap: The packed membership
+    """
+    with phase("convert"):
+        members = to_mask(data).reshape(len(index), len(columns))
+    with phase("index"):
+        dates = to_index(index)
+    with phase("frame"):
+        return UniverseBitmap.from_members(members, dates, columns)
+
+
+class UniverseIndex:
+    """
+    Universe membership encoded as sorted entry and exit dates per ticker.
+
+    A ticker is a member from each ``entry`` date (included) to the matching ``exit``
+    date (excluded), the first date it was no longer part of the universe. Intervals
+    still open on the last date of the universe have a ``NaT`` exit. Dates between
+    two rows of the universe share the membership of the row before them, like
+    ``UniverseBitmap``.
+
+    Lookups of given tickers binary search their intervals, which are stored flat
+    and grouped by ticker: the intervals of ``tickers[i]`` are
+    ``entries[offsets[i]:offsets[i + 1]]``. Only tickers that were members at least
+    once are indexed.
+
+    Args:
+        tickers (Sequence[str]): Indexed tickers
+        offsets (np.ndarray): Start of the intervals of every ticker, followed by their total number
+        entries (np.ndarray): ``datetime64[ns]`` entry dates, increasing within every ticker
+        exits (np.ndarray): ``datetime64[ns]`` exit dates, ``NaT`` for open intervals
+    """
+
+    def __init__(
+        self,
+        tickers: Sequence[str],
+        offsets: np.ndarray,
+        entries: np.ndarray,
+        exits: np.ndarray,
+    ):
+        self.tickers = list(tickers)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.entries = np.asarray(entries, dtype="datetime64[ns]")
+        self.exits = np.asarray(exits, dtype="datetime64[ns]")
+        self._positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+        # Integer views to search, open intervals never end.
+        self._starts = self.entries.view(np.int64)
+        self._ends = np.where(
+            np.isnat(self.exits), np.iinfo(np.int64).max, self.exits.view(np.int64)
+        )
+
+    @classmethod
+    def from_members(
+        cls, members: np.ndarray, index: pd.DatetimeIndex, tickers: Sequence[str]
+    ) -> UniverseIndex:
+        """
+        Encode a boolean membership matrix.
+
+        Args:
+            members (np.ndarray): Boolean array of shape ``(len(index), len(tickers))``
+            index (pd.DatetimeIndex): Dates of the rows, in increasing order
+            tickers (Sequence[str]): Tickers of the columns
+        Returns:
+            UniverseIndex: The interval index
+        """
+        members = np.asarray(members, dtype=bool).reshape(len(index), len(tickers))
+        dates = np.append(
+            pd.DatetimeIndex(index).to_numpy().astype("datetime64[ns]"),
+            np.datetime64("NaT", "ns"),
+        )
+        padded = np.zeros((len(tickers), len(index) + 2), dtype=np.int8)
+        padded[:, 1:-1] = members.T
+        # Per ticker, +1 on the row entering the universe, -1 on the row leaving it.
+        changes = np.diff(padded, axis=1)
+        columns, entry_rows = np.nonzero(changes == 1)
+        _, exit_rows = np.nonzero(changes == -1)
+
+        indexed = np.unique(columns)
+        offsets = np.searchsorted(columns, np.arange(len(tickers) + 1))
+        offsets = np.append(offsets[indexed], len(columns))
+        return cls(
+            [tickers[i] for i in indexed], offsets, dates[entry_rows], dates[exit_rows]
+        )
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> UniverseIndex:
+        """
+        Encode a dense membership frame, as returned by ``get_historical_universe``.
+
+        Args:
+            frame (pd.DataFrame): Date-indexed frame of booleans, one column per ticker
+        Returns:
+            UniverseIndex: The interval index
+        """
+        frame = frame.sort_index()
+        return cls.from_members(
+            frame.to_numpy(dtype=bool), pd.DatetimeIndex(frame.index), frame.columns
+        )
+
+    @classmethod
+    def from_bitmap(cls, bitmap: UniverseBitmap) -> UniverseIndex:
+        """
+        Encode a ``UniverseBitmap``, as returned by ``get_historical_universe(compact=True)``.
+
+        Args:
+            bitmap (UniverseBitmap): The packed membership
+        Returns:
+            UniverseIndex: The interval index
+        """
+        members = np.unpackbits(bitmap.bits, axis=1, count=len(bitmap.tickers))
+        return cls.from_members(members.astype(bool), bitmap.index, bitmap.tickers)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self) -> str:
+        return f"UniverseIndex({len(self.tickers)} tickers, {len(self)} intervals)"
+
+    def intervals(self, ticker: str) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Membership intervals of a ticker.
+
+        Args:
+            ticker (str): The ticker
+        Returns:
+            list[tuple[pd.Timestamp, pd.Timestamp]]: (entry, exit) dates in chronological order, empty for unknown tickers
+        """
+        column = self._positions.get(ticker)
+        if column is None:
+            return []
+        start, stop = self.offsets[column], self.offsets[column + 1]
+        return [
+            (pd.Timestamp(entry), pd.Timestamp(exit_))
+            for entry, exit_ in zip(self.entries[start:stop], self.exits[start:stop])
+        ]
+
+    def _contains(self, column: int, stamps: np.ndarray) -> np.ndarray:
+        start, stop = self.offsets[column], self.offsets[column + 1]
+        starts, ends = self._starts[start:stop], self._ends[start:stop]
+        # Last interval entered on or before every date, which must not have ended yet.
+        positions = np.searchsorted(starts, stamps, side="right") - 1
+        return (positions >= 0) & (stamps < ends[np.maximum(positions, 0)])
+
+    def is_member(self, date: Any, tickers: str | Sequence[str]) -> Any:
+        """
+        Whether tickers were part of the universe on a date, in O(log n) per ticker and date.
+
+        Args:
+            date (Any): A date, or a sequence of dates (anything ``pd.to_datetime`` parses)
+            tickers (str | Sequence[str]): A ticker, or a sequence of tickers
+        Returns:
+            Any: A bool for a single date and ticker, otherwise an array of booleans of
+            shape ``(len(tickers),)``, ``(len(dates),)`` or ``(len(dates), len(tickers))``
+        """
+        single_ticker = isinstance(tickers, str)
+        single_date = np.ndim(date) == 0
+        stamps = _stamps(date)
+        tickers = [tickers] if single_ticker else list(tickers)
+
+        members = np.zeros((len(stamps), len(tickers)), dtype=bool)
+        for i, ticker in enumerate(tickers):
+            column = self._positions.get(ticker)
+            if column is not None:
+                members[:, i] = self._contains(column, stamps)
+
+        if single_date:
+            members = members[0]
+            return bool(members[0]) if single_ticker else members
+        return members[:, 0] if single_ticker else members
+
+    def lookup(self, dates: Any) -> pd.DataFrame:
+        """
+        Membership of every indexed ticker on many dates at once.
+
+        Every interval is located among the sorted dates with two binary searches,
+        so the cost grows with the number of intervals rather than of tickers times dates.
+
+        Args:
+            dates (Any): Sequence of dates (anything ``pd.to_datetime`` parses), in any order
+        Returns:
+            pd.DataFrame: Frame of booleans indexed by the dates, one column per ticker
+        """
+        index = pd.DatetimeIndex(np.atleast_1d(pd.to_datetime(dates)))
+        stamps = _stamps(index)
+        order = np.argsort(stamps, kind="stable")
+        ordered = stamps[order]
+
+        # Each interval covers the dates from its entry up to its exit, counted on a
+        # difference array that a cumulative sum turns into memberships.
+        first = np.searchsorted(ordered, self._starts, side="left")
+        last = np.searchsorted(ordered, self._ends, side="left")
+        columns = np.repeat(np.arange(len(self.tickers)), np.diff(self.offsets))
+        counts = np.zeros((len(ordered) + 1, len(self.tickers)), dtype=np.int32)
+        np.add.at(counts, (first, columns), 1)
+        np.add.at(counts, (last, columns), -1)
+
+        members = np.empty((len(ordered), len(self.tickers)), dtype=bool)
+        members[order] = np.cumsum(counts[:-1], axis=0) > 0
+        return pd.DataFrame(members, index=index, columns=self.tickers, copy=False)
+
+    def members(self, date: Any) -> list[str]:
+        """
+        Tickers part of the universe on a date, in a single vectorized pass over the intervals.
+
+        Args:
+            date (Any): The date, anything ``pd.to_datetime`` parses
+        Returns:
+            list[str]: The tickers, in index order
+        """
+        stamp = _stamps(date)[0]
+        open_ = (self._starts <= stamp) & (stamp < self._ends)
+        columns = np.searchsorted(self.offsets, np.flatnonzero(open_), side="right") - 1
+        return [self.tickers[column] for column in columns]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Intervals as a frame, one row per interval.
+
+        Returns:
+            pd.DataFrame: ``ticker``, ``entry`` and ``exit`` columns, grouped by ticker
+        """
+        return pd.DataFrame(
+            {
+                "ticker": np.repeat(self.tickers, np.diff(self.offsets)),
+                "entry": self.entries,
+                "exit": self.exits,
+            }
+        )
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Store the index in a Parquet file, written atomically.
+
+        Args:
+            path (str | os.PathLike): Destination file
+        Raises:
+            ImportError: If neither pyarrow nor fastparquet is installed
+        """
+        _require_parquet()
+        path = Path(path).expanduser()
+        tmp = path.with_name(path.name + ".tmp")
+        self.to_frame().to_parquet(tmp, index=False)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> UniverseIndex:
+        """
+        Load an index stored by ``save``.
+
+        Args:
+            path (str | os.PathLike): File written by ``save``
+        Returns:
+            UniverseIndex: The interval index
+        Raises:
+            ImportError: If neither pyarrow nor fastparquet is installed
+        """
+        _require_parquet()
+        frame = pd.read_parquet(Path(path).expanduser())
+        tickers = frame["ticker"].to_numpy()
+        # Rows are grouped by ticker, each group starts where the ticker changes.
+        starts = np.flatnonzero(tickers[1:] != tickers[:-1]) + 1
+        if len(tickers):
+            starts = np.r_[0, starts]
+        return cls(
+            [str(ticker) for ticker in tickers[starts]],
+            np.append(starts, len(tickers)),
+            frame["entry"].to_numpy(),
+            frame["exit"].to_numpy(),
+        )
+
+
+def _stamps(dates: Any) -> np.ndarray:
+    values = pd.DatetimeIndex(np.atleast_1d(pd.to_datetime(dates)))
+    return values.as_unit("ns").asi8
+
+
+def _require_parquet() -> None:
+    if (
+        importlib.util.find_spec("pyarrow") is None
+        and importlib.util.find_spec("fastparquet") is None
+    ):
+        raise ImportError(
+            "UniverseIndex files require pyarrow, install it with `pip install unravel-client[cache]`"
+        )
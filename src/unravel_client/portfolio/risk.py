@@ -1,10 +1,30 @@
 from __future__ import annotations
 
 import pandas as pd
-import requests
 
-from ..constants import BASEAPI, get_headers
+from ..client import get_client
 from ..decorators import retry_on_error
+from ..frames import to_series
+
+
+def _risk_overlay_request(
+    portfolio: str,
+    overlay: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> tuple[str, dict]:
+    params = {"portfolio": portfolio, "overlay": overlay}
+
+    if start_date is not None:
+        params["start_date"] = start_date
+    if end_date is not None:
+        params["end_date"] = end_date
+
+    return "portfolio/risk-overlay", params
+
+
+def _parse_risk_overlay(response: dict) -> pd.Series:
+    return to_series(response["data"], response["index"])
 
 
 @retry_on_error(num_trials=3, wait=2.0)
@@ -14,6 +34,8 @@ def get_risk_overlay(
     api_key: str,
     start_date: str | None = None,
     end_date: str | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
 ) -> pd.Series:
     """
     Retrieve historical risk overlay data for a portfolio.
@@ -24,6 +46,8 @@ def get_risk_overlay(
         api_key: API authentication key
         start_date: Optional filter start date in YYYY-MM-DD format
         end_date: Optional filter end date in YYYY-MM-DD format
+        timeout: Optional timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline: Optional seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
 
     Returns:
         pd.Series: Series with datetime index and float values representing
@@ -32,23 +56,24 @@ def get_risk_overlay(
     Raises:
         APIError: If the API request fails or returns an error status
     """
-    url = f"{BASEAPI}/portfolio/risk-overlay"
+    path, params = _risk_overlay_request(portfolio, overlay, start_date, end_date)
+    return get_client().fetch_history(path, api_key, params, _parse_risk_overlay)
+
+
+def _risk_overlay_live_request(
+    portfolio: str,
+    overlay: str,
+    as_of: str | None = None,
+) -> tuple[str, dict]:
     params = {"portfolio": portfolio, "overlay": overlay}
+    if as_of is not None:
+        params["as_of"] = as_of
 
-    if start_date is not None:
-        params["start_date"] = start_date
-    if end_date is not None:
-        params["end_date"] = end_date
+    return "portfolio/risk-overlay-live", params
 
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
 
-    response = response.json()
-    return pd.Series(
-        response["data"],
-        index=pd.to_datetime(response["index"]),
-    ).astype(float)
+def _parse_risk_overlay_live(response: dict) -> pd.Series:
+    return to_series([response["data"]], [response["index"]])
 
 
 @retry_on_error(num_trials=3, wait=2.0)
@@ -57,6 +82,8 @@ def get_risk_overlay_live(
     overlay: str,
     api_key: str,
     as_of: str | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
 ) -> pd.Series:
     """
     Retrieve the latest risk overlay value for a portfolio.
@@ -66,6 +93,8 @@ def get_risk_overlay_live(
         overlay: Risk overlay ID (see [Unravel Catalog](https://unravel.finance/home/api/catalog/risk-overlays))
         api_key: API authentication key
         as_of: Optional point in time for the data. Valid options are 'close' or 'latest'.
+        timeout: Optional timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline: Optional seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
 
     Returns:
         pd.Series: Series with datetime index and float values representing
@@ -74,19 +103,27 @@ def get_risk_overlay_live(
     Raises:
         APIError: If the API request fails or returns an error status
     """
-    url = f"{BASEAPI}/portfolio/risk-overlay-live"
-    params = {"portfolio": portfolio, "overlay": overlay}
-    if as_of is not None:
-        params["as_of"] = as_of
+    path, params = _risk_overlay_live_request(portfolio, overlay, as_of)
+    return get_client().fetch_live(path, api_key, params, _parse_risk_overlay_live)
 
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
-    response = response.json()
-    return pd.Series(
-        [response["data"]],
-        index=[pd.to_datetime(response["index"])],
-    ).astype(float)
+
+def _risk_regime_request(
+    overlay: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> tuple[str, dict]:
+    params = {"overlay": overlay}
+
+    if start_date is not None:
+        params["start_date"] = start_date
+    if end_date is not None:
+        params["end_date"] = end_date
+
+    return "risk-regime", params
+
+
+def _parse_risk_regime(response: dict) -> pd.Series:
+    return to_series(response["data"], response["index"])
 
 
 @retry_on_error(num_trials=3, wait=2.0)
@@ -95,6 +132,8 @@ def get_risk_regime(
     api_key: str,
     start_date: str | None = None,
     end_date: str | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
 ) -> pd.Series:
     """
     Retrieve historical risk regime data.
@@ -104,6 +143,8 @@ def get_risk_regime(
         api_key: API authentication key
         start_date: Optional filter start date in YYYY-MM-DD format
         end_date: Optional filter end date in YYYY-MM-DD format
+        timeout: Optional timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline: Optional seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
 
     Returns:
         pd.Series: Series with datetime index and float values representing
@@ -112,23 +153,23 @@ def get_risk_regime(
     Raises:
         APIError: If the API request fails or returns an error status
     """
-    url = f"{BASEAPI}/risk-regime"
+    path, params = _risk_regime_request(overlay, start_date, end_date)
+    return get_client().fetch_history(path, api_key, params, _parse_risk_regime)
+
+
+def _risk_regime_live_request(
+    overlay: str,
+    as_of: str | None = None,
+) -> tuple[str, dict]:
     params = {"overlay": overlay}
+    if as_of is not None:
+        params["as_of"] = as_of
 
-    if start_date is not None:
-        params["start_date"] = start_date
-    if end_date is not None:
-        params["end_date"] = end_date
+    return "risk-regime-live", params
 
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
 
-    response = response.json()
-    return pd.Series(
-        response["data"],
-        index=pd.to_datetime(response["index"]),
-    ).astype(float)
+def _parse_risk_regime_live(response: dict) -> pd.Series:
+    return to_series([response["data"]], [response["index"]])
 
 
 @retry_on_error(num_trials=3, wait=2.0)
@@ -136,6 +177,8 @@ def get_risk_regime_live(
     overlay: str,
     api_key: str,
     as_of: str | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
 ) -> pd.Series:
     """
     Retrieve the latest market-wide risk regime value.
@@ -144,6 +187,8 @@ def get_risk_regime_live(
         overlay: Risk overlay ID (see [Unravel Catalog](https://unravel.finance/home/api/catalog/risk-overlays))
         api_key: API authentication key
         as_of: Optional point in time for the data. Valid options are 'close' or 'latest'.
+        timeout: Optional timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline: Optional seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
 
     Returns:
         pd.Series: Series with datetime index and float values representing
@@ -152,18 +197,5 @@ def get_risk_regime_live(
     Raises:
         APIError: If the API request fails or returns an error status
     """
-    url = f"{BASEAPI}/risk-regime-live"
-    params = {"overlay": overlay}
-    if as_of is not None:
-        params["as_of"] = as_of
-
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
-
-    response = response.json()
-
-    return pd.Series(
-        [response["data"]],
-        index=[pd.to_datetime(response["index"])],
-    ).astype(float)
+    path, params = _risk_regime_live_request(overlay, as_of)
+    return get_client().fetch_live(path, api_key, params, _parse_risk_regime_live)
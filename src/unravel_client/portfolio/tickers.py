@@ -1,17 +1,34 @@
 from __future__ import annotations
 
-import requests
-
-from ..constants import BASEAPI, get_headers
+from ..client import get_client
 from ..decorators import retry_on_error
 
 
+def _tickers_request(
+    id: str,
+    universe_size: int | str,
+    exchange: str | None = None,
+) -> tuple[str, dict]:
+    params = {"id": id, "universe_size": universe_size}
+
+    if exchange is not None:
+        params["exchange"] = exchange
+
+    return "portfolio/tickers", params
+
+
+def _parse_tickers(response: dict) -> list[str]:
+    return response["tickers"]
+
+
 @retry_on_error(num_trials=3, wait=2.0)
 def get_tickers(
     id: str,
     api_key: str,
     universe_size: int | str,
     exchange: str | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
 ) -> list[str]:
     """
     Fetch the tickers for a portfolio from the Unravel API.
@@ -21,20 +38,11 @@ def get_tickers(
         api_key (str): The API key to use for the request
         universe_size (int | str): Universe size for the portfolio (e.g., 20, 30, 40) or 'full' to get all tickers.
         exchange (str | None): Exchange constraint for portfolio data. Valid options are found in the [Unravel Catalog](https://unravel.finance/home/api/catalog)
-
+        timeout (float | tuple[float, float] | None): Timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline (float | None): Seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
     Returns:
         list[str]: List of tickers in the portfolio
     """
 
-    url = f"{BASEAPI}/portfolio/tickers"
-    params = {"id": id, "universe_size": universe_size}
-
-    if exchange is not None:
-        params["exchange"] = exchange
-
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
-
-    response = response.json()
-    return response["tickers"]
+    path, params = _tickers_request(id, universe_size, exchange)
+    return get_client().fetch(path, api_key, params, _parse_tickers)
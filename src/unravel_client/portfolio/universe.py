@@ -1,10 +1,40 @@
 from __future__ import annotations
 
 import pandas as pd
-import requests
 
-from ..constants import BASEAPI, get_headers
+from ..client import get_client
 from ..decorators import retry_on_error
+from .membership import UniverseBitmap, to_bitmap
+
+
+def _historical_universe_request(
+    size: str,
+    start_date: str,
+    end_date: str,
+    exchange: str | None = None,
+) -> tuple[str, dict]:
+    params = {"size": size, "start_date": start_date, "end_date": end_date}
+
+    if exchange is not None:
+        params["exchange"] = exchange
+
+    return "portfolio/universe", params
+
+
+def _parse_historical_universe(response: dict) -> UniverseBitmap:
+    # Parsed to the compact form, so that cached and coalesced results serve both
+    # forms and the dense frame is only built when asked for.
+    return to_bitmap(response["data"], response["index"], response["columns"])
+
+
+def _combine_historical_universe(bitmaps: list[UniverseBitmap]) -> UniverseBitmap:
+    return UniverseBitmap.concat(bitmaps)
+
+
+def _universe_result(
+    universe: UniverseBitmap, compact: bool
+) -> pd.DataFrame | UniverseBitmap:
+    return universe if compact else universe.to_frame()
 
 
 @retry_on_error(num_trials=3, wait=2.0)
@@ -14,7 +44,11 @@ def get_historical_universe(
     start_date: str,
     end_date: str,
     exchange: str | None = None,
-) -> pd.DataFrame:
+    shards: int | None = None,
+    compact: bool = False,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
+) -> pd.DataFrame | UniverseBitmap:
     """
     Fetch the historical universe from the Unravel API.
 
@@ -24,24 +58,21 @@ def get_historical_universe(
         start_date (str): Filter data to only include dates on or after this date (ISO format: YYYY-MM-DD)
         end_date (str): Filter data to only include dates on or before this date (ISO format: YYYY-MM-DD)
         exchange (str | None): Exchange constraint for portfolio data. Valid options are found in the [Unravel Catalog](https://unravel.finance/home/api/catalog)
-
+        shards (int | None): Split the date range into this many windows fetched concurrently. None sends a single request
+        compact (bool): Return a ``UniverseBitmap`` packing the membership of every date into bits, instead of a dense DataFrame
+        timeout (float | tuple[float, float] | None): Timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline (float | None): Seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
     Returns:
-        pd.DataFrame: DataFrame of tickers in the portfolio [True and False]
+        pd.DataFrame | UniverseBitmap: DataFrame of tickers in the portfolio [True and False], or its ``UniverseBitmap`` if ``compact``
     """
 
-    url = f"{BASEAPI}/portfolio/universe"
-    params = {"size": size, "start_date": start_date, "end_date": end_date}
-
-    if exchange is not None:
-        params["exchange"] = exchange
-
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
-
-    response = response.json()
-    return pd.DataFrame(
-        response["data"],
-        index=pd.to_datetime(response["index"]),
-        columns=response["columns"],
-    ).notna()
+    path, params = _historical_universe_request(size, start_date, end_date, exchange)
+    universe = get_client().fetch_range(
+        path,
+        api_key,
+        params,
+        _parse_historical_universe,
+        shards,
+        combine=_combine_historical_universe,
+    )
+    return _universe_result(universe, compact)
@@ -1,10 +1,34 @@
 from __future__ import annotations
 
+from functools import partial
+
 import pandas as pd
-import requests
 
-from .constants import BASEAPI, get_headers
+from .client import get_client
+from .constants import TICKER_CHUNK_SIZE
 from .decorators import retry_on_error
+from .frames import to_frame, to_series
+from .parallel import chunked, concat_columns
+from .timeouts import call_scope
+
+
+def _price_request(
+    ticker: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> tuple[str, dict]:
+    params = {"ticker": ticker}
+
+    if start_date is not None:
+        params["start_date"] = start_date
+    if end_date is not None:
+        params["end_date"] = end_date
+
+    return "price", params
+
+
+def _parse_price(response: dict, ticker: str) -> pd.Series:
+    return to_series(response["data"], response["index"], name=ticker)
 
 
 @retry_on_error(num_trials=3, wait=2.0)
@@ -13,6 +37,8 @@ def get_price(
     api_key: str,
     start_date: str | None = None,
     end_date: str | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
 ) -> pd.Series:
     """
     DEPRECATED: Use get_prices instead, this endpoint will be removed in the future.
@@ -25,33 +51,70 @@ def get_price(
         api_key (str): The API key to use for the request
         start_date (str | None): Filter data to only include dates on or after this date (ISO format: YYYY-MM-DD)
         end_date (str | None): Filter data to only include dates on or before this date (ISO format: YYYY-MM-DD)
+        timeout (float | tuple[float, float] | None): Timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline (float | None): Seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
     Returns:
         pd.Series: Time series of closing prices with datetime index
     """
-    url = f"{BASEAPI}/price"
-    params = {"ticker": ticker}
+    path, params = _price_request(ticker, start_date, end_date)
+    return get_client().fetch(
+        path, api_key, params, partial(_parse_price, ticker=ticker)
+    )
+
+
+def _check_tickers(tickers: list[str]) -> None:
+    assert not isinstance(
+        tickers, str
+    ), "tickers must be a sequence of strings (list, tuple, pandas.Index, etc.)"
+
+
+def _prices_request(
+    tickers: list[str],
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> tuple[str, dict]:
+    params = {"ticker": ",".join(tickers)}
 
     if start_date is not None:
         params["start_date"] = start_date
     if end_date is not None:
         params["end_date"] = end_date
 
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
+    return "price", params
 
-    response = response.json()
-    return pd.Series(response["data"], index=pd.to_datetime(response["index"])).rename(
-        ticker
-    )
+
+def _parse_prices(response: dict, tickers: list[str]) -> pd.DataFrame:
+    if "columns" in response:
+        return to_frame(response["data"], response["index"], response["columns"])
+
+    return to_series(
+        response["data"],
+        response["index"],
+        name=tickers[0].replace(",", "").replace(" ", ""),
+    ).to_frame()
 
 
 @retry_on_error(num_trials=3, wait=2.0)
+def _get_prices_chunk(
+    tickers: list[str],
+    api_key: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> pd.DataFrame:
+    path, params = _prices_request(tickers, start_date, end_date)
+    return get_client().fetch_history(
+        path, api_key, params, partial(_parse_prices, tickers=tickers)
+    )
+
+
 def get_prices(
     tickers: list[str],
     api_key: str,
     start_date: str | None = None,
     end_date: str | None = None,
+    chunk_size: int | None = TICKER_CHUNK_SIZE,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
 ) -> pd.DataFrame:
     """
     Fetch closing prices for a ticker from the Unravel API.
@@ -63,35 +126,20 @@ def get_prices(
         api_key (str): The API key to use for the request
         start_date (str | None): Filter data to only include dates on or after this date (ISO format: YYYY-MM-DD)
         end_date (str | None): Filter data to only include dates on or before this date (ISO format: YYYY-MM-DD)
+        chunk_size (int | None): Maximum number of tickers per request, longer lists are split into chunks fetched concurrently. None sends every ticker in a single request
+        timeout (float | tuple[float, float] | None): Timeout in seconds of every request sent by this call, either a single value or a (connect, read) tuple. Defaults to the client ``timeout``
+        deadline (float | None): Seconds after which the call, retries included, gives up with ``DeadlineExceeded``. Defaults to the client ``deadline``
     Returns:
-        pd.DataFrame: DataFrame of closing prices with datetime index and ticker columns
+        pd.DataFrame: DataFrame of closing prices with datetime index and ticker columns, in the order of ``tickers``
     """
-    url = f"{BASEAPI}/price"
-    assert not isinstance(
-        tickers, str
-    ), "tickers must be a sequence of strings (list, tuple, pandas.Index, etc.)"
-    params = {"ticker": ",".join(tickers)}
-
-    if start_date is not None:
-        params["start_date"] = start_date
-    if end_date is not None:
-        params["end_date"] = end_date
-
-    headers = get_headers(api_key)
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
-
-    response = response.json()
-
-    if "columns" in response:
-        return pd.DataFrame(
-            response["data"],
-            index=pd.to_datetime(response["index"]),
-            columns=response["columns"],
+    _check_tickers(tickers)
+    chunks = chunked(tickers, chunk_size)
+    with call_scope(timeout, deadline):
+        if len(chunks) == 1:
+            return _get_prices_chunk(chunks[0], api_key, start_date, end_date)
+
+        frames = get_client().map(
+            lambda chunk: _get_prices_chunk(chunk, api_key, start_date, end_date),
+            chunks,
         )
-
-    return (
-        pd.Series(response["data"], index=pd.to_datetime(response["index"]))
-        .rename(tickers[0].replace(",", "").replace(" ", ""))
-        .to_frame()
-    )
+    return concat_columns(frames, tickers)
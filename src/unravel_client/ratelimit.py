@@ -0,0 +1,187 @@
+"""
+Client-side rate limiting of the requests sent to the API.
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import os
+import struct
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from .timeouts import DeadlineExceeded
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+_STATE = struct.Struct("<dd")
+
+
+class RateLimiter(abc.ABC):
+    """
+    Base class of rate limiters, subclasses implement ``reserve``.
+
+    Callers reserve tokens up front and are told how long to wait before using them,
+    so concurrent callers are queued in order instead of racing for the next token.
+    """
+
+    @abc.abstractmethod
+    def reserve(self, tokens: float = 1.0, timeout: float | None = None) -> float:
+        """
+        Take ``tokens`` from the bucket, going into debt if it does not hold enough.
+
+        Args:
+            tokens (float): Number of tokens to take, one per request
+            timeout (float | None): Longest wait allowed, None to wait as long as needed
+        Returns:
+            float: Seconds to wait before the reserved tokens may be used
+        Raises:
+            DeadlineExceeded: If the tokens may only be used after ``timeout`` seconds, none are taken then
+        """
+
+    def acquire(self, tokens: float = 1.0, timeout: float | None = None) -> float:
+        """
+        Reserve ``tokens`` and sleep until they may be used.
+
+        Args:
+            tokens (float): Number of tokens to take, one per request
+            timeout (float | None): Longest wait allowed, None to wait as long as needed
+        Returns:
+            float: Seconds slept
+        Raises:
+            DeadlineExceeded: If the tokens may only be used after ``timeout`` seconds, raised without waiting
+        """
+        delay = self.reserve(tokens, timeout)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(
+        self, tokens: float = 1.0, timeout: float | None = None
+    ) -> float:
+        """Same as ``acquire``, without blocking the event loop."""
+        delay = self.reserve(tokens, timeout)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+def _refill(
+    tokens: float,
+    updated: float,
+    now: float,
+    rate: float,
+    capacity: float,
+    requested: float,
+) -> tuple[float, float]:
+    # Returns the tokens left after taking ``requested`` ones and the wait it implies.
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate) - requested
+    return tokens, max(0.0, -tokens / rate)
+
+
+def _check_wait(delay: float, timeout: float | None) -> None:
+    # Called before a reservation is stored, so that rejected callers take no tokens.
+    if timeout is not None and delay > timeout:
+        raise DeadlineExceeded(
+            f"Deadline exceeded waiting {delay:.3f}s for the rate limiter"
+        )
+
+
+class TokenBucket(RateLimiter):
+    """
+    Token bucket shared by every thread of the process.
+
+    Tokens are added at ``rate`` per second up to ``capacity``, every request takes
+    one, so bursts of up to ``capacity`` requests go out immediately and sustained
+    throughput stays at ``rate`` requests per second.
+
+    Args:
+        rate (float): Requests allowed per second
+        capacity (float | None): Maximum burst size, defaults to ``rate`` (one second worth of requests)
+        clock (Callable): Monotonic clock in seconds
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0, timeout: float | None = None) -> float:
+        with self._lock:
+            now = self.clock()
+            available, delay = _refill(
+                self._tokens, self._updated, now, self.rate, self.capacity, tokens
+            )
+            _check_wait(delay, timeout)
+            self._tokens, self._updated = available, now
+            return delay
+
+
+class FileTokenBucket(RateLimiter):
+    """
+    Token bucket shared by every process of the host through a state file.
+
+    The bucket state lives in ``path`` and every reservation holds an exclusive
+    ``flock`` on it, so all processes (and threads) using the same path share one
+    budget. Requires a POSIX system.
+
+    Args:
+        path (str | os.PathLike): State file, created if missing
+        rate (float): Requests allowed per second
+        capacity (float | None): Maximum burst size, defaults to ``rate`` (one second worth of requests)
+        clock (Callable): Wall clock in seconds, shared by all processes
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        if fcntl is None:
+            raise OSError(
+                "FileTokenBucket requires fcntl, which is only available on POSIX systems"
+            )
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.path = Path(path).expanduser()
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.clock = clock
+
+    def reserve(self, tokens: float = 1.0, timeout: float | None = None) -> float:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = self.clock()
+            state = os.pread(fd, _STATE.size, 0)
+            if len(state) == _STATE.size:
+                available, updated = _STATE.unpack(state)
+            else:
+                available, updated = self.capacity, now
+            available, delay = _refill(
+                available, updated, now, self.rate, self.capacity, tokens
+            )
+            _check_wait(delay, timeout)
+            os.pwrite(fd, _STATE.pack(available, now), 0)
+            return delay
+        finally:
+            # Closing the descriptor also releases the lock.
+            os.close(fd)
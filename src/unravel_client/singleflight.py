@@ -0,0 +1,120 @@
+"""
+Deduplication of identical concurrent calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any
+
+from .timeouts import DeadlineExceeded
+
+
+class SingleFlight:
+    """
+    Coalesce identical calls made concurrently from several threads.
+
+    While a call for a key is in flight, further calls with the same key wait for
+    it and receive its result (or exception) instead of executing again.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self, key: Hashable, func: Callable[[], Any], timeout: float | None = None
+    ) -> Any:
+        """
+        Run ``func`` unless a call with the same key is already in flight.
+
+        Args:
+            key (Hashable): Identity of the call
+            func (Callable): Function executed by the first caller
+            timeout (float | None): Longest time a waiter waits for the call in flight, None to wait until it ends
+        Returns:
+            Any: The result of the single execution of ``func``
+        Raises:
+            DeadlineExceeded: If the call in flight does not end within ``timeout``
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError:
+                if future.done():
+                    raise
+                raise DeadlineExceeded(
+                    "Deadline exceeded waiting for an identical call in flight"
+                ) from None
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Coalesce identical calls made concurrently from several coroutines.
+
+    While a call for a key is in flight, further calls with the same key await it
+    and receive its result (or exception) instead of executing again. Cancelling
+    one waiter does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[Any]],
+        timeout: float | None = None,
+    ) -> Any:
+        """
+        Await ``func()`` unless a call with the same key is already in flight.
+
+        Args:
+            key (Hashable): Identity of the call
+            func (Callable): Coroutine function executed by the first caller
+            timeout (float | None): Longest time a waiter waits for the call in flight, None to wait until it ends
+        Returns:
+            Any: The result of the single execution of ``func``
+        Raises:
+            DeadlineExceeded: If the call in flight does not end within ``timeout``
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            if task.done():
+                raise
+            raise DeadlineExceeded(
+                "Deadline exceeded waiting for an identical call in flight"
+            ) from None
+
+    def __len__(self) -> int:
+        return len(self._calls)
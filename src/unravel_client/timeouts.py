@@ -0,0 +1,152 @@
+"""
+Per-call timeouts and end-to-end deadlines shared by every request of an endpoint call.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import requests
+
+# Default (connect, read) timeout in seconds of every request.
+DEFAULT_TIMEOUT = (10.0, 60.0)
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised when an endpoint call, retries included, runs past its deadline."""
+
+
+@dataclass
+class CallScope:
+    """
+    Timeout and deadline of the endpoint call currently running.
+
+    Attributes:
+        timeout (float | tuple[float, float] | None): Timeout of every request of the call, None for the client default
+        started (float): ``time.monotonic()`` when the outermost call started
+        expires_at (float | None): ``time.monotonic()`` past which the call gives up, None for no deadline
+        attempt (int): Number of the attempt currently running, set by ``retry_on_error``
+    """
+
+    timeout: float | tuple[float, float] | None = None
+    started: float = 0.0
+    expires_at: float | None = None
+    attempt: int = 1
+
+    def remaining(self) -> float | None:
+        """Seconds left before the deadline, None if the call has none."""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    def bound(self, deadline: float | None) -> None:
+        """Tighten the deadline to ``deadline`` seconds after the call started."""
+        if deadline is None:
+            return
+        expires_at = self.started + deadline
+        if self.expires_at is None or expires_at < self.expires_at:
+            self.expires_at = expires_at
+
+
+_scope: contextvars.ContextVar[CallScope | None] = contextvars.ContextVar(
+    "unravel_call_scope", default=None
+)
+
+
+def current_scope() -> CallScope | None:
+    """The scope of the endpoint call currently running, if any."""
+    return _scope.get()
+
+
+@contextmanager
+def call_scope(
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
+) -> Iterator[CallScope]:
+    """
+    Apply a timeout and a deadline to every request sent within the block.
+
+    Scopes nest: an inner scope inherits the timeout of the outer one unless it sets
+    its own, and can only shorten the outer deadline. The scope is carried by a
+    context variable, so it follows ``asyncio`` tasks and the threads of
+    ``UnravelClient.map``.
+
+    Args:
+        timeout (float | tuple[float, float] | None): Timeout in seconds of every request, either a single value or a (connect, read) tuple
+        deadline (float | None): Seconds from now after which no request is sent anymore
+    """
+    outer = _scope.get()
+    now = time.monotonic()
+    scope = CallScope(timeout, now)
+    if outer is not None:
+        if timeout is None:
+            scope.timeout = outer.timeout
+        scope.started = outer.started
+        scope.expires_at = outer.expires_at
+    if deadline is not None:
+        expires_at = now + deadline
+        if scope.expires_at is None or expires_at < scope.expires_at:
+            scope.expires_at = expires_at
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+def _clamp(timeout: float | None, remaining: float) -> float:
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def remaining_time(deadline: float | None = None) -> float | None:
+    """
+    Seconds left before the deadline of the current call.
+
+    Args:
+        deadline (float | None): Default deadline of calls, counted from the start of the current call
+    Returns:
+        float | None: Seconds left, negative once the deadline has passed, None if the call has no deadline
+    """
+    scope = _scope.get()
+    if scope is None:
+        return deadline
+    scope.bound(deadline)
+    return scope.remaining()
+
+
+def request_timeout(
+    default: float | tuple[float, float] | None,
+    deadline: float | None = None,
+) -> float | tuple[float, float] | None:
+    """
+    Timeout of the next request, shortened so that it ends before the deadline.
+
+    Args:
+        default (float | tuple[float, float] | None): Timeout used when the current call does not set one
+        deadline (float | None): Default deadline of calls, counted from the start of the current call
+    Returns:
+        float | tuple[float, float] | None: Timeout to pass to the HTTP library
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    scope = _scope.get()
+    timeout = default if scope is None or scope.timeout is None else scope.timeout
+    remaining = remaining_time(deadline)
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline exceeded before the request could be sent")
+    if isinstance(timeout, tuple):
+        return tuple(_clamp(value, remaining) for value in timeout)
+    return _clamp(timeout, remaining)
+
+
+def deadline_passed() -> bool:
+    """Whether the deadline of the current call, if any, has passed."""
+    scope = _scope.get()
+    remaining = scope.remaining() if scope is not None else None
+    return remaining is not None and remaining <= 0
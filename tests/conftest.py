@@ -33,3 +33,31 @@ def test_portfolio():
 def test_portfolio_base():
     """Get base portfolio ID for tickers API."""
     return "momentum_enhanced"
+
+
+@pytest.fixture()
+def mock_server():
+    """Start a local server emulating the Unravel API."""
+    from .mock_server import MockUnravelServer
+
+    server = MockUnravelServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture()
+def mock_client(mock_server):
+    """Route the module-level endpoint functions to the local mock server."""
+    from unravel_client.client import UnravelClient, set_client
+
+    client = UnravelClient(base_url=mock_server.base_url)
+    previous = set_client(client)
+    yield client
+    set_client(previous)
+    client.close()
+
+
+@pytest.fixture()
+def _no_retry_wait(monkeypatch):
+    """Skip the waits between retries of failing requests."""
+    monkeypatch.setattr("unravel_client.decorators.time.sleep", lambda _: None)
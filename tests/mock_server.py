@@ -0,0 +1,360 @@
+"""
+Local stand-in for the Unravel API, used by the offline tests.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import random
+import threading
+import zlib
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+API_PREFIX = "/api/v1/"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PARQUET = "application/vnd.apache.parquet"
+
+
+def _dates(params: dict, periods: int) -> list[str]:
+    start = params.get("start_date", "2024-01-01")
+    index = pd.date_range(start, periods=periods, freq="D")
+    if "end_date" in params:
+        index = index[index <= pd.Timestamp(params["end_date"])]
+    return [d.strftime("%Y-%m-%d") for d in index]
+
+
+def _symbols(width: int) -> list[str]:
+    symbols = ["BTC", "ETH", "SOL"]
+    return symbols[:width] + [f"T{i:04d}" for i in range(len(symbols), width)]
+
+
+def _frame(params: dict, columns: list[str], periods: int) -> dict:
+    index = _dates(params, periods)
+    rng = np.random.default_rng(len(index) * 31 + len(columns))
+    data = rng.normal(size=(len(index), len(columns))).round(6).tolist()
+    return {"index": index, "columns": columns, "data": data}
+
+
+def _series(params: dict, periods: int, width: int) -> dict:
+    index = _dates(params, periods)
+    rng = np.random.default_rng(len(index))
+    return {"index": index, "data": rng.normal(size=len(index)).round(6).tolist()}
+
+
+def _tickers(params: dict, key: str) -> list[str]:
+    return [t for t in params.get(key, "BTC,ETH").split(",") if t]
+
+
+def _price(params: dict, periods: int, width: int) -> dict:
+    tickers = _tickers(params, "ticker")
+    if len(tickers) == 1:
+        return _series(params, periods, width)
+    return _frame(params, tickers, periods)
+
+
+def _universe(params: dict, periods: int, width: int) -> dict:
+    payload = _frame(params, _symbols(width), periods)
+    payload["data"] = [
+        [value if value > 0 else None for value in row] for row in payload["data"]
+    ]
+    return payload
+
+
+def _live_row(columns: list[str], periods: int) -> dict:
+    payload = _frame({}, columns, periods)
+    return {
+        "index": payload["index"][-1],
+        "columns": columns,
+        "data": payload["data"][-1],
+    }
+
+
+def _live_value(params: dict, periods: int, width: int) -> dict:
+    return {"index": "2024-01-10", "data": 0.5}
+
+
+# Every route takes the query parameters, the number of dates and the number of
+# tickers of the payloads to generate.
+ROUTES = {
+    "price": _price,
+    "portfolio/factors": lambda p, n, _: _frame(p, _tickers(p, "tickers"), n),
+    "portfolio/factors-live": lambda p, n, _: _live_row(_tickers(p, "tickers"), n),
+    "portfolio/historical-weights": lambda p, n, w: _frame(p, _symbols(w), n),
+    "portfolio/live-weights": lambda _, n, w: _live_row(_symbols(w), n),
+    "portfolio/returns": _series,
+    "portfolio/risk-overlay": _series,
+    "portfolio/risk-overlay-live": _live_value,
+    "risk-regime": _series,
+    "risk-regime-live": _live_value,
+    "portfolio/tickers": lambda _, __, w: {"tickers": _symbols(w)},
+    "portfolio/universe": _universe,
+}
+
+
+def _table(payload: dict):
+    import pyarrow as pa
+
+    index = pd.to_datetime(payload["index"]).values.astype("datetime64[D]")
+    values = np.array(payload["data"], dtype=float)
+    if "columns" not in payload:
+        return pa.table({"index": index, "data": values})
+    values = values.reshape(len(index), len(payload["columns"]))
+    columns = {"index": index}
+    columns.update({name: values[:, i] for i, name in enumerate(payload["columns"])})
+    return pa.table(columns)
+
+
+def encode_table(payload: dict, media_type: str) -> bytes:
+    """Serialize a tabular JSON payload as an Arrow IPC stream or a Parquet file."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = _table(payload)
+    sink = pa.BufferOutputStream()
+    if media_type == ARROW_STREAM:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, sink)
+    return sink.getvalue().to_pybytes()
+
+
+def _encoders() -> dict:
+    encoders = {"gzip": gzip.compress, "deflate": zlib.compress}
+    try:
+        import brotli
+
+        encoders["br"] = brotli.compress
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        # Compressors are not thread-safe, the server handles requests concurrently.
+        encoders["zstd"] = lambda body: zstandard.ZstdCompressor().compress(body)
+    except ImportError:
+        pass
+    return encoders
+
+
+ENCODERS = _encoders()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Concurrent clients open many connections at once, the default backlog of 5
+    # drops some of them and their SYN is only retransmitted after a second.
+    request_queue_size = 128
+
+
+class MockUnravelServer:
+    """
+    Threaded HTTP server emulating the ``/api/v1`` routes used by the client.
+
+    Every request is recorded in ``requests`` as a ``(path, params, headers)`` tuple
+    and every accepted TCP connection increments ``connections``. Responses are
+    delayed by ``latency`` seconds. Portfolio ids starting with ``unknown`` get a 404,
+    those starting with ``failing`` a 503, and any request fails with a 503 with
+    probability ``error_rate``.
+
+    Payloads span ``periods`` dates (from ``start_date``) and portfolio payloads hold
+    ``width`` tickers. Generated payloads and encoded bodies are cached, so that the
+    server adds as little time as possible to benchmarked calls.
+
+    Tabular payloads are served as Arrow IPC or Parquet when the ``Accept`` header
+    asks for one of the ``binary_formats``. Bodies are compressed with the first
+    coding of the ``Accept-Encoding`` header that is listed in ``encodings``.
+
+    With ``validators`` enabled, payloads carry an ``ETag`` and requests presenting it
+    in ``If-None-Match`` are answered with ``304 Not Modified``.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        binary_formats: tuple[str, ...] = (ARROW_STREAM, PARQUET),
+        encodings: tuple[str, ...] = tuple(ENCODERS),
+        validators: bool = True,
+        periods: int = 10,
+        width: int = 3,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.periods = periods
+        self.width = width
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._cache: dict[tuple, object] = {}
+        self.binary_formats = binary_formats
+        self.encodings = encodings
+        self.validators = validators
+        self.requests: list[tuple[str, dict, dict]] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler_class())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, without TCP_NODELAY small
+            # responses wait for the delayed ACK of the client (~40ms).
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                path = parsed.path[len(API_PREFIX) :]
+                with server._lock:
+                    server.requests.append((path, params, dict(self.headers)))
+                server.handle(self, path, params)
+
+        return Handler
+
+    def handle(self, handler: BaseHTTPRequestHandler, path: str, params: dict):
+        handler.etag = None
+        if self.latency:
+            time.sleep(self.latency)
+        route = ROUTES.get(path)
+        if route is None:
+            self.send_json(handler, 404, {"error": f"Unknown route {path}"})
+            return
+        if params.get("portfolio", "").startswith("unknown"):
+            self.send_json(handler, 404, {"error": "Portfolio not found"})
+            return
+        if params.get("portfolio", "").startswith("failing") or self._fails():
+            self.send_json(handler, 503, {"error": "Service unavailable"})
+            return
+        key = (path, tuple(sorted(params.items())), self.periods, self.width)
+        payload, body = self._cached(key, lambda: self._render(route, params))
+        if self.validators:
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            handler.etag = etag
+            if handler.headers.get("If-None-Match") == etag:
+                handler.send_response(304)
+                handler.send_header("ETag", etag)
+                handler.end_headers()
+                return
+        accept = handler.headers.get("Accept", "")
+        if isinstance(payload.get("index"), list):
+            for media_type in self.binary_formats:
+                if media_type in accept:
+                    table = self._cached(
+                        (*key, media_type),
+                        lambda media_type=media_type: encode_table(payload, media_type),
+                    )
+                    self.send_body(handler, 200, media_type, table, key=key)
+                    return
+        self.send_body(handler, 200, "application/json", body, key=key)
+
+    def _render(self, route, params: dict) -> tuple[dict, bytes]:
+        payload = route(params, self.periods, self.width)
+        return payload, json.dumps(payload, sort_keys=True).encode()
+
+    def _fails(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def _cached(self, key: tuple, build):
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        value = build()
+        with self._lock:
+            self._cache[key] = value
+        return value
+
+    def send_json(self, handler: BaseHTTPRequestHandler, status: int, payload):
+        self.send_body(
+            handler, status, "application/json", json.dumps(payload).encode()
+        )
+
+    def send_body(
+        self,
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        content_type: str,
+        body: bytes,
+        key: tuple | None = None,
+    ):
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        if getattr(handler, "etag", None):
+            handler.send_header("ETag", handler.etag)
+        accepted = handler.headers.get("Accept-Encoding", "").split(",")
+        for encoding in (e.strip() for e in accepted):
+            if encoding in self.encodings and encoding in ENCODERS:
+                if key is None:
+                    body = ENCODERS[encoding](body)
+                else:
+                    body = self._cached(
+                        (*key, content_type, encoding),
+                        lambda body=body, encoding=encoding: ENCODERS[encoding](body),
+                    )
+                handler.send_header("Content-Encoding", encoding)
+                break
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def serve_forever(self) -> None:
+        """Serve requests from the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def start(self) -> MockUnravelServer:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--periods", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockUnravelServer(
+        port=args.port,
+        latency=args.latency,
+        periods=args.periods,
+        width=args.width,
+        error_rate=args.error_rate,
+    )
+    print(f"Serving the mock Unravel API at {server.base_url}")
+    server.serve_forever()
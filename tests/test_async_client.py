@@ -0,0 +1,96 @@
+"""
+Tests for the asyncio client, run against the local mock server.
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+import requests
+from unravel_client import AsyncUnravelClient, __all__
+
+
+def test_async_client_mirrors_every_endpoint():
+    """Every exported endpoint function should have an async counterpart."""
+    endpoints = [name for name in __all__ if name.startswith("get_")]
+    endpoints.remove("get_client")
+    assert len(endpoints) == 15
+    for name in endpoints:
+        assert asyncio.iscoroutinefunction(getattr(AsyncUnravelClient, name)), name
+
+
+def test_async_client_endpoints(mock_server):
+    """Async endpoints should return the same types as their sync versions."""
+
+    async def run():
+        async with AsyncUnravelClient(base_url=mock_server.base_url) as client:
+            return await asyncio.gather(
+                client.get_portfolio_historical_weights("momentum.20", "key"),
+                client.get_live_weights("momentum.20", "key", as_of="close"),
+                client.get_portfolio_factors_live("momentum", ["BTC", "ETH"], "key"),
+                client.get_risk_overlay_live("momentum", "trend", "key"),
+                client.get_prices(["BTC"], "key"),
+                client.get_tickers("momentum", "key", universe_size=20),
+            )
+
+    weights, live, factors, overlay, prices, tickers = asyncio.run(run())
+
+    assert isinstance(weights, pd.DataFrame)
+    assert isinstance(weights.index, pd.DatetimeIndex)
+    assert isinstance(live, pd.Series)
+    assert list(factors.index) == ["BTC", "ETH"]
+    assert len(overlay) == 1
+    assert list(prices.columns) == ["BTC"]
+    assert tickers == ["BTC", "ETH", "SOL"]
+
+
+def test_async_client_bounds_concurrency(mock_server):
+    """Fanned out requests should share a bounded connection pool."""
+
+    async def run():
+        async with AsyncUnravelClient(
+            base_url=mock_server.base_url, max_concurrency=2
+        ) as client:
+            return await asyncio.gather(
+                *(client.get_portfolio_returns(f"p{i}", "key") for i in range(20))
+            )
+
+    results = asyncio.run(run())
+
+    assert len(results) == 20
+    assert len(mock_server.requests) == 20
+    assert mock_server.connections <= 2
+
+
+def test_async_client_raises_http_error(mock_server):
+    """Error responses should raise the same exception as the sync client."""
+
+    async def run():
+        async with AsyncUnravelClient(base_url=mock_server.base_url) as client:
+            await client.fetch("unknown", "key", {}, lambda payload: payload)
+
+    with pytest.raises(requests.HTTPError, match="404"):
+        asyncio.run(run())
+
+
+def test_async_history_cache_serializes_fills(mock_server, tmp_path):
+    """Concurrent calls on the same cache entry should fill it one after the other."""
+
+    async def run():
+        async with AsyncUnravelClient(
+            base_url=mock_server.base_url, history_cache=tmp_path, coalesce=False
+        ) as client:
+            return await asyncio.gather(
+                *(
+                    client.get_portfolio_returns(
+                        "momentum.20", "key", start_date="2024-01-01"
+                    )
+                    for _ in range(3)
+                )
+            )
+
+    results = asyncio.run(run())
+
+    starts = [params["start_date"] for _, params, _ in mock_server.requests]
+    assert starts.count("2024-01-01") == 1
+    assert all(result.index.is_unique for result in results)
@@ -0,0 +1,149 @@
+"""
+Tests for the vectorized backtest engine.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from unravel_client import (
+    BacktestResult,
+    apply_overlay,
+    backtest,
+    backtest_overlays,
+    get_portfolio_historical_weights_batch,
+    get_prices,
+    get_risk_overlay,
+)
+from unravel_client.backtesting import simulate
+
+DATES = pd.date_range("2024-01-01", periods=5)
+PRICES = pd.DataFrame(
+    {"BTC": [100.0, 110.0, 99.0, 99.0, 108.9], "ETH": [10.0, 10.0, 11.0, 12.1, None]},
+    index=DATES,
+)
+WEIGHTS = pd.DataFrame(
+    {"BTC": [1.0, 0.5], "ETH": [0.0, -0.5]},
+    index=pd.to_datetime(["2024-01-01", "2024-01-03"]),
+)
+
+
+def test_backtest_single_portfolio():
+    """Weights should earn the next day's returns and pay costs on the traded weight."""
+    result = backtest(WEIGHTS, PRICES, cost=0.001)
+
+    assert isinstance(result, BacktestResult)
+    np.testing.assert_allclose(result.gross_returns, [0.0, 0.1, -0.1, -0.05, 0.05])
+    np.testing.assert_allclose(result.turnover, [0.0, 1.0, 0.0, 1.0, 0.0])
+    np.testing.assert_allclose(result.costs, [0.0, 0.001, 0.0, 0.001, 0.0])
+    np.testing.assert_allclose(result.returns, result.gross_returns - result.costs)
+    assert result.returns.index.equals(DATES)
+
+
+def test_backtest_lag():
+    """Without lag weights earn the returns of their own date, a longer lag delays them."""
+    same_day = backtest(WEIGHTS, PRICES, lag=0)
+    delayed = backtest(WEIGHTS, PRICES, lag=2)
+
+    np.testing.assert_allclose(same_day.gross_returns, [0.0, 0.1, -0.1, -0.05, 0.05])
+    np.testing.assert_allclose(delayed.gross_returns, [0.0, 0.0, -0.1, 0.0, 0.05])
+    with pytest.raises(ValueError, match="lag"):
+        backtest(WEIGHTS, PRICES, lag=-1)
+
+
+def test_backtest_batch_matches_single():
+    """A batch should give every portfolio the result of its own backtest."""
+    batch = {"a": WEIGHTS, "b": -2 * WEIGHTS[["BTC"]]}
+    costs = pd.Series({"BTC": 0.001, "ETH": 0.002})
+
+    result = backtest(batch, PRICES, cost=costs)
+
+    assert list(result.returns.columns) == ["a", "b"]
+    for key, weights in batch.items():
+        single = backtest(weights, PRICES, cost=costs)
+        np.testing.assert_allclose(result.returns[key], single.returns)
+        np.testing.assert_allclose(result.turnover[key], single.turnover)
+
+
+def test_simulate_shapes():
+    """The NumPy core should accept one portfolio or a 3-D block of them."""
+    rng = np.random.default_rng(0)
+    weights = rng.normal(size=(4, 50, 3))
+    returns = rng.normal(scale=0.01, size=(50, 3))
+
+    gross, turnover, costs = simulate(weights, returns, lag=1, cost=0.001)
+    single = simulate(weights[2], returns, lag=1, cost=0.001)
+
+    assert gross.shape == turnover.shape == costs.shape == (4, 50)
+    np.testing.assert_allclose(gross[2], single[0])
+    np.testing.assert_allclose(
+        gross[:, 1:], (weights[:, :-1] * returns[1:]).sum(axis=2)
+    )
+    with pytest.raises(ValueError, match="shape"):
+        simulate(weights, returns[:, :2])
+
+
+def test_backtest_fetched_batch(mock_server, mock_client):
+    """Weights of a batch fetch should be backtested as one block."""
+    ids = ["momentum.20", "carry.20"]
+    weights = get_portfolio_historical_weights_batch(ids, api_key="key").to_frame()
+    prices = get_prices(["BTC", "ETH", "SOL"], api_key="key")
+
+    result = backtest(weights, prices)
+
+    assert list(result.returns.columns) == ids
+    assert result.returns.index.equals(prices.index)
+    assert np.isfinite(result.returns.to_numpy()).all()
+
+
+OVERLAY = pd.Series([0.5, 0.0], index=pd.to_datetime(["2024-01-02", "2024-01-04"]))
+
+
+def test_apply_overlay_forward_fills():
+    """Scalers should be forward-filled on the weight dates, leaving earlier dates unscaled."""
+    weights = WEIGHTS.reindex(DATES, method="ffill")
+
+    scaled = apply_overlay(weights, OVERLAY)
+
+    np.testing.assert_allclose(scaled["BTC"], [1.0, 0.5, 0.25, 0.0, 0.0])
+    many = apply_overlay(weights, {"half": OVERLAY, "full": OVERLAY * 0 + 1})
+    assert list(many.columns.get_level_values("overlay").unique()) == ["half", "full"]
+    pd.testing.assert_frame_equal(many["half"], scaled, check_names=False)
+    pd.testing.assert_frame_equal(many["full"], weights, check_names=False)
+
+
+def test_backtest_overlays_matches_scaled_backtests():
+    """Every (portfolio, overlay) combination should match the backtest of its scaled weights."""
+    batch = {"a": WEIGHTS, "b": -2 * WEIGHTS}
+    overlays = pd.DataFrame({"half": OVERLAY, "double": OVERLAY * 4})
+
+    result = backtest_overlays(batch, PRICES, overlays, cost=0.001)
+
+    assert result.returns.columns.names == ["id", "overlay"]
+    assert len(result.returns.columns) == 4
+    for key, weights in batch.items():
+        daily = weights.reindex(DATES, method="ffill")
+        for overlay in overlays:
+            expected = backtest(
+                apply_overlay(daily, overlays[overlay]), PRICES, cost=0.001
+            )
+            np.testing.assert_allclose(result.returns[key, overlay], expected.returns)
+            np.testing.assert_allclose(result.turnover[key, overlay], expected.turnover)
+
+
+def test_backtest_overlays_single_portfolio(mock_server, mock_client):
+    """Fetched overlays should key the columns of a single portfolio's results."""
+    prices = get_prices(["BTC", "ETH", "SOL"], api_key="key").abs() + 1
+    overlays = {
+        name: get_risk_overlay("momentum.20", name, api_key="key").abs()
+        for name in ["conservative", "aggressive"]
+    }
+    weights = pd.DataFrame(1 / 3, index=prices.index, columns=["BTC", "ETH", "SOL"])
+
+    result = backtest_overlays(weights, prices, overlays)
+
+    assert list(result.returns.columns) == ["conservative", "aggressive"]
+    assert result.returns.columns.name == "overlay"
+    single = backtest_overlays(weights, prices, overlays["aggressive"])
+    pd.testing.assert_series_equal(
+        single.returns, result.returns["aggressive"], check_names=False
+    )
@@ -0,0 +1,83 @@
+"""
+Tests for fetching several portfolios in one batch.
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+import requests
+from unravel_client import (
+    AsyncUnravelClient,
+    get_portfolio_historical_weights_batch,
+    get_portfolio_returns_batch,
+)
+
+IDS = ["momentum.20", "momentum_enhanced.40", "carry.20"]
+
+
+def test_returns_batch_to_frame(mock_server, mock_client):
+    """Every id should be fetched and become one column of the panel."""
+    result = get_portfolio_returns_batch(IDS, api_key="key")
+
+    assert result.ok
+    assert list(result.data) == IDS
+    frame = result.to_frame()
+    assert list(frame.columns) == IDS
+    assert frame.columns.names == ["id"]
+    assert isinstance(frame.index, pd.DatetimeIndex)
+    sent = sorted(params["portfolio"] for _, params, _ in mock_server.requests)
+    assert sent == sorted(IDS)
+
+
+def test_historical_weights_batch_multiindex(mock_server, mock_client):
+    """Weights should be combined into (id, ticker) columns."""
+    frame = get_portfolio_historical_weights_batch(IDS, api_key="key").to_frame()
+
+    assert frame.columns.names == ["id", "ticker"]
+    assert list(frame.columns.get_level_values("id").unique()) == IDS
+    assert list(frame["carry.20"].columns) == ["BTC", "ETH", "SOL"]
+
+
+def test_batch_combinations(mock_server, mock_client):
+    """Lists of options should be expanded into every combination."""
+    result = get_portfolio_returns_batch(
+        ["momentum.20"], api_key="key", smoothing=["0", "10"], exchange="binance"
+    )
+
+    assert list(result.data) == [
+        ("momentum.20", "0", "binance"),
+        ("momentum.20", "10", "binance"),
+    ]
+    assert result.to_frame().columns.names == ["id", "smoothing", "exchange"]
+
+
+@pytest.mark.usefixtures("_no_retry_wait")
+def test_batch_reports_errors_per_item(mock_server, mock_client):
+    """A failing id should be reported without aborting the rest of the batch."""
+    result = get_portfolio_returns_batch(["unknown.20", *IDS], api_key="key")
+
+    assert not result.ok
+    assert list(result.data) == IDS
+    assert isinstance(result.errors["unknown.20"], requests.HTTPError)
+    assert "Portfolio not found" in str(result.errors["unknown.20"])
+
+
+def test_async_batch(mock_server, monkeypatch):
+    """The async client should batch the same way."""
+
+    async def no_wait(_):
+        pass
+
+    monkeypatch.setattr("unravel_client.decorators.asyncio.sleep", no_wait)
+
+    async def run():
+        async with AsyncUnravelClient(base_url=mock_server.base_url) as client:
+            return await client.get_portfolio_historical_weights_batch(
+                ["unknown.20", *IDS], "key"
+            )
+
+    result = asyncio.run(run())
+
+    assert list(result.data) == IDS
+    assert list(result.errors) == ["unknown.20"]
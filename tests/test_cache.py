@@ -0,0 +1,253 @@
+"""
+Tests for the client-side caches, run against the local mock server.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+from unravel_client import (
+    AsyncUnravelClient,
+    get_historical_universe,
+    get_live_weights,
+    get_portfolio_historical_weights,
+    get_portfolio_returns,
+    get_price,
+    get_prices,
+    get_risk_regime,
+    get_risk_regime_live,
+)
+from unravel_client.cache import ConditionalCache, HistoryCache, LiveCache
+from unravel_client.client import UnravelClient, set_client
+
+
+@pytest.fixture()
+def history_client(mock_server, tmp_path):
+    """Default client backed by an on-disk history cache."""
+    client = UnravelClient(base_url=mock_server.base_url, history_cache=tmp_path)
+    previous = set_client(client)
+    yield client
+    set_client(previous)
+    client.close()
+
+
+def test_history_cache_only_requests_missing_tail(mock_server, history_client):
+    """A repeated call should only request dates after the last cached one."""
+    first = get_portfolio_historical_weights(
+        id="momentum.20", api_key="key", start_date="2024-01-01"
+    )
+    assert first.index.max() == pd.Timestamp("2024-01-10")
+
+    second = get_portfolio_historical_weights(
+        id="momentum.20", api_key="key", start_date="2024-01-01"
+    )
+    _, params, _ = mock_server.requests[-1]
+    assert params["start_date"] == "2024-01-10"
+    assert second.index.min() == pd.Timestamp("2024-01-01")
+    assert second.index.max() == pd.Timestamp("2024-01-19")
+    assert second.index.is_unique
+    pd.testing.assert_frame_equal(second.loc[:"2024-01-09"], first.loc[:"2024-01-09"])
+
+
+def test_history_cache_serves_past_ranges_without_requests(mock_server, history_client):
+    """Date ranges that are fully cached should not hit the API."""
+    get_portfolio_returns(id="momentum.20", api_key="key", start_date="2024-01-01")
+    requests_sent = len(mock_server.requests)
+
+    result = get_portfolio_returns(
+        id="momentum.20",
+        api_key="key",
+        start_date="2024-01-03",
+        end_date="2024-01-05",
+    )
+
+    assert len(mock_server.requests) == requests_sent
+    assert result.name == "returns"
+    assert list(result.index) == list(pd.date_range("2024-01-03", "2024-01-05"))
+
+
+def test_history_cache_refetches_earlier_start(mock_server, history_client):
+    """Requesting dates before the cached range should fetch the full range."""
+    get_prices(tickers=["BTC", "ETH"], api_key="key", start_date="2024-01-05")
+    get_prices(tickers=["BTC", "ETH"], api_key="key", start_date="2024-01-01")
+
+    _, params, _ = mock_server.requests[-1]
+    assert params["start_date"] == "2024-01-01"
+
+
+def test_history_cache_keys_ignore_date_range(tmp_path):
+    """Cache keys should depend on the endpoint and parameters, not on dates."""
+    cache = HistoryCache(tmp_path)
+    key = cache.key("portfolio/returns", {"portfolio": "momentum.20"})
+
+    assert key == cache.key(
+        "portfolio/returns", {"portfolio": "momentum.20", "start_date": "2024-01-01"}
+    )
+    assert key != cache.key("portfolio/returns", {"portfolio": "momentum.40"})
+    assert key != cache.key("risk-regime", {"portfolio": "momentum.20"})
+    assert key != cache.key("portfolio/returns", {"portfolio": "momentum.20"}, "other")
+
+
+def test_history_cache_ignores_data_replaced_after_its_metadata(tmp_path):
+    """Data rewritten without its metadata should be treated as missing."""
+    cache = HistoryCache(tmp_path)
+    params = {"portfolio": "momentum.20"}
+    series = pd.Series([1.0, 2.0], index=pd.date_range("2024-01-01", periods=2))
+    plan = cache.lookup("portfolio/returns", params, "key")
+    cache.update(plan, series)
+
+    assert cache.lookup("portfolio/returns", params, "key").cached is not None
+    assert list(tmp_path.glob("*.tmp")) == []
+
+    series.iloc[:1].to_frame(name="values").to_parquet(tmp_path / f"{plan.key}.parquet")
+    assert cache.lookup("portfolio/returns", params, "key").cached is None
+
+
+@pytest.fixture()
+def live_client(mock_server):
+    """Default client backed by an in-memory live cache."""
+    client = UnravelClient(
+        base_url=mock_server.base_url, live_cache=LiveCache(maxsize=2)
+    )
+    previous = set_client(client)
+    yield client
+    set_client(previous)
+    client.close()
+
+
+def test_live_cache_serves_repeated_calls(mock_server, live_client):
+    """Identical live calls should be answered from memory and counted."""
+    first = get_live_weights(id="momentum.20", api_key="key", as_of="close")
+    first["BTC"] = 100.0
+    second = get_live_weights(id="momentum.20", api_key="key", as_of="close")
+    get_risk_regime_live(overlay="trend", api_key="key", as_of="close")
+
+    assert len(mock_server.requests) == 2
+    assert second["BTC"] != 100.0
+    assert live_client.live_cache.stats() == {"hits": 1, "misses": 2, "size": 2}
+
+
+def test_live_cache_keys_include_as_of(mock_server, live_client):
+    """Values fetched with different as_of should be cached separately."""
+    get_live_weights(id="momentum.20", api_key="key", as_of="close")
+    get_live_weights(id="momentum.20", api_key="key", as_of="latest")
+
+    assert len(mock_server.requests) == 2
+
+
+def test_live_cache_evicts_least_recently_used():
+    """The least recently used entry should be evicted once the cache is full."""
+    cache = LiveCache(maxsize=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+
+
+def test_live_cache_expires_entries():
+    """Entries should not be served after their TTL."""
+    cache = LiveCache()
+    cache.set("a", 1, ttl=0)
+
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+def test_live_cache_ttl_depends_on_as_of():
+    """Close values should live until the next daily close, others only briefly."""
+    cache = LiveCache(latest_ttl=15, close_hour=0)
+    now = datetime(2024, 1, 1, 18, 0, tzinfo=timezone.utc)
+
+    assert cache.ttl("latest", now) == 15
+    assert cache.ttl(None, now) == 15
+    assert cache.ttl("close", now) == 6 * 3600
+
+
+@pytest.fixture()
+def conditional_client(mock_server):
+    """Default client revalidating results with conditional requests."""
+    client = UnravelClient(base_url=mock_server.base_url, conditional_cache=True)
+    previous = set_client(client)
+    yield client
+    set_client(previous)
+    client.close()
+
+
+def test_conditional_cache_reuses_not_modified_results(mock_server, conditional_client):
+    """A 304 answer should return the previously parsed result."""
+    first = get_risk_regime(overlay="trend", api_key="key")
+    second = get_risk_regime(overlay="trend", api_key="key")
+
+    (_, _, first_headers), (_, _, second_headers) = mock_server.requests
+    assert "If-None-Match" not in first_headers
+    assert second_headers["If-None-Match"].startswith('"')
+    pd.testing.assert_series_equal(first, second)
+    assert conditional_client.conditional_cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "size": 1,
+    }
+    stats = conditional_client.transfer_stats.snapshot()["risk-regime"]
+    assert stats["calls"] == 2
+
+
+def test_conditional_cache_separates_parsers(mock_server, conditional_client):
+    """A request parsed in different ways should revalidate each result separately."""
+    get_price("BTC", "key")
+    get_prices(["BTC"], "key")
+    price = get_price("BTC", "key")
+    prices = get_prices(["BTC"], "key")
+
+    assert isinstance(price, pd.Series)
+    assert isinstance(prices, pd.DataFrame)
+    assert conditional_client.conditional_cache.stats()["hits"] == 2
+
+
+def test_conditional_cache_returns_copies(mock_server, conditional_client):
+    """Mutating a revalidated result should not corrupt the cache."""
+    first = get_historical_universe("20", "key", "2024-01-01", "2024-01-10")
+    first.iloc[:, :] = False
+    second = get_historical_universe("20", "key", "2024-01-01", "2024-01-10")
+
+    assert second.to_numpy().any()
+
+
+def test_conditional_cache_ignores_responses_without_validators():
+    """Results served without ETag or Last-Modified should not be stored."""
+    cache = ConditionalCache()
+    cache.set("key", {"Content-Type": "application/json"}, 1)
+    assert cache.headers("key") == {}
+
+    cache.set(
+        "key", {"etag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, 1
+    )
+    assert cache.headers("key") == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert cache.get("key") == (True, 1)
+
+
+def test_async_conditional_cache(mock_server):
+    """The async client should revalidate the same way."""
+
+    async def run():
+        async with AsyncUnravelClient(
+            base_url=mock_server.base_url, conditional_cache=True
+        ) as client:
+            first = await client.get_risk_regime("trend", "key")
+            second = await client.get_risk_regime("trend", "key")
+            await client.get_price("BTC", "key")
+            prices = await client.get_prices(["BTC"], "key")
+            return first, second, prices, client.conditional_cache.stats()
+
+    first, second, prices, stats = asyncio.run(run())
+
+    pd.testing.assert_series_equal(first, second)
+    assert isinstance(prices, pd.DataFrame)
+    assert stats["hits"] == 1
@@ -0,0 +1,216 @@
+"""
+Tests for the circuit breaker.
+"""
+
+import asyncio
+
+import pytest
+import requests
+from unravel_client import (
+    AsyncUnravelClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    UnravelClient,
+    get_portfolio_returns,
+    set_client,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fail(breaker, key, times):
+    for _ in range(times):
+        breaker.before(key)
+        breaker.record(key, failed=True)
+
+
+def test_opens_once_failure_share_reaches_threshold():
+    """The circuit should stay closed until enough calls failed."""
+    breaker = CircuitBreaker(failure_threshold=0.5, window=10, min_calls=4)
+    breaker.before("returns")
+    breaker.record("returns", failed=False)
+    _fail(breaker, "returns", 2)
+    assert breaker.states()["returns"]["state"] == "closed"
+
+    _fail(breaker, "returns", 1)
+
+    assert breaker.states()["returns"]["state"] == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before("returns")
+
+
+def test_circuits_are_independent_per_endpoint():
+    """A failing endpoint should not block the others."""
+    breaker = CircuitBreaker(min_calls=2)
+    _fail(breaker, "portfolio/returns", 2)
+
+    breaker.before("portfolio/historical-weights")
+    with pytest.raises(CircuitOpenError):
+        breaker.before("portfolio/returns")
+
+
+def test_half_open_probe_closes_or_reopens():
+    """After the reset timeout a single probe decides whether the circuit closes."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(min_calls=2, reset_timeout=10, clock=clock)
+    _fail(breaker, "returns", 2)
+
+    clock.now = 5.0
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before("returns")
+    assert excinfo.value.retry_in == pytest.approx(5.0)
+
+    clock.now = 10.0
+    breaker.before("returns")
+    assert breaker.states()["returns"]["state"] == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before("returns")
+    breaker.record("returns", failed=True)
+    assert breaker.states()["returns"]["state"] == "open"
+
+    clock.now = 20.0
+    breaker.before("returns")
+    breaker.record("returns", failed=False)
+    assert breaker.states()["returns"] == {
+        "state": "closed",
+        "calls": 0,
+        "failures": 0,
+        "retry_in": 0.0,
+    }
+
+
+def test_per_host_key():
+    """With per="host" every path of the API shares one circuit."""
+    breaker = CircuitBreaker(per="host")
+
+    assert breaker.key("https://unravel.finance/api/v1", "/portfolio/returns") == (
+        "unravel.finance"
+    )
+    assert breaker.key("https://unravel.finance/api/v1", "risk/regime") == (
+        "unravel.finance"
+    )
+    with pytest.raises(ValueError, match="per must be"):
+        CircuitBreaker(per="portfolio")
+
+
+@pytest.mark.usefixtures("_no_retry_wait")
+def test_client_fails_fast_once_open(mock_server):
+    """Once open, calls should raise without reaching the server."""
+    client = UnravelClient(
+        base_url=mock_server.base_url,
+        circuit_breaker=CircuitBreaker(min_calls=3, reset_timeout=60),
+    )
+    previous = set_client(client)
+    try:
+        with pytest.raises(requests.HTTPError, match="503"):
+            get_portfolio_returns("failing.20", "key")
+        assert len(mock_server.requests) == 3
+
+        with pytest.raises(CircuitOpenError):
+            get_portfolio_returns("momentum.20", "key")
+    finally:
+        set_client(previous)
+        client.close()
+
+    assert len(mock_server.requests) == 3
+    assert client.circuit_breaker.states()["portfolio/returns"]["state"] == "open"
+
+
+@pytest.mark.usefixtures("_no_retry_wait")
+def test_client_errors_do_not_open_the_circuit(mock_server):
+    """A 404 is the caller's fault, not a sign of a degraded API."""
+    client = UnravelClient(
+        base_url=mock_server.base_url, circuit_breaker=CircuitBreaker(min_calls=1)
+    )
+    previous = set_client(client)
+    try:
+        for _ in range(3):
+            with pytest.raises(requests.HTTPError, match="404"):
+                get_portfolio_returns("unknown.20", "key")
+        get_portfolio_returns("momentum.20", "key")
+    finally:
+        set_client(previous)
+        client.close()
+
+    assert client.circuit_breaker.states()["portfolio/returns"]["failures"] == 0
+
+
+def test_async_client_fails_fast_once_open(mock_server, monkeypatch):
+    """The async client should share the same breaker semantics."""
+
+    async def no_sleep(_):
+        return None
+
+    monkeypatch.setattr("unravel_client.decorators.asyncio.sleep", no_sleep)
+
+    async def run():
+        async with AsyncUnravelClient(
+            base_url=mock_server.base_url,
+            circuit_breaker=CircuitBreaker(min_calls=3),
+        ) as client:
+            with pytest.raises(requests.HTTPError, match="503"):
+                await client.get_portfolio_returns("failing.20", "key")
+            with pytest.raises(CircuitOpenError):
+                await client.get_portfolio_returns("momentum.20", "key")
+
+    asyncio.run(run())
+
+    assert len(mock_server.requests) == 3
+
+
+def test_cancelled_probe_releases_its_slot(mock_server, monkeypatch):
+    """A probe cancelled before its response arrives should not block later probes."""
+
+    async def no_sleep(_):
+        return None
+
+    monkeypatch.setattr("unravel_client.decorators.asyncio.sleep", no_sleep)
+    clock = FakeClock()
+
+    async def run():
+        async with AsyncUnravelClient(
+            base_url=mock_server.base_url,
+            circuit_breaker=CircuitBreaker(min_calls=3, reset_timeout=10, clock=clock),
+            # Coalesced calls run in a shielded task that cancelling would not reach.
+            coalesce=False,
+        ) as client:
+            with pytest.raises(requests.HTTPError, match="503"):
+                await client.get_portfolio_returns("failing.20", "key")
+            clock.now = 11.0
+            mock_server.latency = 1.0
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    client.get_portfolio_returns("momentum.20", "key"), 0.3
+                )
+            mock_server.latency = 0.0
+            await client.get_portfolio_returns("momentum.20", "key")
+            return client.circuit_breaker.states()["portfolio/returns"]["state"]
+
+    assert asyncio.run(run()) == "closed"
+
+
+def test_interrupted_probe_releases_its_slot(mock_server, monkeypatch):
+    """The sync client should give back the probe slot on KeyboardInterrupt as well."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(min_calls=1, reset_timeout=10, clock=clock)
+    client = UnravelClient(base_url=mock_server.base_url, circuit_breaker=breaker)
+    _fail(breaker, "portfolio/returns", 1)
+    clock.now = 11.0
+
+    def interrupt(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patch:
+        patch.setattr(client.session, "get", interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            client.get("portfolio/returns", "key", {"id": "momentum.20"})
+    client.get("portfolio/returns", "key", {"id": "momentum.20"})
+    client.close()
+
+    assert breaker.states()["portfolio/returns"]["state"] == "closed"
@@ -0,0 +1,59 @@
+"""
+Tests for the pooled HTTP client, run against the local mock server.
+"""
+
+import pandas as pd
+from unravel_client import (
+    UnravelClient,
+    get_portfolio_historical_weights,
+    get_risk_overlay,
+    get_tickers,
+)
+from unravel_client.client import configure, get_client, set_client
+
+
+def test_endpoint_functions_reuse_connection(mock_server, mock_client):
+    """Consecutive calls should share a single keep-alive connection."""
+    for _ in range(5):
+        result = get_portfolio_historical_weights(id="momentum.20", api_key="key")
+        assert isinstance(result, pd.DataFrame)
+    get_risk_overlay(portfolio="momentum", overlay="trend", api_key="key")
+    get_tickers(id="momentum", api_key="key", universe_size="full")
+
+    assert len(mock_server.requests) == 7
+    assert mock_server.connections == 1
+
+
+def test_client_sends_api_key_and_params(mock_server, mock_client):
+    """The client should forward the API key header and query parameters."""
+    get_portfolio_historical_weights(
+        id="momentum.20", api_key="secret", start_date="2024-01-03"
+    )
+
+    path, params, headers = mock_server.requests[-1]
+    assert path == "portfolio/historical-weights"
+    assert params == {"portfolio": "momentum.20", "start_date": "2024-01-03"}
+    assert headers["X-API-KEY"] == "secret"
+
+
+def test_configure_replaces_default_client(mock_server):
+    """configure should swap the client used by the module-level functions."""
+    previous = get_client()
+    try:
+        client = configure(base_url=mock_server.base_url, pool_maxsize=4, timeout=5)
+        assert get_client() is client
+        assert client.session.get_adapter(client.base_url)._pool_maxsize == 4
+        assert get_tickers(id="momentum", api_key="key", universe_size=20) == [
+            "BTC",
+            "ETH",
+            "SOL",
+        ]
+    finally:
+        set_client(previous).close()
+
+
+def test_client_context_manager_closes_session(mock_server):
+    """Leaving the context manager should close pooled connections."""
+    with UnravelClient(base_url=mock_server.base_url) as client:
+        assert client.get("portfolio/tickers", "key", {}).status_code == 200
+    assert not client.session.adapters["http://"].poolmanager.pools
@@ -0,0 +1,116 @@
+"""
+Tests for compressed responses and transfer measurement.
+"""
+
+import asyncio
+import zlib
+
+import pandas as pd
+import pytest
+from unravel_client import (
+    AsyncUnravelClient,
+    get_client,
+    get_historical_universe,
+    get_portfolio_historical_weights,
+)
+from unravel_client.compression import (
+    DECODERS,
+    TransferStats,
+    accept_encoding,
+    decompress,
+)
+
+from .mock_server import ENCODERS, MockUnravelServer
+
+BODY = b'{"index": ["2024-01-01"], "data": [0.5]}' * 50
+
+
+@pytest.mark.parametrize("encoding", [e for e in DECODERS if e in ENCODERS])
+def test_decompress_roundtrip(encoding):
+    """Every advertised coding should be decoded back to the original body."""
+    assert decompress(ENCODERS[encoding](BODY), encoding) == BODY
+
+
+def test_decompress_raw_deflate_and_identity():
+    """Raw deflate streams and identity codings should be accepted."""
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    raw = compressor.compress(BODY) + compressor.flush()
+    assert decompress(raw, "deflate") == BODY
+    assert decompress(BODY, None) == BODY
+    assert decompress(BODY, "identity") == BODY
+    with pytest.raises(ValueError):
+        decompress(BODY, "lzma")
+
+
+def test_accept_encoding_is_restricted_to_supported_codings():
+    """Codings the HTTP library cannot decode should not be advertised."""
+    assert accept_encoding(["gzip", "deflate"]) == "gzip, deflate"
+    assert accept_encoding([]) == "identity"
+    assert accept_encoding().split(", ") == list(DECODERS)
+
+
+def test_transfer_stats():
+    """Counters should be summed per path."""
+    stats = TransferStats()
+    stats.record("portfolio/returns", 10, 40)
+    stats.record("portfolio/returns", 30, 40)
+
+    assert stats.snapshot() == {
+        "portfolio/returns": {
+            "calls": 2,
+            "wire_bytes": 40,
+            "decoded_bytes": 80,
+            "ratio": 0.5,
+        }
+    }
+    stats.clear()
+    assert stats.snapshot() == {}
+
+
+def test_client_records_compressed_transfers(mock_server, mock_client):
+    """The sync client should negotiate compression and count both sizes per path."""
+    get_portfolio_historical_weights("momentum.20", api_key="key")
+    get_historical_universe("20", "key", "2024-01-01", "2024-01-10")
+
+    stats = get_client().transfer_stats.snapshot()
+    assert set(stats) == {"portfolio/historical-weights", "portfolio/universe"}
+    assert all(s["wire_bytes"] < s["decoded_bytes"] for s in stats.values())
+    headers = mock_server.requests[0][2]
+    assert headers["Accept-Encoding"] == get_client().accept_encoding
+
+
+@pytest.mark.parametrize("encoding", [e for e in DECODERS if e in ENCODERS])
+def test_async_client_decompresses(encoding):
+    """The async client should decode every coding it advertises."""
+    server = MockUnravelServer(encodings=(encoding,)).start()
+
+    async def run():
+        async with AsyncUnravelClient(base_url=server.base_url) as client:
+            result = await client.get_portfolio_historical_weights("momentum.20", "key")
+            return result, client.transfer_stats.snapshot()
+
+    try:
+        result, stats = asyncio.run(run())
+    finally:
+        server.stop()
+
+    assert isinstance(result, pd.DataFrame)
+    assert result.shape == (10, 3)
+    assert stats["portfolio/historical-weights"]["ratio"] < 1
+
+
+def test_uncompressed_responses():
+    """Servers ignoring Accept-Encoding should be measured with a ratio of 1."""
+    server = MockUnravelServer(encodings=()).start()
+
+    async def run():
+        async with AsyncUnravelClient(base_url=server.base_url) as client:
+            await client.get_portfolio_historical_weights("momentum.20", "key")
+            return client.transfer_stats.snapshot()
+
+    try:
+        stats = asyncio.run(run())
+    finally:
+        server.stop()
+
+    assert stats["portfolio/historical-weights"]["ratio"] == 1
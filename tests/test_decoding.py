@@ -0,0 +1,64 @@
+"""
+Tests for decoding API payloads.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from unravel_client import UnravelClient, get_portfolio_historical_weights, set_client
+from unravel_client.decoding import BACKENDS, decode, get_loads
+
+PAYLOAD = {
+    "index": ["2024-01-01", "2024-01-02"],
+    "columns": ["BTC", "ETH"],
+    "data": [[0.5, -0.5], [None, 1.0]],
+}
+
+
+def test_default_backend_prefers_installed_library():
+    """The default parser should be the first available backend."""
+    assert get_loads() is next(iter(BACKENDS.values()))
+    assert get_loads("json") is json.loads
+    with pytest.raises(ValueError):
+        get_loads("simdjson")
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_decode_numeric_data_to_array(backend):
+    """Numeric rows should be decoded to a float64 array with NaN for missing values."""
+    payload = decode(json.dumps(PAYLOAD).encode(), get_loads(backend))
+
+    assert isinstance(payload["data"], np.ndarray)
+    assert payload["data"].dtype == np.float64
+    assert payload["data"].shape == (2, 2)
+    assert np.isnan(payload["data"][1, 0])
+    assert payload["columns"] == ["BTC", "ETH"]
+
+
+def test_decode_leaves_other_payloads_untouched():
+    """Non-numeric, empty and scalar data should be returned as decoded."""
+    assert decode(b'{"data": ["a", "b"]}')["data"] == ["a", "b"]
+    assert decode(b'{"data": []}')["data"] == []
+    assert decode(b'{"data": 0.5}')["data"] == 0.5
+    assert decode(b'{"tickers": ["BTC"]}') == {"tickers": ["BTC"]}
+
+
+def _fetch_weights(base_url: str, backend: str) -> pd.DataFrame:
+    client = UnravelClient(base_url=base_url, json_backend=backend)
+    previous = set_client(client)
+    try:
+        return get_portfolio_historical_weights("momentum.20", api_key="key")
+    finally:
+        set_client(previous)
+        client.close()
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_client_backends_agree(mock_server, backend):
+    """Every backend should produce the same frame as the stdlib parser."""
+    result = _fetch_weights(mock_server.base_url, backend)
+
+    assert all(result.dtypes == np.float64)
+    pd.testing.assert_frame_equal(result, _fetch_weights(mock_server.base_url, "json"))
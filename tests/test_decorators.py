@@ -0,0 +1,144 @@
+"""
+Tests for the retry policy of ``retry_on_error``.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+from unravel_client.decorators import (
+    backoff_delay,
+    is_retryable,
+    retry_after,
+    retry_on_error,
+)
+
+
+def _http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b'{"error": "failure"}'
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+@pytest.fixture()
+def sleeps(monkeypatch):
+    """Record the waits between attempts instead of sleeping."""
+    recorded = []
+
+    async def async_sleep(delay):
+        recorded.append(delay)
+
+    monkeypatch.setattr("unravel_client.decorators.time.sleep", recorded.append)
+    monkeypatch.setattr("unravel_client.decorators.asyncio.sleep", async_sleep)
+    return recorded
+
+
+def _failing(errors: list, num_trials: int = 3, **kwargs):
+    calls = []
+
+    @retry_on_error(num_trials=num_trials, wait=1.0, jitter=False, **kwargs)
+    def func():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "ok"
+
+    return func, calls
+
+
+def test_classification():
+    """Server, timeout and rate limit errors are retryable, other 4xx are fatal."""
+    assert is_retryable(_http_error(500))
+    assert is_retryable(_http_error(503))
+    assert is_retryable(_http_error(408))
+    assert is_retryable(_http_error(429))
+    assert is_retryable(requests.ConnectionError())
+    assert is_retryable(requests.Timeout())
+    assert is_retryable(requests.exceptions.ChunkedEncodingError())
+    assert not is_retryable(requests.exceptions.InvalidURL())
+    assert not is_retryable(requests.exceptions.MissingSchema())
+    assert not is_retryable(requests.exceptions.InvalidHeader())
+    assert is_retryable(ConnectionResetError())
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(OSError(28, "No space left on device"))
+    assert not is_retryable(PermissionError())
+    assert not is_retryable(_http_error(401))
+    assert not is_retryable(_http_error(404))
+    assert not is_retryable(ValueError())
+
+
+def test_fatal_errors_are_not_retried(sleeps):
+    """An invalid API key should fail on the first attempt."""
+    func, calls = _failing([_http_error(401)])
+
+    with pytest.raises(requests.HTTPError, match="failure"):
+        func()
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_exponential_backoff(sleeps):
+    """Waits should double after every failed attempt, up to max_wait."""
+    func, calls = _failing([_http_error(502)] * 4, num_trials=5, max_wait=3.0)
+
+    assert func() == "ok"
+    assert len(calls) == 5
+    assert sleeps == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_jitter_stays_below_backoff_delay():
+    """Jittered delays should be drawn between 0 and the backoff delay."""
+    delays = [backoff_delay(3, 1.0, 2.0, 30.0, jitter=True) for _ in range(100)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_after_is_honored(sleeps):
+    """Retry-After on 429 and 503 should replace the backoff delay."""
+    func, _ = _failing(
+        [_http_error(429, {"Retry-After": "7"}), _http_error(503, {"Retry-After": "0"})]
+    )
+
+    assert func() == "ok"
+    assert sleeps == [7.0, 0.0]
+
+
+def test_retry_after_http_date():
+    """Retry-After given as an HTTP date should be converted to seconds."""
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    error = _http_error(503, {"Retry-After": format_datetime(when, usegmt=True)})
+    assert 25 <= retry_after(error) <= 30
+    assert retry_after(_http_error(500, {"Retry-After": "5"})) is None
+
+
+def test_deadline_bounds_total_latency(sleeps):
+    """No retry should be started if it would end after the deadline."""
+    func, calls = _failing([_http_error(429, {"Retry-After": "120"})], deadline=60.0)
+
+    with pytest.raises(requests.HTTPError):
+        func()
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_async_retry(sleeps):
+    """Coroutines should follow the same policy."""
+    calls = []
+
+    @retry_on_error(num_trials=3, wait=1.0, jitter=False)
+    async def func():
+        calls.append(1)
+        if len(calls) == 1:
+            raise _http_error(503)
+        if len(calls) == 2:
+            raise _http_error(404)
+        return "ok"
+
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(func())
+    assert len(calls) == 2
+    assert sleeps == [1.0]
@@ -0,0 +1,61 @@
+"""
+Tests for building pandas objects from decoded payloads.
+"""
+
+import numpy as np
+import pandas as pd
+from unravel_client.frames import to_frame, to_index, to_mask, to_series
+
+
+def test_to_index_matches_pandas():
+    """Plain and timestamped ISO dates should parse like pd.to_datetime."""
+    dates = ["2024-01-01", "2024-01-02", "2024-02-29"]
+    pd.testing.assert_index_equal(to_index(dates), pd.to_datetime(dates))
+
+    stamps = ["2024-01-01T12:30:00", "2024-01-02T00:00:00"]
+    pd.testing.assert_index_equal(to_index(stamps), pd.to_datetime(stamps))
+    assert len(to_index([])) == 0
+
+
+def test_to_frame_wraps_array_without_copy():
+    """A decoded float64 block should back the frame directly."""
+    data = np.arange(6, dtype=np.float64).reshape(3, 2)
+
+    frame = to_frame(data, ["2024-01-01", "2024-01-02", "2024-01-03"], ["A", "B"])
+
+    assert np.shares_memory(frame.to_numpy(), data)
+    assert list(frame.columns) == ["A", "B"]
+    assert all(frame.dtypes == np.float64)
+
+
+def test_to_frame_from_lists_and_empty_payloads():
+    """Nested lists with missing values and empty payloads should be supported."""
+    frame = to_frame([[1, None], [2, 3]], ["2024-01-01", "2024-01-02"], ["A", "B"])
+    assert np.isnan(frame.loc["2024-01-01", "B"])
+
+    empty = to_frame([], [], ["A", "B"])
+    assert empty.shape == (0, 2)
+    assert isinstance(empty.index, pd.DatetimeIndex)
+
+
+def test_to_series_dtype_and_index():
+    """Series should use the requested dtype and keep prebuilt indices."""
+    series = to_series([1, 2], ["2024-01-01", "2024-01-02"], name="returns")
+    assert series.dtype == np.float64
+    assert series.name == "returns"
+    assert isinstance(series.index, pd.DatetimeIndex)
+
+    labelled = to_series([0.5], pd.Index(["BTC"]), dtype=np.float32)
+    assert labelled.dtype == np.float32
+    assert list(labelled.index) == ["BTC"]
+
+
+def test_to_mask_numeric_and_object_values():
+    """Missing values should be detected in numeric and non-numeric payloads alike."""
+    expected = np.array([[True, False], [False, True]])
+
+    np.testing.assert_array_equal(to_mask([[1, None], [None, 0]]), expected)
+    np.testing.assert_array_equal(
+        to_mask(np.array([[1, np.nan], [np.nan, 0]])), expected
+    )
+    np.testing.assert_array_equal(to_mask([["BTC", None], [None, "ETH"]]), expected)
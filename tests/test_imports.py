@@ -0,0 +1,49 @@
+"""
+Tests for the lazy loading of the package.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+def _loaded_modules(statement: str) -> set[str]:
+    # A fresh interpreter, modules imported by other tests would hide eager imports.
+    code = f"import sys\n{statement}\nprint(' '.join(sys.modules))"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    return set(result.stdout.split())
+
+
+def test_package_import_is_lazy():
+    """Importing the package loads none of the heavy dependencies."""
+    modules = _loaded_modules("import unravel_client")
+    assert not {"pandas", "numpy", "requests", "aiohttp"} & modules
+    assert "unravel_client.client" not in modules
+
+
+def test_plain_endpoint_skips_pandas():
+    """Endpoints returning plain lists do not load pandas, NumPy nor aiohttp."""
+    modules = _loaded_modules("from unravel_client import get_tickers")
+    assert not {"pandas", "numpy", "aiohttp"} & modules
+
+
+def test_lazy_attributes():
+    """Exported names resolve on access and unknown ones raise AttributeError."""
+    import unravel_client
+    from unravel_client.price import get_prices
+
+    assert unravel_client.get_prices is get_prices
+    assert set(unravel_client.__all__) <= set(dir(unravel_client))
+    for name in unravel_client.__all__:
+        assert getattr(unravel_client, name) is not None
+    with pytest.raises(AttributeError, match="not_an_endpoint"):
+        unravel_client.not_an_endpoint  # noqa: B018
@@ -0,0 +1,142 @@
+"""
+Tests for the instrumentation hooks.
+"""
+
+import asyncio
+
+import pytest
+import requests
+from unravel_client import (
+    AsyncUnravelClient,
+    CallEvent,
+    CallListener,
+    UnravelClient,
+    get_portfolio_historical_weights,
+    get_portfolio_returns,
+    set_client,
+)
+from unravel_client.instrumentation import current_event, phase
+
+
+@pytest.fixture()
+def events(mock_server):
+    """Route endpoint functions to a client recording every event."""
+    recorded = []
+    client = UnravelClient(base_url=mock_server.base_url, listeners=[recorded.append])
+    previous = set_client(client)
+    yield recorded
+    set_client(previous)
+    client.close()
+
+
+def test_event_reports_call_details(events):
+    """Every call should report its endpoint, status, size and phase timings."""
+    get_portfolio_historical_weights("momentum.20", "key", start_date="2024-01-01")
+
+    (event,) = events
+    assert event.endpoint == "portfolio/historical-weights"
+    assert event.params == {"portfolio": "momentum.20", "start_date": "2024-01-01"}
+    assert event.status == 200
+    assert event.attempt == 1
+    assert event.error is None
+    assert event.wire_bytes > 0
+    assert event.decoded_bytes >= event.wire_bytes
+    assert {"request", "decode", "parse", "index", "convert", "frame"} <= set(
+        event.timings
+    )
+    assert event.timings["parse"] >= event.timings["index"]
+    assert event.duration >= event.timings["request"]
+
+
+def test_retries_report_one_event_per_attempt(events, monkeypatch):
+    """Failed attempts are reported with their status, error and attempt number."""
+    monkeypatch.setattr("unravel_client.decorators.time.sleep", lambda _: None)
+
+    with pytest.raises(requests.HTTPError):
+        get_portfolio_returns("failing.20", "key")
+
+    assert [event.attempt for event in events] == [1, 2, 3]
+    assert all(event.status == 503 for event in events)
+    assert all(isinstance(event.error, requests.HTTPError) for event in events)
+
+
+def test_not_modified_is_reported(mock_server):
+    """Results reused after a 304 should be flagged."""
+    recorded = []
+    with UnravelClient(
+        base_url=mock_server.base_url,
+        conditional_cache=True,
+        listeners=[recorded.append],
+    ) as client:
+        params = {"portfolio": "momentum.20"}
+        client.fetch("portfolio/returns", "key", params, dict)
+        client.fetch("portfolio/returns", "key", params, dict)
+
+    assert [event.not_modified for event in recorded] == [False, True]
+    assert recorded[1].status == 304
+
+
+def test_listener_hooks_and_removal(mock_server):
+    """on_start runs before the request and removed listeners are not called."""
+
+    class Recorder(CallListener):
+        def __init__(self):
+            self.calls = []
+
+        def on_start(self, event: CallEvent) -> None:
+            self.calls.append(("start", event.status))
+
+        def on_end(self, event: CallEvent) -> None:
+            self.calls.append(("end", event.status))
+
+    recorder = Recorder()
+    with UnravelClient(base_url=mock_server.base_url) as client:
+        client.instrumentation.add_listener(recorder)
+        client.fetch("portfolio/returns", "key", {"portfolio": "momentum.20"}, dict)
+        client.instrumentation.remove_listener(recorder)
+        client.fetch("portfolio/returns", "key", {"portfolio": "momentum.40"}, dict)
+
+    assert recorder.calls == [("start", None), ("end", 200)]
+
+
+def test_failing_listener_does_not_break_calls(mock_server):
+    """A listener raising an exception should only produce a warning."""
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    client = UnravelClient(base_url=mock_server.base_url, listeners=[broken])
+    with client, pytest.warns(RuntimeWarning, match="boom"):
+        result = client.fetch(
+            "portfolio/returns", "key", {"portfolio": "momentum.20"}, dict
+        )
+
+    assert "data" in result
+
+
+def test_phase_without_event_is_a_no_op():
+    """Outside of an instrumented call, phases record nothing."""
+    with phase("parse"):
+        assert current_event() is None
+
+
+def test_async_client_events(mock_server):
+    """The async client should report the same events."""
+    recorded = []
+
+    async def run():
+        async with AsyncUnravelClient(
+            base_url=mock_server.base_url, listeners=[recorded.append]
+        ) as client:
+            await asyncio.gather(
+                client.get_portfolio_returns("momentum.20", "key"),
+                client.get_portfolio_returns("momentum.40", "key"),
+            )
+
+    asyncio.run(run())
+
+    assert sorted(event.params["portfolio"] for event in recorded) == [
+        "momentum.20",
+        "momentum.40",
+    ]
+    assert all(event.status == 200 and "request" in event.timings for event in recorded)
@@ -0,0 +1,175 @@
+"""
+Tests for the compact universe membership bitmap.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+from unravel_client import (
+    AsyncUnravelClient,
+    UniverseBitmap,
+    UniverseIndex,
+    get_historical_universe,
+)
+from unravel_client.portfolio.membership import to_bitmap
+
+
+def _frame():
+    index = pd.date_range("2024-01-01", periods=4)
+    tickers = [f"T{i:02d}" for i in range(11)]
+    members = np.random.default_rng(0).random((4, 11)) > 0.5
+    return pd.DataFrame(members, index=index, columns=tickers)
+
+
+def test_bitmap_round_trip():
+    """Packing and expanding a frame should give it back, in 2 bytes per date."""
+    frame = _frame()
+    bitmap = UniverseBitmap.from_frame(frame)
+
+    assert bitmap.nbytes == 4 * 2
+    pd.testing.assert_frame_equal(bitmap.to_frame(), frame, check_freq=False)
+
+
+def test_is_member_matches_frame():
+    """Vectorized queries should match the dense frame, for every shape of query."""
+    frame = _frame()
+    bitmap = UniverseBitmap.from_frame(frame)
+    tickers = list(frame.columns)
+
+    assert bitmap.is_member("2024-01-02", "T09") == frame.loc["2024-01-02", "T09"]
+    np.testing.assert_array_equal(
+        bitmap.is_member("2024-01-03", tickers), frame.loc["2024-01-03"].to_numpy()
+    )
+    np.testing.assert_array_equal(
+        bitmap.is_member(frame.index, "T10"), frame["T10"].to_numpy()
+    )
+    np.testing.assert_array_equal(
+        bitmap.is_member(frame.index, tickers), frame.to_numpy()
+    )
+    assert bitmap.members("2024-01-04") == [
+        ticker for ticker in tickers if frame.loc["2024-01-04", ticker]
+    ]
+
+
+def test_is_member_outside_the_bitmap():
+    """Later dates use the last known row, earlier dates and unknown tickers are never members."""
+    frame = _frame()
+    bitmap = UniverseBitmap.from_frame(frame)
+
+    np.testing.assert_array_equal(
+        bitmap.is_member("2024-02-01", list(frame.columns)), frame.iloc[-1].to_numpy()
+    )
+    assert not bitmap.is_member("2023-12-31", list(frame.columns)).any()
+    assert not bitmap.is_member("2024-01-02", "UNKNOWN")
+    assert bitmap.members("2023-12-31") == []
+
+
+def test_concat_unions_tickers():
+    """Stacked bitmaps should hold every ticker, the last bitmap winning on shared dates."""
+    first = UniverseBitmap.from_frame(_frame().iloc[:3, :5])
+    second = UniverseBitmap.from_frame(_frame().iloc[2:, 3:])
+
+    combined = UniverseBitmap.concat([second, first])
+
+    expected = pd.concat([_frame().iloc[2:, 3:], _frame().iloc[:3, :5]])
+    expected = expected[~expected.index.duplicated(keep="last")].fillna(False)
+    expected = expected.astype(bool).sort_index()
+    pd.testing.assert_frame_equal(
+        combined.to_frame()[expected.columns], expected, check_freq=False
+    )
+
+
+def test_get_historical_universe_compact(mock_server, mock_client):
+    """The compact result should expand to the dense one, also when sharded."""
+    dense = get_historical_universe("20", "key", "2024-01-01", "2024-01-10")
+    compact = get_historical_universe(
+        "20", "key", "2024-01-01", "2024-01-10", compact=True
+    )
+    sharded = get_historical_universe("20", "key", "2024-01-01", "2024-01-10", shards=3)
+    sharded_compact = get_historical_universe(
+        "20", "key", "2024-01-01", "2024-01-10", shards=3, compact=True
+    )
+
+    assert isinstance(compact, UniverseBitmap)
+    pd.testing.assert_frame_equal(compact.to_frame(), dense)
+    pd.testing.assert_frame_equal(sharded_compact.to_frame(), sharded)
+    assert dense.to_numpy().any()
+
+
+def test_async_get_historical_universe_compact(mock_server):
+    """The async client should return the same bitmap."""
+
+    async def run():
+        async with AsyncUnravelClient(base_url=mock_server.base_url) as client:
+            return await client.get_historical_universe(
+                "20", "key", "2024-01-01", "2024-01-10", compact=True
+            )
+
+    compact = asyncio.run(run())
+
+    assert isinstance(compact, UniverseBitmap)
+    assert len(compact) == 10
+
+
+def test_index_intervals():
+    """Runs of membership should become entry and exit dates, open on the last date."""
+    index = pd.date_range("2024-01-01", periods=5)
+    frame = pd.DataFrame(
+        {"BTC": [True, True, False, True, True], "ETH": [False] * 5}, index=index
+    )
+
+    universe = UniverseIndex.from_frame(frame)
+
+    assert universe.tickers == ["BTC"]
+    assert universe.intervals("BTC") == [
+        (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-03")),
+        (pd.Timestamp("2024-01-04"), pd.NaT),
+    ]
+    assert universe.intervals("ETH") == []
+    assert universe.is_member("2024-01-02", "BTC")
+    assert not universe.is_member("2024-01-03", "BTC")
+    assert universe.is_member("2030-01-01", "BTC")
+    assert not universe.is_member("2023-12-31", "BTC")
+
+
+def test_index_matches_bitmap():
+    """Point-in-time, batch and member queries should agree with the bitmap."""
+    frame = _frame()
+    bitmap = UniverseBitmap.from_frame(frame)
+    universe = UniverseIndex.from_bitmap(bitmap)
+    tickers = universe.tickers
+    dates = pd.to_datetime(["2024-01-03", "2023-12-01", "2024-01-01", "2024-03-01"])
+
+    np.testing.assert_array_equal(
+        universe.is_member(dates, tickers), bitmap.is_member(dates, tickers)
+    )
+    lookup = universe.lookup(dates)
+    assert list(lookup.index) == list(dates)
+    np.testing.assert_array_equal(lookup.to_numpy(), bitmap.is_member(dates, tickers))
+    for date in dates:
+        assert universe.members(date) == bitmap.members(date)
+
+
+def test_index_save_load(tmp_path):
+    """A saved index should load back with the same intervals."""
+    universe = UniverseIndex.from_frame(_frame())
+    path = tmp_path / "universe.parquet"
+
+    universe.save(path)
+    loaded = UniverseIndex.load(path)
+
+    assert loaded.tickers == universe.tickers
+    pd.testing.assert_frame_equal(loaded.to_frame(), universe.to_frame())
+    np.testing.assert_array_equal(loaded.offsets, universe.offsets)
+
+
+def test_to_bitmap_from_ticker_payload():
+    """Universe payloads listing tickers instead of numbers should be supported."""
+    bitmap = to_bitmap(
+        [["BTC", None], [None, "ETH"]], ["2024-01-01", "2024-01-02"], ["BTC", "ETH"]
+    )
+
+    np.testing.assert_array_equal(
+        bitmap.to_frame().to_numpy(), [[True, False], [False, True]]
+    )
@@ -0,0 +1,114 @@
+"""
+Tests for the metrics registry.
+"""
+
+import pytest
+import requests
+from unravel_client import (
+    CallEvent,
+    LiveCache,
+    MetricsRegistry,
+    UnravelClient,
+    get_live_weights,
+    get_portfolio_returns,
+    set_client,
+)
+
+
+def _event(duration, status=200, attempt=1, error=None):
+    return CallEvent(
+        "portfolio/returns",
+        {},
+        attempt=attempt,
+        status=status,
+        wire_bytes=100,
+        error=error,
+        duration=duration,
+        timings={"request": duration},
+    )
+
+
+def test_registry_aggregates_events():
+    """Counters, histogram and gauge should follow the events received."""
+    metrics = MetricsRegistry(buckets=(0.1, 1.0))
+    metrics.on_start(_event(0))
+    snapshot = metrics.snapshot()
+    assert snapshot["in_flight"] == {"portfolio/returns": 1}
+
+    metrics.on_end(_event(0.05))
+    metrics.on_end(_event(0.1))
+    metrics.on_end(_event(2.0, status=503, attempt=2, error=requests.HTTPError()))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["in_flight"] == {"portfolio/returns": -2}
+    assert snapshot["requests"] == {
+        ("portfolio/returns", "200"): 2,
+        ("portfolio/returns", "503"): 1,
+    }
+    assert snapshot["retries"] == {("portfolio/returns",): 1}
+    assert snapshot["errors"] == {("portfolio/returns", "HTTPError"): 1}
+    assert snapshot["received_bytes"] == {("portfolio/returns",): 300}
+    histogram = snapshot["request_duration_seconds"]["portfolio/returns"]
+    assert histogram["buckets"] == {0.1: 2, 1.0: 2, float("inf"): 3}
+    assert histogram["sum"] == pytest.approx(2.15)
+    assert histogram["count"] == 3
+
+
+def test_prometheus_export():
+    """The exposition should follow the Prometheus text format."""
+    metrics = MetricsRegistry(buckets=(0.1,), prefix="app")
+    metrics.on_start(_event(0))
+    metrics.on_end(_event(0.05))
+    metrics.on_cache_hit("portfolio/live-weights", "live")
+
+    text = metrics.to_prometheus()
+
+    assert "# TYPE app_requests_total counter" in text
+    assert 'app_requests_total{endpoint="portfolio/returns",status="200"} 1' in text
+    assert (
+        'app_cache_hits_total{endpoint="portfolio/live-weights",cache="live"} 1' in text
+    )
+    assert 'app_in_flight{endpoint="portfolio/returns"} 0' in text
+    assert "# TYPE app_request_duration_seconds histogram" in text
+    assert (
+        'app_request_duration_seconds_bucket{endpoint="portfolio/returns",le="0.1"} 1'
+        in text
+    )
+    assert (
+        'app_request_duration_seconds_bucket{endpoint="portfolio/returns",le="+Inf"} 1'
+        in text
+    )
+    assert 'app_request_duration_seconds_count{endpoint="portfolio/returns"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_client_metrics(mock_server, monkeypatch):
+    """The built-in registry should count requests, retries and cache hits."""
+    monkeypatch.setattr("unravel_client.decorators.time.sleep", lambda _: None)
+    client = UnravelClient(
+        base_url=mock_server.base_url, metrics=True, live_cache=LiveCache()
+    )
+    previous = set_client(client)
+    try:
+        get_portfolio_returns("momentum.20", "key")
+        with pytest.raises(requests.HTTPError):
+            get_portfolio_returns("failing.20", "key")
+        get_live_weights("momentum.20", "key", as_of="close")
+        get_live_weights("momentum.20", "key", as_of="close")
+    finally:
+        set_client(previous)
+        client.close()
+
+    snapshot = client.metrics.snapshot()
+    assert snapshot["requests"] == {
+        ("portfolio/returns", "200"): 1,
+        ("portfolio/returns", "503"): 3,
+        ("portfolio/live-weights", "200"): 1,
+    }
+    assert snapshot["retries"] == {("portfolio/returns",): 2}
+    assert snapshot["cache_hits"] == {("portfolio/live-weights", "live"): 1}
+    assert snapshot["in_flight"] == {
+        "portfolio/returns": 0,
+        "portfolio/live-weights": 0,
+    }
+    assert snapshot["request_duration_seconds"]["portfolio/returns"]["count"] == 4
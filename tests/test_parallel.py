@@ -0,0 +1,187 @@
+"""
+Tests for splitting large requests into concurrently fetched chunks and shards.
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+from unravel_client import (
+    AsyncUnravelClient,
+    get_client,
+    get_historical_universe,
+    get_portfolio_factors_historical,
+    get_portfolio_historical_weights,
+    get_prices,
+)
+from unravel_client.parallel import (
+    chunked,
+    concat_columns,
+    concat_rows,
+    split_date_range,
+)
+
+TICKERS = ["SOL", "BTC", "ETH", "ADA", "XRP", "DOGE", "DOT"]
+
+
+def test_chunked():
+    """Sequences should be split into ordered chunks of bounded size."""
+    assert chunked(TICKERS, 3) == [TICKERS[:3], TICKERS[3:6], TICKERS[6:]]
+    assert chunked(TICKERS, None) == [TICKERS]
+    assert chunked(TICKERS, 10) == [TICKERS]
+    assert chunked([], 3) == [[]]
+    assert chunked(["BTC", "ETH", "BTC", "SOL"], 2) == [["BTC", "ETH"], ["SOL"]]
+
+
+def test_concat_columns_aligns_index_and_order():
+    """Chunks should be joined on the union of their indices in requested order."""
+    first = pd.DataFrame({"B": [1.0, 2.0]}, index=[1, 2])
+    second = pd.DataFrame({"A": [3.0, 4.0]}, index=[2, 3])
+
+    result = concat_columns([first, second], ["A", "B", "C"])
+
+    assert list(result.columns) == ["A", "B"]
+    assert list(result.index) == [1, 2, 3]
+
+
+def test_concat_columns_keeps_unrequested_and_repeated_columns_once():
+    """Unexpected columns should be appended and repeated requests not duplicated."""
+    first = pd.DataFrame({"btc": [1.0], "ETH": [2.0]}, index=[1])
+    second = pd.DataFrame({"SOL": [3.0]}, index=[1])
+
+    result = concat_columns([first, second], ["SOL", "ETH", "BTC", "SOL"])
+
+    assert list(result.columns) == ["SOL", "ETH", "btc"]
+
+
+def test_get_prices_sends_repeated_tickers_once(mock_server, mock_client):
+    """A ticker listed twice should be requested and returned once."""
+    result = get_prices(tickers=["BTC", "ETH", "BTC"], api_key="key", chunk_size=1)
+
+    sent = sorted(params["ticker"] for _, params, _ in mock_server.requests)
+    assert sent == ["BTC", "ETH"]
+    assert list(result.columns) == ["BTC", "ETH"]
+
+
+def test_get_prices_splits_tickers_into_chunks(mock_server, mock_client):
+    """Long ticker lists should be fetched in chunks and reassembled in order."""
+    result = get_prices(tickers=TICKERS, api_key="key", chunk_size=3)
+
+    sent = sorted(params["ticker"] for _, params, _ in mock_server.requests)
+    assert sent == sorted(["SOL,BTC,ETH", "ADA,XRP,DOGE", "DOT"])
+    assert list(result.columns) == TICKERS
+    assert isinstance(result.index, pd.DatetimeIndex)
+
+
+def test_get_portfolio_factors_historical_splits_tickers(mock_server, mock_client):
+    """Factor requests should be split the same way as price requests."""
+    result = get_portfolio_factors_historical(
+        id="momentum", tickers=TICKERS, api_key="key", chunk_size=2
+    )
+
+    assert len(mock_server.requests) == 4
+    assert list(result.columns) == TICKERS
+    assert all(pd.api.types.is_float_dtype(result[col]) for col in result.columns)
+
+
+def test_async_get_prices_splits_tickers(mock_server):
+    """The async client should split ticker lists the same way."""
+
+    async def run():
+        async with AsyncUnravelClient(base_url=mock_server.base_url) as client:
+            return await client.get_prices(TICKERS, "key", chunk_size=4)
+
+    result = asyncio.run(run())
+
+    assert len(mock_server.requests) == 2
+    assert list(result.columns) == TICKERS
+
+
+def test_split_date_range():
+    """Date ranges should be split into contiguous inclusive windows."""
+    assert split_date_range("2024-01-01", "2024-01-10", 3) == [
+        ("2024-01-01", "2024-01-04"),
+        ("2024-01-05", "2024-01-07"),
+        ("2024-01-08", "2024-01-10"),
+    ]
+    assert split_date_range("2024-01-01", "2024-01-02", 5) == [
+        ("2024-01-01", "2024-01-01"),
+        ("2024-01-02", "2024-01-02"),
+    ]
+
+
+def test_concat_rows_dedupes_and_sorts():
+    """Overlapping windows should keep the last row for each date."""
+    first = pd.DataFrame({"A": [1.0, 2.0]}, index=[2, 3])
+    second = pd.DataFrame({"A": [3.0, 4.0]}, index=[1, 2])
+
+    result = concat_rows([first, second])
+
+    assert list(result.index) == [1, 2, 3]
+    assert list(result["A"]) == [3.0, 4.0, 2.0]
+
+
+def test_get_portfolio_historical_weights_shards_date_range(mock_server, mock_client):
+    """Sharded requests should cover the range once and be stitched back together."""
+    result = get_portfolio_historical_weights(
+        id="momentum.20",
+        api_key="key",
+        start_date="2024-01-01",
+        end_date="2024-01-10",
+        shards=3,
+    )
+
+    windows = sorted(
+        (params["start_date"], params["end_date"])
+        for _, params, _ in mock_server.requests
+    )
+    assert windows == split_date_range("2024-01-01", "2024-01-10", 3)
+    assert len(result) == 10
+    assert result.index.is_monotonic_increasing
+    assert not result.index.has_duplicates
+
+
+def test_get_historical_universe_shards_date_range(mock_server, mock_client):
+    """Sharded universe frames should stay boolean after being stitched."""
+    result = get_historical_universe(
+        size="20",
+        api_key="key",
+        start_date="2024-01-01",
+        end_date="2024-01-10",
+        shards=2,
+    )
+
+    assert len(mock_server.requests) == 2
+    assert len(result) == 10
+    assert all(result.dtypes == bool)
+
+
+def test_shards_require_start_date(mock_server, mock_client):
+    """Sharding an open-ended range should be rejected before any request is sent."""
+    with pytest.raises(ValueError):
+        get_client().fetch_range(
+            "portfolio/historical-weights", "key", {}, lambda r: r, shards=2
+        )
+    assert mock_server.requests == []
+
+
+def test_async_get_portfolio_factors_historical_shards(mock_server):
+    """The async client should shard date ranges the same way."""
+
+    async def run():
+        async with AsyncUnravelClient(base_url=mock_server.base_url) as client:
+            return await client.get_portfolio_factors_historical(
+                "momentum",
+                TICKERS,
+                "key",
+                start_date="2024-01-01",
+                end_date="2024-01-10",
+                chunk_size=None,
+                shards=2,
+            )
+
+    result = asyncio.run(run())
+
+    assert len(mock_server.requests) == 2
+    assert len(result) == 10
+    assert list(result.columns) == TICKERS
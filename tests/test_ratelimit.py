@@ -0,0 +1,133 @@
+"""
+Tests for the client-side rate limiters.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from unravel_client import (
+    AsyncUnravelClient,
+    DeadlineExceeded,
+    FileTokenBucket,
+    RateLimiter,
+    TokenBucket,
+    UnravelClient,
+    get_portfolio_returns,
+    set_client,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_limiter_requires_reserve():
+    """The base class is abstract, subclasses must implement reserve."""
+    with pytest.raises(TypeError):
+        RateLimiter()
+
+
+def test_token_bucket_bursts_then_queues():
+    """Up to capacity requests go out at once, later ones are spaced by 1 / rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits == pytest.approx([0.0, 0.0, 0.1, 0.2])
+    clock.now = 1.0
+    assert bucket.reserve() == 0.0
+
+
+def test_file_token_bucket_is_shared_by_instances(tmp_path):
+    """Buckets using the same file should share a single budget."""
+    clock = FakeClock()
+    first = FileTokenBucket(tmp_path / "bucket", rate=10, capacity=1, clock=clock)
+    second = FileTokenBucket(tmp_path / "bucket", rate=10, capacity=1, clock=clock)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() == pytest.approx(0.1)
+    assert first.reserve() == pytest.approx(0.2)
+
+
+@pytest.mark.parametrize("kind", ["memory", "file"])
+def test_rejected_reservations_take_no_tokens(kind, tmp_path):
+    """Callers rejected by their deadline should not delay the ones after them."""
+    clock = FakeClock()
+    if kind == "memory":
+        bucket = TokenBucket(rate=1, capacity=1, clock=clock)
+    else:
+        bucket = FileTokenBucket(tmp_path / "bucket", rate=1, capacity=1, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    for _ in range(5):
+        with pytest.raises(DeadlineExceeded):
+            bucket.acquire(timeout=0.5)
+
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def _frozen_clock():
+    return 1000.0
+
+
+def _reserve_many(path, count):
+    bucket = FileTokenBucket(path, rate=100, capacity=1, clock=_frozen_clock)
+    return [bucket.reserve() for _ in range(count)]
+
+
+def test_file_token_bucket_across_processes(tmp_path):
+    """Reservations from several processes should be queued one after the other."""
+    path = tmp_path / "bucket"
+    with ProcessPoolExecutor(2) as executor:
+        results = list(executor.map(_reserve_many, [path, path], [5, 5]))
+
+    waits = sorted(wait for result in results for wait in result)
+    assert waits == pytest.approx([i / 100 for i in range(10)])
+
+
+def test_client_acquires_before_every_request(mock_server):
+    """The client should not exceed the configured rate."""
+    client = UnravelClient(
+        base_url=mock_server.base_url, rate_limiter=TokenBucket(rate=50, capacity=1)
+    )
+    previous = set_client(client)
+    started = time.monotonic()
+    try:
+        for i in range(6):
+            get_portfolio_returns("momentum.20", "key", start_date=f"2024-01-0{i + 1}")
+    finally:
+        set_client(previous)
+        client.close()
+
+    assert time.monotonic() - started >= 0.09
+    assert len(mock_server.requests) == 6
+
+
+def test_async_client_rate_limit(mock_server):
+    """Concurrent coroutines should be spaced by the limiter too."""
+
+    async def run():
+        async with AsyncUnravelClient(
+            base_url=mock_server.base_url,
+            rate_limiter=TokenBucket(rate=50, capacity=1),
+        ) as client:
+            await asyncio.gather(
+                *(
+                    client.get_portfolio_returns(
+                        "momentum.20", "key", start_date=f"2024-01-0{i + 1}"
+                    )
+                    for i in range(6)
+                )
+            )
+
+    started = time.monotonic()
+    asyncio.run(run())
+
+    assert time.monotonic() - started >= 0.09
@@ -0,0 +1,124 @@
+"""
+Tests for coalescing of identical concurrent requests.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from unravel_client import (
+    AsyncUnravelClient,
+    get_portfolio_historical_weights,
+    get_price,
+    get_prices,
+)
+from unravel_client.singleflight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_request(mock_server, mock_client):
+    """Identical calls from several threads should trigger a single request."""
+    mock_server.latency = 0.3
+    barrier = threading.Barrier(8)
+
+    def call(_):
+        barrier.wait()
+        return get_portfolio_historical_weights(
+            "momentum_enhanced.40", "key", start_date="2024-01-01"
+        )
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(call, range(8)))
+
+    assert len(mock_server.requests) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_different_parameters_are_not_coalesced(mock_server, mock_client):
+    """Calls with different parameters should each be sent."""
+    mock_server.latency = 0.1
+
+    with ThreadPoolExecutor(2) as executor:
+        list(
+            executor.map(
+                lambda id: get_portfolio_historical_weights(id, "key"),
+                ["momentum.20", "momentum.40"],
+            )
+        )
+
+    assert len(mock_server.requests) == 2
+
+
+def test_calls_with_different_parsers_are_not_coalesced(mock_server, mock_client):
+    """The same request parsed into different results should not share its result."""
+    mock_server.latency = 0.3
+    barrier = threading.Barrier(2)
+
+    def call(fetch):
+        barrier.wait()
+        return fetch()
+
+    with ThreadPoolExecutor(2) as executor:
+        price, prices = executor.map(
+            call, [lambda: get_price("BTC", "key"), lambda: get_prices(["BTC"], "key")]
+        )
+
+    assert isinstance(price, pd.Series)
+    assert isinstance(prices, pd.DataFrame)
+
+
+def test_async_calls_with_different_parsers_are_not_coalesced(mock_server):
+    """Coroutines parsing the same request differently should get their own result."""
+    mock_server.latency = 0.2
+
+    async def run():
+        async with AsyncUnravelClient(base_url=mock_server.base_url) as client:
+            return await asyncio.gather(
+                client.get_price("BTC", "key"), client.get_prices(["BTC"], "key")
+            )
+
+    price, prices = asyncio.run(run())
+
+    assert isinstance(price, pd.Series)
+    assert isinstance(prices, pd.DataFrame)
+
+
+def test_async_identical_calls_share_one_request(mock_server):
+    """Identical coroutines awaited together should trigger a single request."""
+    mock_server.latency = 0.2
+
+    async def run():
+        async with AsyncUnravelClient(base_url=mock_server.base_url) as client:
+            return await asyncio.gather(
+                *(client.get_live_weights("momentum.20", "key") for _ in range(10))
+            )
+
+    results = asyncio.run(run())
+
+    assert len(mock_server.requests) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_single_flight_propagates_exceptions_to_waiters():
+    """Waiters should receive the exception raised by the shared call."""
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait()
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flight.do, "key", fail)
+        started.wait()
+        waiter = executor.submit(flight.do, "key", lambda: "not called")
+        time.sleep(0.1)  # let the waiter block on the in-flight call
+        release.set()
+        for future in (leader, waiter):
+            with pytest.raises(ValueError, match="boom"):
+                future.result()
+
+    assert len(flight) == 0
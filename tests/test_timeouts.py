@@ -0,0 +1,226 @@
+"""
+Tests for per-call timeouts and deadlines.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from unravel_client import (
+    AsyncUnravelClient,
+    DeadlineExceeded,
+    TokenBucket,
+    UnravelClient,
+    call_scope,
+    get_portfolio_returns,
+    get_prices,
+    set_client,
+)
+from unravel_client.timeouts import current_scope, request_timeout
+
+
+@pytest.fixture()
+def _longest_backoff(monkeypatch):
+    monkeypatch.setattr("unravel_client.decorators.random.uniform", lambda _, b: b)
+
+
+def test_request_timeout_without_scope():
+    """Outside of a call the client timeout is used as is."""
+    assert request_timeout((5.0, 30.0)) == (5.0, 30.0)
+    assert request_timeout(None) is None
+    assert request_timeout((5.0, 30.0), deadline=2.0) == (2.0, 2.0)
+
+
+def test_request_timeout_is_clamped_to_the_deadline():
+    """Requests should never be allowed to outlive the call deadline."""
+    with call_scope(timeout=(1.0, 10.0), deadline=5.0):
+        connect, read = request_timeout((30.0, 60.0))
+        assert connect == 1.0
+        assert 4.9 < read <= 5.0
+
+    with call_scope(deadline=-1.0), pytest.raises(DeadlineExceeded):
+        request_timeout(None)
+
+
+def test_nested_scopes_only_shorten_the_deadline():
+    """Inner scopes inherit the timeout and cannot extend the outer deadline."""
+    with call_scope(timeout=3.0, deadline=1.0) as outer:
+        with call_scope(deadline=10.0) as inner:
+            assert inner.timeout == 3.0
+            assert inner.expires_at == outer.expires_at
+        with call_scope(timeout=1.0, deadline=0.5) as inner:
+            assert inner.timeout == 1.0
+            assert inner.expires_at < outer.expires_at
+        assert current_scope() is outer
+    assert current_scope() is None
+
+
+def test_deadline_interrupts_a_stalled_request(mock_client, mock_server):
+    """A call should give up at its deadline instead of waiting for the server."""
+    mock_server.latency = 1.0
+    started = time.monotonic()
+
+    with pytest.raises(DeadlineExceeded):
+        get_portfolio_returns("momentum.20", "key", deadline=0.3)
+
+    assert time.monotonic() - started < 0.9
+    assert len(mock_server.requests) == 1
+
+
+@pytest.mark.usefixtures("_longest_backoff")
+def test_per_call_timeout_overrides_the_client(mock_client, mock_server):
+    """The timeout argument applies to every attempt of the call."""
+    mock_server.latency = 0.5
+
+    with pytest.raises(requests.Timeout):
+        get_portfolio_returns("momentum.20", "key", None, None, None, None, 0.1, 0.25)
+
+    assert len(mock_server.requests) == 1
+
+
+@pytest.mark.usefixtures("_longest_backoff")
+def test_deadline_bounds_retries(mock_client, mock_server):
+    """No retry is started if it cannot complete before the deadline."""
+    started = time.monotonic()
+
+    with pytest.raises(requests.HTTPError, match="503"):
+        get_portfolio_returns("failing.20", "key", deadline=0.5)
+
+    assert time.monotonic() - started < 0.5
+    assert len(mock_server.requests) == 1
+
+
+def test_deadline_is_shared_by_chunks(mock_client, mock_server):
+    """Chunks sent from worker threads should inherit the deadline of the call."""
+    mock_server.latency = 1.0
+
+    with pytest.raises(DeadlineExceeded):
+        get_prices(["BTC", "ETH", "SOL"], "key", chunk_size=1, deadline=0.3)
+
+
+def test_client_default_deadline(mock_server):
+    """The client deadline applies to calls that do not set their own."""
+    mock_server.latency = 1.0
+    client = UnravelClient(base_url=mock_server.base_url, deadline=0.3)
+    previous = set_client(client)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            get_portfolio_returns("momentum.20", "key")
+    finally:
+        set_client(previous)
+        client.close()
+
+
+def test_async_deadline(mock_server):
+    """The async client should honor deadlines as well."""
+    mock_server.latency = 1.0
+
+    async def run():
+        async with AsyncUnravelClient(base_url=mock_server.base_url) as client:
+            return await client.get_portfolio_returns(
+                "momentum.20", "key", deadline=0.3
+            )
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run())
+    assert time.monotonic() - started < 0.9
+
+
+def test_deadline_bounds_the_rate_limiter_wait(mock_server):
+    """A call should not wait for a token it can only use after its deadline."""
+    client = UnravelClient(
+        base_url=mock_server.base_url, rate_limiter=TokenBucket(rate=0.2, capacity=1)
+    )
+    previous = set_client(client)
+    try:
+        get_portfolio_returns("momentum.20", "key")
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            get_portfolio_returns("momentum.20", "key", deadline=0.5)
+    finally:
+        set_client(previous)
+        client.close()
+
+    assert time.monotonic() - started < 0.4
+    assert len(mock_server.requests) == 1
+
+
+def test_async_deadline_bounds_the_rate_limiter_wait(mock_server):
+    """The async client should not wait past the deadline for a token either."""
+
+    async def run():
+        async with AsyncUnravelClient(
+            base_url=mock_server.base_url,
+            rate_limiter=TokenBucket(rate=0.2, capacity=1),
+        ) as client:
+            await client.get_portfolio_returns("momentum.20", "key")
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceeded):
+                await client.get_portfolio_returns("momentum.20", "key", deadline=0.5)
+            return time.monotonic() - started
+
+    assert asyncio.run(run()) < 0.4
+
+
+def test_deadline_bounds_the_wait_for_a_coalesced_call(mock_client, mock_server):
+    """A caller joining a slower identical call should still give up at its deadline."""
+    mock_server.latency = 1.5
+
+    with ThreadPoolExecutor(1) as executor:
+        leader = executor.submit(get_portfolio_returns, "momentum.20", "key")
+        time.sleep(0.2)  # let the leader send its request
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            get_portfolio_returns("momentum.20", "key", deadline=0.3)
+        waited = time.monotonic() - started
+        leader.result()
+
+    assert waited < 0.9
+    assert len(mock_server.requests) == 1
+
+
+def test_async_deadline_bounds_the_wait_for_a_coalesced_call(mock_server):
+    """An awaiting coroutine should give up at its deadline without cancelling the call."""
+    mock_server.latency = 1.5
+
+    async def run():
+        async with AsyncUnravelClient(base_url=mock_server.base_url) as client:
+            leader = asyncio.ensure_future(
+                client.get_portfolio_returns("momentum.20", "key")
+            )
+            await asyncio.sleep(0.2)
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceeded):
+                await client.get_portfolio_returns("momentum.20", "key", deadline=0.3)
+            waited = time.monotonic() - started
+            await leader
+            return waited
+
+    assert asyncio.run(run()) < 0.9
+    assert len(mock_server.requests) == 1
+
+
+def test_async_deadline_bounds_the_wait_for_a_concurrency_slot(mock_server):
+    """Queueing for a concurrency slot should count against the deadline."""
+    mock_server.latency = 0.6
+
+    async def run():
+        async with AsyncUnravelClient(
+            base_url=mock_server.base_url, max_concurrency=1
+        ) as client:
+            busy = asyncio.ensure_future(
+                client.get_portfolio_returns("momentum.20", "key")
+            )
+            await asyncio.sleep(0.1)
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceeded):
+                await client.get_portfolio_returns("momentum.30", "key", deadline=0.3)
+            waited = time.monotonic() - started
+            await busy
+            return waited
+
+    assert asyncio.run(run()) < 0.45
+    assert len(mock_server.requests) == 1
@@ -0,0 +1,88 @@
+"""
+Tests for negotiating binary columnar responses.
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+from unravel_client import (
+    AsyncUnravelClient,
+    UnravelClient,
+    get_historical_universe,
+    get_live_weights,
+    get_portfolio_historical_weights,
+    get_portfolio_returns,
+    set_client,
+)
+
+from .mock_server import ARROW_STREAM, PARQUET, MockUnravelServer
+
+pytest.importorskip("pyarrow")
+
+
+def _fetch_all(base_url: str, wire_format: str) -> list:
+    client = UnravelClient(base_url=base_url, wire_format=wire_format)
+    previous = set_client(client)
+    try:
+        return [
+            get_portfolio_historical_weights("momentum.20", api_key="key"),
+            get_portfolio_returns("momentum.20", api_key="key"),
+            get_historical_universe("20", "key", "2024-01-01", "2024-01-10"),
+            get_live_weights("momentum.20", api_key="key"),
+        ]
+    finally:
+        set_client(previous)
+        client.close()
+
+
+def _assert_same(results: list, expected: list):
+    for result, reference in zip(results, expected):
+        if isinstance(reference, pd.DataFrame):
+            pd.testing.assert_frame_equal(result, reference)
+        else:
+            pd.testing.assert_series_equal(result, reference)
+
+
+@pytest.mark.parametrize(
+    ("wire_format", "media_type"), [("arrow", ARROW_STREAM), ("parquet", PARQUET)]
+)
+def test_binary_formats_match_json(mock_server, wire_format, media_type):
+    """Binary responses should be parsed into the same objects as JSON ones."""
+    results = _fetch_all(mock_server.base_url, wire_format)
+    accepts = [headers["Accept"] for _, _, headers in mock_server.requests]
+    expected = _fetch_all(mock_server.base_url, "json")
+
+    _assert_same(results, expected)
+    assert all(accept.startswith(media_type) for accept in accepts)
+    assert all(results[0].dtypes == "float64")
+
+
+def test_binary_format_falls_back_to_json():
+    """Servers that only offer JSON should still be understood."""
+    server = MockUnravelServer(binary_formats=()).start()
+    try:
+        results = _fetch_all(server.base_url, "arrow")
+        expected = _fetch_all(server.base_url, "json")
+    finally:
+        server.stop()
+
+    _assert_same(results, expected)
+
+
+def test_unknown_wire_format():
+    """Unsupported formats should be rejected when the client is created."""
+    with pytest.raises(ValueError):
+        UnravelClient(wire_format="xml")
+
+
+def test_async_client_arrow(mock_server):
+    """The async client should negotiate binary formats the same way."""
+
+    async def run(wire_format):
+        async with AsyncUnravelClient(
+            base_url=mock_server.base_url, wire_format=wire_format
+        ) as client:
+            return await client.get_portfolio_historical_weights("momentum.20", "key")
+
+    pd.testing.assert_frame_equal(asyncio.run(run("arrow")), asyncio.run(run("json")))